@@ -0,0 +1,163 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runtime state (SQLite caches, spilled sessions) lives here, outside version control.
+# Not data/cache: that path is a tracked placeholder, and SQLite writing to it dirties the checkout
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
+# SQLite file shared by every persistent cache tier
+CACHE_PATH = os.getenv("CACHE_PATH", os.path.join(CACHE_DIR, "cache.sqlite3"))
+
+# ---------------------------------------------------------
+# 🧮 SOLVER RESULT CACHE
+# ---------------------------------------------------------
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_PERSIST = os.getenv("RESULT_CACHE_PERSIST", "false").lower() == "true"
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+
+# ---------------------------------------------------------
+# 💬 EXPLANATION CACHE
+# ---------------------------------------------------------
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "256"))
+EXPLANATION_CACHE_MAX_ENTRIES = int(os.getenv("EXPLANATION_CACHE_MAX_ENTRIES", "5000"))
+EXPLANATION_CACHE_MAX_AGE = float(os.getenv("EXPLANATION_CACHE_MAX_AGE", str(30 * 24 * 3600)))
+
+# ---------------------------------------------------------
+# ⏱ SOLVER EXECUTION
+# ---------------------------------------------------------
+# "inline" runs SymPy in the request thread, "pool" in warm worker processes
+SOLVER_MODE = os.getenv("SOLVER_MODE", "inline").lower()
+SOLVER_POOL_SIZE = int(os.getenv("SOLVER_POOL_SIZE", "2"))
+SOLVER_DEADLINE = float(os.getenv("SOLVER_DEADLINE", "10"))
+# Seconds a new worker gets to import SymPy and warm up before it is retried
+SOLVER_POOL_START_TIMEOUT = float(os.getenv("SOLVER_POOL_START_TIMEOUT", "60"))
+
+# Threads used by Pipeline's async path for CPU-bound OCR/SymPy work
+ASYNC_CPU_WORKERS = int(os.getenv("ASYNC_CPU_WORKERS", "4"))
+
+# ---------------------------------------------------------
+# 🔢 POLYNOMIAL ENGINE (equations of degree >= 3)
+# ---------------------------------------------------------
+# Significant digits of numeric roots (> 15 switches from NumPy to mpmath)
+POLY_NUMERIC_DIGITS = int(os.getenv("POLY_NUMERIC_DIGITS", "15"))
+# Closed-form roots bigger than this many operations are replaced by numeric ones
+POLY_MAX_EXACT_OPS = int(os.getenv("POLY_MAX_EXACT_OPS", "30"))
+
+# ---------------------------------------------------------
+# ∫ INTEGRATION ENGINE
+# ---------------------------------------------------------
+# Antiderivatives of normalized terms kept in memory (x**2 serves 3*x**2 later)
+INTEGRAL_MEMO_SIZE = int(os.getenv("INTEGRAL_MEMO_SIZE", "2048"))
+
+# ---------------------------------------------------------
+# 🧮 SYSTEMS OF EQUATIONS
+# ---------------------------------------------------------
+# Exact Gauss-Jordan with row-operation steps up to this many unknowns, NumPy beyond
+SYSTEM_EXACT_MAX_UNKNOWNS = int(os.getenv("SYSTEM_EXACT_MAX_UNKNOWNS", "8"))
+# Gröbner bases blow up quickly: larger nonlinear systems are refused
+SYSTEM_NONLINEAR_MAX_UNKNOWNS = int(os.getenv("SYSTEM_NONLINEAR_MAX_UNKNOWNS", "4"))
+# Sparse LU (needs SciPy) for square systems at least this big and under 10% dense
+SYSTEM_SPARSE_MIN_UNKNOWNS = int(os.getenv("SYSTEM_SPARSE_MIN_UNKNOWNS", "200"))
+
+# ---------------------------------------------------------
+# ✅ ANSWER VERIFICATION
+# ---------------------------------------------------------
+# Plug every answer back in (lambdify + random points) before it is shown
+VERIFY_ANSWERS = os.getenv("VERIFY_ANSWERS", "true").lower() == "true"
+VERIFY_SAMPLES = int(os.getenv("VERIFY_SAMPLES", "8"))
+VERIFY_TOLERANCE = float(os.getenv("VERIFY_TOLERANCE", "1e-8"))
+
+# ---------------------------------------------------------
+# 📚 BATCH SOLVING
+# ---------------------------------------------------------
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+BATCH_POOL_SIZE = int(os.getenv("BATCH_POOL_SIZE", str(os.cpu_count() or 2)))
+# Fewer distinct problems than this skip the batch pool and are solved like single requests
+# (request pool and its deadline when SOLVER_MODE=pool, else inline without a deadline)
+BATCH_POOL_MIN_ITEMS = int(os.getenv("BATCH_POOL_MIN_ITEMS", "8"))
+# How many problems share one explanation prompt
+BATCH_EXPLAIN_GROUP = int(os.getenv("BATCH_EXPLAIN_GROUP", "5"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+
+# ---------------------------------------------------------
+# 🖼 OCR
+# ---------------------------------------------------------
+# Concurrent uploads arriving within this window are OCR'd in one batch (0 disables)
+OCR_BATCH_WINDOW_MS = float(os.getenv("OCR_BATCH_WINDOW_MS", "20"))
+OCR_MAX_BATCH = int(os.getenv("OCR_MAX_BATCH", "8"))
+# Build and warm up the LatexOCR model at server start instead of on the first upload
+OCR_WARMUP = os.getenv("OCR_WARMUP", "false").lower() == "true"
+# Preprocessor quality tier: fast | balanced | best
+OCR_PREPROCESS_TIER = os.getenv("OCR_PREPROCESS_TIER", "balanced")
+# Perceptual-hash (dHash) cache of OCR results; threshold is in bits out of 256.
+# 0 reuses only exact hashes: different equations can sit 3-4 bits apart, so
+# near hits (threshold > 0) must also pass a thumbnail check (OCR_HASH_MAX_TILE_DIFF, 0-255)
+OCR_HASH_CACHE = os.getenv("OCR_HASH_CACHE", "true").lower() == "true"
+OCR_HASH_THRESHOLD = int(os.getenv("OCR_HASH_THRESHOLD", "0"))
+OCR_HASH_MAX_TILE_DIFF = float(os.getenv("OCR_HASH_MAX_TILE_DIFF", "32"))
+OCR_HASH_MAX_ENTRIES = int(os.getenv("OCR_HASH_MAX_ENTRIES", "50000"))
+# Parsed LaTeX kept per cleaned string (LatexToSympyConverter)
+LATEX_MEMO_SIZE = int(os.getenv("LATEX_MEMO_SIZE", "1024"))
+
+# ---------------------------------------------------------
+# 💤 STARTUP
+# ---------------------------------------------------------
+# Pipeline components built at server start; everything else is built on first use
+PRELOAD_COMPONENTS = [
+    name.strip()
+    for name in os.getenv("PRELOAD_COMPONENTS", "solver,extractor,normalizer").split(",")
+    if name.strip()
+]
+
+# ---------------------------------------------------------
+# 🧠 WORD PROBLEMS
+# ---------------------------------------------------------
+# Extract templated statements ("derivative of x squared") with rules instead of the LLM
+STATEMENT_RULES = os.getenv("STATEMENT_RULES", "true").lower() == "true"
+# MinHash index of earlier extractions: reworded repeats skip the LLM
+STATEMENT_INDEX = os.getenv("STATEMENT_INDEX", "true").lower() == "true"
+STATEMENT_INDEX_THRESHOLD = float(os.getenv("STATEMENT_INDEX_THRESHOLD", "0.8"))
+STATEMENT_INDEX_MAX_ENTRIES = int(os.getenv("STATEMENT_INDEX_MAX_ENTRIES", "20000"))
+
+# ---------------------------------------------------------
+# 🗂 SESSIONS (solved context reused by doubts)
+# ---------------------------------------------------------
+SESSION_TTL = float(os.getenv("SESSION_TTL", "3600"))
+SESSION_MAX = int(os.getenv("SESSION_MAX", "1000"))
+# Spill sessions evicted from memory to disk instead of dropping them
+SESSION_SPILL = os.getenv("SESSION_SPILL", "false").lower() == "true"
+SESSIONS_PATH = os.getenv("SESSIONS_PATH", os.path.join(CACHE_DIR, "sessions.sqlite3"))
+
+# ---------------------------------------------------------
+# 🔢 PROMPT TOKEN BUDGETS (estimated tokens per call)
+# ---------------------------------------------------------
+EXPLAIN_PROMPT_BUDGET = int(os.getenv("EXPLAIN_PROMPT_BUDGET", "1500"))
+DOUBT_PROMPT_BUDGET = int(os.getenv("DOUBT_PROMPT_BUDGET", "1200"))
+PARSE_PROMPT_BUDGET = int(os.getenv("PARSE_PROMPT_BUDGET", "600"))
+# Steps on each side of the asked-about step that a doubt prompt includes
+DOUBT_CONTEXT_WINDOW = int(os.getenv("DOUBT_CONTEXT_WINDOW", "1"))
+
+# ---------------------------------------------------------
+# 🔌 LLM BACKEND
+# ---------------------------------------------------------
+# "gemini" (default) or "offline": a local stand-in for load tests and benchmarks
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+OFFLINE_LLM_LATENCY = float(os.getenv("OFFLINE_LLM_LATENCY", "0"))    # seconds per call
+OFFLINE_LLM_JITTER = float(os.getenv("OFFLINE_LLM_JITTER", "0"))      # ± seconds, uniform
+OFFLINE_LLM_ERROR_RATE = float(os.getenv("OFFLINE_LLM_ERROR_RATE", "0"))
+OFFLINE_LLM_SEED = int(os.getenv("OFFLINE_LLM_SEED", "0"))
+
+# ---------------------------------------------------------
+# 🚦 LLM SCHEDULER (shared by every LLM call in the process; 0 disables a limit)
+# ---------------------------------------------------------
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Token bucket: sustained requests per minute, and how many may go out back to back
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "600"))
+LLM_BURST = int(os.getenv("LLM_BURST", "20"))
+# Retries of 429 / 5xx / timeouts, with full-jitter exponential backoff (seconds)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE = float(os.getenv("LLM_RETRY_BASE", "0.5"))
+LLM_RETRY_MAX = float(os.getenv("LLM_RETRY_MAX", "8"))
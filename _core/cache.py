@@ -0,0 +1,178 @@
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def hash_key(*parts) -> str:
+    """Stable sha256 hex digest for a tuple of key parts."""
+    raw = "\x1f".join(str(p) for p in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DiskStore:
+    """
+    SQLite-backed key/value tier.
+    Every namespace gets its own table inside the same database file,
+    values are stored as JSON.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int = None, max_age: float = None):
+        self.path = path
+        self.table = "ns_" + "".join(c if c.isalnum() else "_" for c in namespace)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            if self.max_age is not None and now - row[1] > self.max_age:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return json.loads(row[0])
+
+    def put(self, key: str, value) -> int:
+        """Store a value. Returns the number of entries evicted to make room."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            evicted = self._evict(now)
+            self._conn.commit()
+            return evicted
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def items(self):
+        with self._lock:
+            rows = self._conn.execute(f"SELECT key, value FROM {self.table}").fetchall()
+        return [(k, json.loads(v)) for k, v in rows]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _evict(self, now: float) -> int:
+        evicted = 0
+        if self.max_age is not None:
+            cur = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created < ?", (now - self.max_age,)
+            )
+            evicted += cur.rowcount
+
+        if self.max_entries is not None:
+            cur = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            evicted += cur.rowcount
+
+        return evicted
+
+
+class LRUCache:
+    """
+    Bounded in-memory LRU with an optional DiskStore behind it.
+    Values are copied on the way in and out so callers can mutate them freely.
+    """
+
+    def __init__(self, maxsize: int = 256, store: DiskStore = None):
+        self.maxsize = maxsize
+        self.store = store
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._data[key])
+
+        value = self.store.get(key) if self.store is not None else None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._insert(key, value)
+            return copy.deepcopy(value)
+
+    def put(self, key: str, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._insert(key, value)
+
+        if self.store is not None:
+            evicted = self.store.put(key, value)
+            with self._lock:
+                self.disk_evictions += evicted
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_hits": self.disk_hits,
+                "disk_evictions": self.disk_evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def _insert(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,143 @@
+import bisect
+import threading
+
+
+# ---------------------------------------------------------
+# 📈 METRIC TYPES (Prometheus text exposition, no client dependency)
+# ---------------------------------------------------------
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        # An unlabelled counter is exported as 0 before its first event
+        self._values = {} if self.labelnames else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    # Seconds: sub-millisecond cache hits up to multi-second LLM calls
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            series["counts"][index] += 1
+            series["sum"] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f"{self.name}_bucket{_labels(names, key + (le,))} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def gauge_lines(name: str, help: str, samples: list[tuple], labelnames=(), kind: str = "gauge") -> list[str]:
+    """Render values read at scrape time (component stats) as one metric family."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labelnames, labels)} {value}")
+    return lines
+
+
+# ---------------------------------------------------------
+# 🗂 PROCESS-WIDE METRICS
+# ---------------------------------------------------------
+
+REQUEST_SECONDS = Histogram(
+    "mathsolver_request_seconds",
+    "End-to-end pipeline latency per operation.",
+    labelnames=("operation",)
+)
+REQUESTS = Counter(
+    "mathsolver_requests_total",
+    "Pipeline calls by operation and outcome.",
+    labelnames=("operation", "outcome")
+)
+STAGE_SECONDS = Histogram(
+    "mathsolver_stage_seconds",
+    "Latency of each pipeline stage.",
+    labelnames=("stage",)
+)
+LLM_ERRORS = Counter(
+    "mathsolver_llm_errors_total",
+    "Failed LLM calls per component.",
+    labelnames=("component",)
+)
+LLM_COALESCED = Counter(
+    "mathsolver_llm_coalesced_total",
+    "Callers that shared an identical in-flight LLM call instead of making their own.",
+    labelnames=("component",)
+)
+LLM_QUEUE_SECONDS = Histogram(
+    "mathsolver_llm_queue_seconds",
+    "Time an LLM call waited in the scheduler queue, per priority class.",
+    labelnames=("priority",)
+)
+LLM_RETRIES = Counter(
+    "mathsolver_llm_retries_total",
+    "LLM calls retried after a retryable error, per priority class.",
+    labelnames=("priority",)
+)
+SOLVER_TIMEOUTS = Counter(
+    "mathsolver_solver_timeouts_total",
+    "Solver calls that missed their deadline."
+)
+
+METRICS = [
+    REQUEST_SECONDS, REQUESTS, STAGE_SECONDS,
+    LLM_ERRORS, LLM_COALESCED, LLM_QUEUE_SECONDS, LLM_RETRIES,
+    SOLVER_TIMEOUTS
+]
+
+
+def render(extra: list[str] = None) -> str:
+    """Prometheus text format for every process-wide metric plus `extra` lines."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(extra or [])
+    return "\n".join(lines) + "\n"
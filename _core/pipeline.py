@@ -1,24 +1,196 @@
 from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import copy
 import re
+import threading
+import time
 
-from _math_engine.solver import MathSolver
-from _math_engine.step_extractor import StepExtractor
-from _math_engine.step_normalizer import StepNormalizer
-from _llm.explainer import StepExplainer
-from _llm.doubt_handler import DoubtHandler
-#from _vision.ocr import OCRProcessor
-from _nlp.statement_parser import StatementParser
+from _core import metrics
+from _core.cache import LRUCache, DiskStore, hash_key
+from _core.state import SessionStore
+from _core.tracing import bind, span, traced
+from _app import config
 
 
 class Pipeline:
+    """
+    Every heavy component (SymPy solver, LLM clients, OCR model) is built on
+    first use, and its import + construction time is recorded in init_times.
+    A text-only worker never pays for torch/pix2tex, and nothing talks to
+    Gemini until the first request needs it.
+    """
+
     def __init__(self):
-        self.solver = MathSolver()
-        self.extractor = StepExtractor()
-        self.normalizer = StepNormalizer()
-        self.explainer = StepExplainer()
-        self.doubt = DoubtHandler()
-        #self.ocr = OCRProcessor(use_preprocessing=True)
-        self.statement_parser = StatementParser()
+        self._components = {}
+        self._components_lock = threading.Lock()
+        self.init_times = {}
+
+        self.result_cache = self._build_result_cache()
+        self.sessions = self._build_session_store()
+        # CPU-bound work (OCR, SymPy) for the async path runs here, off the event loop
+        self._cpu_executor = ThreadPoolExecutor(
+            max_workers=config.ASYNC_CPU_WORKERS,
+            thread_name_prefix="pipeline-cpu"
+        )
+
+    # ---------------------------------------------------------
+    # 💤 LAZY COMPONENTS
+    # ---------------------------------------------------------
+
+    def _component(self, name: str, factory):
+        component = self._components.get(name)
+        if component is None:
+            with self._components_lock:
+                component = self._components.get(name)
+                if component is None:
+                    started = time.perf_counter()
+                    component = factory()
+                    self.init_times[name] = time.perf_counter() - started
+                    self._components[name] = component
+        return component
+
+    def warm_up(self, *names: str):
+        """Build the named components now instead of on the first request."""
+        for name in names:
+            getattr(self, name)
+
+    @property
+    def solver(self):
+        def build():
+            from _math_engine.solver import MathSolver
+            return MathSolver()
+        return self._component("solver", build)
+
+    @property
+    def solver_pool(self):
+        """Warm solver processes (SOLVER_MODE=pool), started by the first request that needs one."""
+        if config.SOLVER_MODE != "pool":
+            return None
+
+        def build():
+            from _math_engine.executor import SolverPool
+            return SolverPool(
+                size=config.SOLVER_POOL_SIZE,
+                deadline=config.SOLVER_DEADLINE,
+                start_timeout=config.SOLVER_POOL_START_TIMEOUT
+            )
+        return self._component("solver_pool", build)
+
+    @property
+    def extractor(self):
+        def build():
+            from _math_engine.step_extractor import StepExtractor
+            return StepExtractor()
+        return self._component("extractor", build)
+
+    @property
+    def normalizer(self):
+        def build():
+            from _math_engine.step_normalizer import StepNormalizer
+            return StepNormalizer()
+        return self._component("normalizer", build)
+
+    @property
+    def explainer(self):
+        def build():
+            from _llm.explainer import StepExplainer
+            return StepExplainer()
+        return self._component("explainer", build)
+
+    @property
+    def doubt(self):
+        def build():
+            from _llm.doubt_handler import DoubtHandler
+            return DoubtHandler()
+        return self._component("doubt", build)
+
+    @property
+    def statement_parser(self):
+        def build():
+            from _nlp.statement_parser import StatementParser
+            return StatementParser(
+                index=self._build_statement_index(),
+                use_rules=config.STATEMENT_RULES
+            )
+        return self._component("statement_parser", build)
+
+    @property
+    def ocr(self):
+        # torch / pix2tex are only imported once an image actually arrives
+        def build():
+            from _vision.ocr import OCRProcessor
+            return OCRProcessor(
+                use_preprocessing=True,
+                preprocess_tier=config.OCR_PREPROCESS_TIER,
+                hash_index=self._build_ocr_hash_index()
+            )
+        return self._component("ocr", build)
+
+    @property
+    def ocr_batcher(self):
+        def build():
+            from _vision.batcher import OCRBatcher
+            return OCRBatcher(
+                self.ocr,
+                window=config.OCR_BATCH_WINDOW_MS / 1000,
+                max_batch=config.OCR_MAX_BATCH
+            )
+        return self._component("ocr_batcher", build)
+
+    def _build_ocr_hash_index(self):
+        if not config.OCR_HASH_CACHE:
+            return None
+
+        from _vision.phash import PerceptualHashIndex
+        store = DiskStore(
+            config.CACHE_PATH,
+            # Different tiers can read the same image differently
+            namespace=f"ocr_phash_{config.OCR_PREPROCESS_TIER}",
+            max_entries=config.OCR_HASH_MAX_ENTRIES
+        )
+        return PerceptualHashIndex(
+            threshold=config.OCR_HASH_THRESHOLD,
+            max_tile_diff=config.OCR_HASH_MAX_TILE_DIFF,
+            store=store,
+            max_entries=config.OCR_HASH_MAX_ENTRIES
+        )
+
+    def _build_statement_index(self):
+        if not config.STATEMENT_INDEX:
+            return None
+
+        from _nlp.near_duplicate import StatementIndex
+        store = DiskStore(
+            config.CACHE_PATH,
+            namespace="statement_index",
+            max_entries=config.STATEMENT_INDEX_MAX_ENTRIES
+        )
+        return StatementIndex(
+            threshold=config.STATEMENT_INDEX_THRESHOLD,
+            store=store,
+            max_entries=config.STATEMENT_INDEX_MAX_ENTRIES
+        )
+
+    def _build_session_store(self) -> SessionStore:
+        spill = None
+        if config.SESSION_SPILL:
+            spill = DiskStore(config.SESSIONS_PATH, namespace="sessions", max_age=config.SESSION_TTL)
+        return SessionStore(
+            ttl=config.SESSION_TTL,
+            max_sessions=config.SESSION_MAX,
+            spill=spill
+        )
+
+    def _build_result_cache(self) -> LRUCache:
+        store = None
+        if config.RESULT_CACHE_PERSIST:
+            store = DiskStore(
+                config.CACHE_PATH,
+                namespace="solver_results",
+                max_entries=config.RESULT_CACHE_MAX_ENTRIES
+            )
+        return LRUCache(maxsize=config.RESULT_CACHE_SIZE, store=store)
 
     # ---------------------------------------------------------
     # 🔍 DETECTION
@@ -41,66 +213,496 @@ class Pipeline:
     # 🚀 MAIN PIPELINE
     # ---------------------------------------------------------
 
-    def solve_and_explain(self, user_input) -> dict:
+    @traced("solve")
+    def solve_and_explain(self, user_input, deadline: float = None) -> dict:
+
+        # 🖼 IMAGE INPUT
+        user_input = self._image_to_text(user_input)
+
+        # 🧠 STATEMENT → NLP → EXPRESSION
+        if isinstance(user_input, str) and self._looks_like_statement_problem(user_input):
+            with span("statement_parser"):
+                parsed = self.statement_parser.parse(user_input)
+
+            if parsed.get("error"):
+                return self._statement_failed()
+
+            user_input = parsed["expression"]
+
+        # ❌ INVALID INPUT
+        if not isinstance(user_input, str) or not self._is_valid_math(user_input):
+            return self._invalid_input()
+
+        # 🧮 SOLVER + 🪜 STEPS
+        result = self._solve_and_normalize(user_input, deadline)
+        if result.get("error"):
+            return result
+
+        with span("explainer"):
+            result["explanation"] = self.explainer.explain_steps(
+                normalized_steps=result["steps"],
+                final_answer=result.get("final_answer", ""),
+                problem_type=result.get("problem_type", "")
+            )
+        result["session_id"] = self.sessions.create(result)
+        return result
+
+    @traced("solve_async")
+    async def asolve_and_explain(self, user_input, deadline: float = None) -> dict:
+        """
+        Async variant of solve_and_explain.
+        LLM calls go through ainvoke; OCR and SymPy run in the CPU executor.
+        """
+        loop = asyncio.get_running_loop()
 
         # 🖼 IMAGE INPUT
-        if isinstance(user_input, (str, Image.Image)):
-            if isinstance(user_input, str) and user_input.lower().endswith((".png", ".jpg", ".jpeg")):
-                img = Image.open(user_input)
-                latex = self.ocr.image_to_latex(img)
-                user_input = latex
+        user_input = await loop.run_in_executor(self._cpu_executor, bind(self._image_to_text), user_input)
+
+        # 🧠 STATEMENT → NLP → EXPRESSION
+        if isinstance(user_input, str) and self._looks_like_statement_problem(user_input):
+            with span("statement_parser"):
+                parsed = await self.statement_parser.aparse(user_input)
 
-            if isinstance(user_input, Image.Image):
-                latex = self.ocr.image_to_latex(user_input)
-                user_input = latex
+            if parsed.get("error"):
+                return self._statement_failed()
+
+            user_input = parsed["expression"]
+
+        # ❌ INVALID INPUT
+        if not isinstance(user_input, str) or not self._is_valid_math(user_input):
+            return self._invalid_input()
+
+        # 🧮 SOLVER + 🪜 STEPS
+        result = await loop.run_in_executor(
+            self._cpu_executor, bind(self._solve_and_normalize), user_input, deadline
+        )
+        if result.get("error"):
+            return result
+
+        with span("explainer"):
+            result["explanation"] = await self.explainer.aexplain_steps(
+                normalized_steps=result["steps"],
+                final_answer=result.get("final_answer", ""),
+                problem_type=result.get("problem_type", "")
+            )
+        result["session_id"] = self.sessions.create(result)
+        return result
+
+    @traced("solve_stream")
+    def solve_and_stream(self, user_input, deadline: float = None):
+        """
+        Streaming variant of solve_and_explain.
+        Yields (event, data) pairs: the deterministic "result" first,
+        then "explanation" chunks as the LLM produces them, then "done".
+        """
+
+        # 🖼 IMAGE INPUT
+        user_input = self._image_to_text(user_input)
 
         # 🧠 STATEMENT → NLP → EXPRESSION
         if isinstance(user_input, str) and self._looks_like_statement_problem(user_input):
-            parsed = self.statement_parser.parse(user_input)
+            with span("statement_parser"):
+                parsed = self.statement_parser.parse(user_input)
 
             if parsed.get("error"):
-                return {
-                    "error": "Statement parsing failed",
-                    "message": "Could not convert word problem to math expression."
-                }
+                yield "error", self._statement_failed()
+                return
 
             user_input = parsed["expression"]
 
         # ❌ INVALID INPUT
         if not isinstance(user_input, str) or not self._is_valid_math(user_input):
-            return {
-                "error": "Invalid input",
-                "message": "Provide a valid math expression or word problem."
-            }
+            yield "error", self._invalid_input()
+            return
+
+        # 🧮 SOLVER + 🪜 STEPS
+        result = self._solve_and_normalize(user_input, deadline)
+        if result.get("error"):
+            yield "error", result
+            return
+
+        result["session_id"] = self.sessions.create(result)
+        yield "result", result
+
+        # 💬 EXPLANATION
+        chunks = []
+        with span("explainer"):
+            for chunk in self.explainer.stream_explain(
+                normalized_steps=result["steps"],
+                final_answer=result.get("final_answer", ""),
+                problem_type=result.get("problem_type", "")
+            ):
+                chunks.append(chunk)
+                yield "explanation", chunk
 
-        # 🧮 SOLVER
-        result = self.solver.solve(user_input)
+        self.sessions.update(result["session_id"], explanation="".join(chunks))
+        yield "done", {}
+
+    # ---------------------------------------------------------
+    # 📚 BATCH (worksheets)
+    # ---------------------------------------------------------
+
+    @traced("solve_batch")
+    def solve_many(self, inputs: list, deadline: float = None) -> list[dict]:
+        """
+        Solve a whole worksheet.
+        Identical or canonically equal problems are solved once, unique problems
+        fan out across solver processes, and explanations share LLM prompts in
+        groups. Batches with fewer than BATCH_POOL_MIN_ITEMS distinct problems
+        are solved like single requests: in the request pool with its deadline
+        when SOLVER_MODE=pool, otherwise inline with no deadline.
+        Results come back in input order; failures are per-item error dicts.
+        """
+        texts = [t.strip() if isinstance(t, str) else t for t in inputs]
+
+        # 🧠 STATEMENTS → EXPRESSIONS (each distinct statement parsed once)
+        statements = list({
+            t for t in texts
+            if isinstance(t, str) and self._looks_like_statement_problem(t)
+        })
+        parsed = {}
+        if statements:
+            with ThreadPoolExecutor(max_workers=min(config.BATCH_LLM_CONCURRENCY, len(statements))) as io:
+                with span("statement_parser"):
+                    parse = lambda text: self.statement_parser.parse(text, priority="batch")
+                    parsed = dict(zip(statements, io.map(parse, statements)))
+
+        # 🔁 DEDUPLICATE
+        results = [None] * len(texts)
+        expressions = [None] * len(texts)
+        for i, text in enumerate(texts):
+            if isinstance(text, str) and text in parsed:
+                if parsed[text].get("error"):
+                    results[i] = self._statement_failed()
+                    continue
+                text = parsed[text]["expression"]
+
+            if not isinstance(text, str) or not self._is_valid_math(text):
+                results[i] = self._invalid_input()
+                continue
+
+            expressions[i] = text
+
+        distinct = list(dict.fromkeys(e for e in expressions if e is not None))
+        if not distinct:
+            return results
+
+        # Worker processes once the batch is worth them; keys are computed there too, under the deadline
+        pool = self._get_batch_pool() if len(distinct) >= config.BATCH_POOL_MIN_ITEMS else None
+
+        def fan_out(fn, items):
+            if pool is None:
+                return [fn(item) for item in items]
+            with ThreadPoolExecutor(max_workers=min(pool.size, len(items))) as fan:
+                return list(fan.map(bind(fn), items))
+
+        groups = {}
+        with span("canonical_key"):
+            keys = dict(zip(distinct, fan_out(
+                lambda text: self._call_solver("canonical_key", text, deadline, pool), distinct
+            )))
+        for i, text in enumerate(expressions):
+            if text is None:
+                continue
+            key = keys[text]
+            if isinstance(key, dict):
+                # Timed out (or the worker died) while parsing: that item's own error
+                if key.get("timed_out"):
+                    metrics.SOLVER_TIMEOUTS.inc()
+                results[i] = {**key, "expression": text}
+                continue
+            groups.setdefault(key or text, []).append(i)
+
+        if not groups:
+            return results
+
+        # 🧮 SOLVE UNIQUE PROBLEMS
+        unique = list(groups)
+
+        def solve_one(key):
+            expression = expressions[groups[key][0]]
+            try:
+                return self._solve_and_normalize(expression, deadline, pool=pool)
+            except Exception as e:
+                return {"error": "Solver failed", "message": str(e), "expression": expression}
+
+        solved = dict(zip(unique, fan_out(solve_one, unique)))
+
+        # 💬 GROUPED EXPLANATIONS
+        explainable = [k for k in unique if not solved[k].get("error")]
+        with span("explainer"):
+            explanations = self.explainer.explain_many(
+                [
+                    {
+                        "normalized_steps": solved[k]["steps"],
+                        "final_answer": solved[k].get("final_answer", ""),
+                        "problem_type": solved[k].get("problem_type", "")
+                    }
+                    for k in explainable
+                ],
+                group_size=config.BATCH_EXPLAIN_GROUP,
+                concurrency=config.BATCH_LLM_CONCURRENCY
+            )
+        for key, explanation in zip(explainable, explanations):
+            solved[key]["explanation"] = explanation
+            solved[key]["session_id"] = self.sessions.create(solved[key])
+
+        # 📤 FAN BACK OUT IN INPUT ORDER
+        for key, indices in groups.items():
+            for i in indices:
+                item = copy.deepcopy(solved[key])
+                item["expression"] = expressions[i]
+                results[i] = item
+
+        return results
+
+    def _get_batch_pool(self):
+        """Worker processes for large batches: the request pool when there is one, else a lazily built batch pool."""
+        if self.solver_pool is not None:
+            return self.solver_pool
+
+        def build():
+            from _math_engine.executor import SolverPool
+            return SolverPool(
+                size=config.BATCH_POOL_SIZE,
+                deadline=config.SOLVER_DEADLINE,
+                start_timeout=config.SOLVER_POOL_START_TIMEOUT
+            )
+        return self._component("batch_pool", build)
+
+    # ---------------------------------------------------------
+    # 🧩 STAGES (shared by sync + async paths)
+    # ---------------------------------------------------------
+
+    def _image_to_text(self, user_input):
+        if isinstance(user_input, str) and user_input.lower().endswith((".png", ".jpg", ".jpeg")):
+            user_input = Image.open(user_input)
+
+        if isinstance(user_input, Image.Image):
+            with span("ocr"):
+                # Concurrent uploads inside the batching window share one forward pass
+                if config.OCR_BATCH_WINDOW_MS > 0:
+                    return self.ocr_batcher.image_to_latex(user_input)
+                return self.ocr.image_to_latex(user_input)
+
+        return user_input
+
+    def _solve_and_normalize(self, user_input: str, deadline: float = None, pool=None) -> dict:
+        with span("solver"):
+            result = self._solve_cached(user_input, deadline=deadline, pool=pool)
+
+        if isinstance(result, dict) and result.get("timed_out"):
+            metrics.SOLVER_TIMEOUTS.inc()
+            result["expression"] = user_input
+            return result
 
         if not isinstance(result, dict) or result.get("error"):
-            return {
-                "error": "Solver failed",
-                "expression": user_input
-            }
+            failed = {"error": "Solver failed", "expression": user_input}
+            if isinstance(result, dict):
+                # Keep the solver's own reason ("SymPy could not parse expression: ...")
+                failed["message"] = result["error"]
+                if result.get("message"):
+                    failed["hint"] = result["message"]
+            return failed
 
         result["expression"] = user_input
 
         # 🪜 STEPS
-        extracted = self.extractor.extract_steps(result)
-        normalized = self.normalizer.normalize_steps(extracted)
+        with span("steps"):
+            extracted = self.extractor.extract_steps(result)
+            result["steps"] = self.normalizer.normalize_steps(extracted)
+        return result
 
-        explanation = self.explainer.explain_steps(
-            normalized_steps=normalized,
-            final_answer=result.get("final_answer", ""),
-            problem_type=result.get("problem_type", "")
-        )
+    def _statement_failed(self) -> dict:
+        return {
+            "error": "Statement parsing failed",
+            "message": "Could not convert word problem to math expression."
+        }
+
+    def _invalid_input(self) -> dict:
+        return {
+            "error": "Invalid input",
+            "message": "Provide a valid math expression or word problem."
+        }
 
-        result["steps"] = normalized
-        result["explanation"] = explanation
+    def _solve_cached(self, user_input: str, deadline: float = None, pool=None) -> dict:
+        """MathSolver.solve behind the canonical-form result cache."""
+        deadline = config.SOLVER_DEADLINE if deadline is None else deadline
+        started = time.monotonic()
+
+        canonical = self._call_solver("canonical_key", user_input, deadline, pool)
+        if isinstance(canonical, dict):
+            return canonical
+        if canonical is None:
+            return self._call_solver("solve", user_input, deadline - (time.monotonic() - started), pool)
+
+        key = hash_key(canonical)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._call_solver("solve", user_input, deadline - (time.monotonic() - started), pool)
+        if isinstance(result, dict) and not result.get("error"):
+            self.result_cache.put(key, result)
         return result
 
+    def _call_solver(self, method: str, user_input: str, deadline: float, pool=None):
+        """Run a MathSolver method inline or in a worker pool, depending on SOLVER_MODE."""
+        pool = pool or self.solver_pool
+        if pool is None:
+            return getattr(self.solver, method)(user_input)
+        return pool.call(method, user_input, deadline=deadline)
+
+    def llm_usage(self) -> dict:
+        """Prompt/completion token totals (and the last call) per LLM user built so far."""
+        return {
+            name: self._components[name].usage.stats()
+            for name in ("explainer", "doubt", "statement_parser")
+            if name in self._components
+        }
+
+    def cache_stats(self) -> dict:
+        stats = {"results": self.result_cache.stats()}
+
+        explainer = self._components.get("explainer")
+        if explainer is not None:
+            stats["explanations"] = explainer.cache.stats()
+
+        ocr = self._components.get("ocr")
+        if ocr is not None and ocr.hash_index is not None:
+            stats["ocr_phash"] = ocr.hash_index.stats()
+
+        parser = self._components.get("statement_parser")
+        if parser is not None and parser.index is not None:
+            stats["statements"] = parser.index.stats()
+        return stats
+
+    def metrics_text(self) -> str:
+        """Prometheus exposition: process-wide histograms/counters plus this pipeline's component stats."""
+        caches = self.cache_stats()
+        lines = []
+        for field, name, kind in (
+            ("hits", "mathsolver_cache_hits_total", "counter"),
+            ("misses", "mathsolver_cache_misses_total", "counter"),
+            ("evictions", "mathsolver_cache_evictions_total", "counter"),
+            ("size", "mathsolver_cache_entries", "gauge"),
+        ):
+            lines += metrics.gauge_lines(
+                name, f"Cache {field} per cache.",
+                [((cache,), stats[field]) for cache, stats in caches.items() if field in stats],
+                labelnames=("cache",), kind=kind
+            )
+
+        usage = self.llm_usage()
+        lines += metrics.gauge_lines(
+            "mathsolver_llm_tokens_total", "LLM tokens per component and direction.",
+            [((name, direction), stats[f"{direction}_tokens"]) for name, stats in usage.items() for direction in ("prompt", "completion")],
+            labelnames=("component", "direction"), kind="counter"
+        )
+
+        flights = [
+            (name, self._components[name].flights.stats())
+            for name in ("explainer", "statement_parser")
+            if name in self._components
+        ]
+        lines += metrics.gauge_lines(
+            "mathsolver_llm_in_flight", "Distinct LLM calls running now; identical callers wait on these.",
+            [((name,), stats["in_flight"]) for name, stats in flights],
+            labelnames=("component",)
+        )
+
+        from _llm.scheduler import get_scheduler
+        scheduler = get_scheduler().stats()
+        lines += metrics.gauge_lines(
+            "mathsolver_llm_queue_depth", "LLM calls waiting for a scheduler slot, per priority class.",
+            [((priority,), depth) for priority, depth in scheduler["queued"].items()],
+            labelnames=("priority",)
+        )
+        lines += metrics.gauge_lines(
+            "mathsolver_llm_active", "LLM calls holding a scheduler slot.",
+            [((), scheduler["active"])]
+        )
+
+        lines += metrics.gauge_lines(
+            "mathsolver_sessions", "Live doubt sessions held in memory.",
+            [((), self.sessions.stats()["sessions"])]
+        )
+
+        # Only pools that exist already: scraping /metrics must not start worker processes
+        pools = [
+            (name, pool.stats())
+            for name, pool in (("request", self._components.get("solver_pool")), ("batch", self._components.get("batch_pool")))
+            if pool is not None
+        ]
+        lines += metrics.gauge_lines(
+            "mathsolver_solver_pool_size", "Worker processes each solver pool is meant to run.",
+            [((name,), stats["size"]) for name, stats in pools],
+            labelnames=("pool",)
+        )
+        lines += metrics.gauge_lines(
+            "mathsolver_solver_pool_workers", "Solver workers per pool and state; ready below size means the pool is degraded.",
+            [((name, state), stats[state]) for name, stats in pools for state in ("ready", "idle", "busy", "starting")],
+            labelnames=("pool", "state")
+        )
+        lines += metrics.gauge_lines(
+            "mathsolver_solver_pool_restarts_total", "Solver workers replaced after a timeout or crash.",
+            [((name,), stats["restarts"]) for name, stats in pools],
+            labelnames=("pool",), kind="counter"
+        )
+        lines += metrics.gauge_lines(
+            "mathsolver_solver_pool_start_failures_total", "Solver worker starts that failed and were retried.",
+            [((name,), stats["start_failures"]) for name, stats in pools],
+            labelnames=("pool",), kind="counter"
+        )
+        return metrics.render(lines)
+
     # ---------------------------------------------------------
     # ❓ DOUBTS
     # ---------------------------------------------------------
 
-    def answer_doubt(self, step_number: int, question: str):
-        return self.doubt.answer_doubt(step_number, question)
+    @traced("doubt")
+    def answer_doubt(self, session_id: str, step_number: int, question: str) -> dict:
+        """
+        Answer a follow-up question about a solved problem.
+        Grounded in the stored session: one LLM call, no SymPy work.
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            return self._session_missing()
+
+        with span("doubt"):
+            answer = self.doubt.answer_doubt(
+                user_question=self._doubt_question(step_number, question),
+                normalized_steps=session["steps"] or [],
+                final_answer=session["final_answer"] or "",
+                previous_explanation=session["explanation"] or "",
+                step_number=step_number if step_number and step_number > 0 else None
+            )
+        return {"answer": answer, "session_id": session_id}
+
+    @traced("doubt_async")
+    async def aanswer_doubt(self, session_id: str, step_number: int, question: str) -> dict:
+        session = self.sessions.get(session_id)
+        if session is None:
+            return self._session_missing()
+
+        with span("doubt"):
+            answer = await self.doubt.aanswer_doubt(
+                user_question=self._doubt_question(step_number, question),
+                normalized_steps=session["steps"] or [],
+                final_answer=session["final_answer"] or "",
+                previous_explanation=session["explanation"] or "",
+                step_number=step_number if step_number and step_number > 0 else None
+            )
+        return {"answer": answer, "session_id": session_id}
+
+    def _doubt_question(self, step_number: int, question: str) -> str:
+        if step_number is not None and step_number > 0:
+            return f"(About step {step_number}) {question}"
+        return question
+
+    def _session_missing(self) -> dict:
+        return {
+            "error": "Session not found",
+            "message": "This problem is no longer in memory. Please solve it again before asking a doubt."
+        }
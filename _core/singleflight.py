@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from _core import metrics
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive with the same key while it is running wait on the leader's future
+    and get the same result, or the same exception. Once the call finishes
+    the key is released, so later callers run again (they normally hit a
+    cache the leader has filled by then).
+
+    Sync (do) and async (ado) callers share one registry of thread-safe
+    futures, so a request thread and an event loop asking for the same key
+    still make one LLM call. Results are shared, not copied: callers must
+    not mutate them.
+    """
+
+    def __init__(self, component: str):
+        self.component = component
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn):
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        return self._lead(key, future, fn)
+
+    async def ado(self, key: str, coro_fn):
+        future, leader = self._join(key)
+        if not leader:
+            # wrap_future cancels the shared future when this waiter is cancelled: shield it from the others
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        # The call runs as its own task: a cancelled leader (client went away) does not cancel the waiters
+        task = asyncio.ensure_future(coro_fn())
+        task.add_done_callback(lambda done: self._settle(key, future, done))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls)
+            }
+
+    def _join(self, key: str) -> tuple:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                metrics.LLM_COALESCED.inc(component=self.component)
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _lead(self, key: str, future: Future, fn):
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def _settle(self, key: str, future: Future, task: asyncio.Task):
+        if task.cancelled():
+            self._finish(key, future, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._finish(key, future, error=task.exception())
+        else:
+            self._finish(key, future, result=task.result())
+
+    def _finish(self, key: str, future: Future, result=None, error: BaseException = None):
+        # Release the key first: a caller arriving after this point starts a fresh call
+        with self._lock:
+            self._calls.pop(key, None)
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
@@ -0,0 +1,90 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+# Only what a follow-up doubt needs; the rest of the solver output is dropped
+SESSION_FIELDS = ("expression", "problem_type", "final_answer", "steps", "explanation")
+
+
+class SessionStore:
+    """
+    Recently solved problems, keyed by session id.
+    Entries expire after `ttl` seconds of inactivity. When the store is full
+    the least recently used entry is evicted, or spilled to a DiskStore
+    if one is configured, so a doubt can still be answered later.
+    """
+
+    def __init__(self, ttl: float = 3600, max_sessions: int = 1000, spill=None):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.spill = spill
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def create(self, result: dict) -> str:
+        session_id = uuid.uuid4().hex
+        self.put(session_id, result)
+        return session_id
+
+    def put(self, session_id: str, result: dict):
+        data = {k: result.get(k) for k in SESSION_FIELDS}
+        spilled = []
+
+        with self._lock:
+            self._sessions[session_id] = (time.time(), data)
+            self._sessions.move_to_end(session_id)
+
+            while len(self._sessions) > self.max_sessions:
+                old_id, entry = self._sessions.popitem(last=False)
+                self.evictions += 1
+                spilled.append((old_id, entry[1]))
+
+        if self.spill is not None:
+            for old_id, old_data in spilled:
+                self.spill.put(old_id, old_data)
+
+    def update(self, session_id: str, **fields):
+        data = self.get(session_id)
+        if data is not None:
+            data.update({k: v for k, v in fields.items() if k in SESSION_FIELDS})
+            self.put(session_id, data)
+
+    def get(self, session_id: str):
+        if not session_id:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                touched, data = entry
+                if now - touched > self.ttl:
+                    del self._sessions[session_id]
+                    self.expirations += 1
+                    return None
+                self._sessions[session_id] = (now, data)
+                self._sessions.move_to_end(session_id)
+                return dict(data)
+
+        if self.spill is None:
+            return None
+
+        # Spilled sessions come back into memory on use
+        data = self.spill.get(session_id)
+        if data is not None:
+            self.spill.delete(session_id)
+            self.put(session_id, data)
+            return dict(data)
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
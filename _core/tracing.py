@@ -0,0 +1,173 @@
+import contextvars
+import functools
+import inspect
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+
+from _core import metrics
+
+logger = logging.getLogger("mathsolver.trace")
+
+_current = contextvars.ContextVar("mathsolver_trace", default=None)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class Trace:
+    """Stage timings of one pipeline call, tagged with its request id."""
+
+    def __init__(self, operation: str, request_id: str = None):
+        self.operation = operation
+        self.request_id = request_id or new_request_id()
+        self.started = time.perf_counter()
+        self.spans = []
+
+    def record(self, stage: str, seconds: float):
+        # list.append is atomic: batch stages record from several threads
+        self.spans.append((stage, seconds))
+
+    def summary(self) -> dict:
+        stages = {}
+        for stage, seconds in self.spans:
+            stages[stage] = stages.get(stage, 0.0) + seconds * 1000
+        return {
+            "request_id": self.request_id,
+            "operation": self.operation,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "stages_ms": {k: round(v, 2) for k, v in stages.items()}
+        }
+
+
+def current_trace():
+    return _current.get()
+
+
+@contextmanager
+def span(stage: str):
+    """Time a stage into the stage histogram and the current trace (if any)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.STAGE_SECONDS.observe(elapsed, stage=stage)
+        trace = _current.get()
+        if trace is not None:
+            trace.record(stage, elapsed)
+
+
+def bind(fn):
+    """Carry the caller's trace into `fn` when it runs on another thread."""
+    trace = _current.get()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _current.set(trace)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return run
+
+
+# ---------------------------------------------------------
+# 🏷 REQUEST-LEVEL TRACING
+# ---------------------------------------------------------
+
+def _outcome(result) -> str:
+    if isinstance(result, dict) and result.get("error"):
+        return "error"
+    return "ok"
+
+
+def _finish(trace: Trace, outcome: str):
+    summary = trace.summary()
+    metrics.REQUEST_SECONDS.observe(summary["total_ms"] / 1000, operation=trace.operation)
+    metrics.REQUESTS.inc(operation=trace.operation, outcome=outcome)
+    logger.info(
+        "request_id=%s operation=%s outcome=%s total_ms=%.1f %s",
+        trace.request_id, trace.operation, outcome, summary["total_ms"],
+        " ".join(f"{k}_ms={v:.1f}" for k, v in summary["stages_ms"].items())
+    )
+    return summary
+
+
+def traced(operation: str):
+    """
+    Run a pipeline entry point inside a Trace.
+    Accepts an extra `request_id` keyword (one is generated otherwise).
+    Dict results get a "trace" summary; streams put it on the "done" event.
+    Works on plain functions, coroutines and (event, data) generators.
+    """
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def run_async(*args, request_id: str = None, **kwargs):
+                trace = Trace(operation, request_id)
+                token = _current.set(trace)
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception:
+                    _finish(trace, "exception")
+                    raise
+                finally:
+                    _current.reset(token)
+                summary = _finish(trace, _outcome(result))
+                if isinstance(result, dict):
+                    result["trace"] = summary
+                return result
+            return run_async
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def run_stream(*args, request_id: str = None, **kwargs):
+                trace = Trace(operation, request_id)
+                # Each step runs in a private context so the trace never leaks into the consumer
+                context = contextvars.copy_context()
+                context.run(_current.set, trace)
+                events = context.run(fn, *args, **kwargs)
+                outcome = "ok"
+                try:
+                    while True:
+                        try:
+                            event, data = context.run(next, events)
+                        except StopIteration:
+                            break
+                        if event == "error":
+                            outcome = "error"
+                        if event == "done" and isinstance(data, dict):
+                            data["trace"] = trace.summary()
+                        yield event, data
+                except GeneratorExit:
+                    outcome = "cancelled"
+                    context.run(events.close)
+                    raise
+                except Exception:
+                    outcome = "exception"
+                    raise
+                finally:
+                    _finish(trace, outcome)
+            return run_stream
+
+        @functools.wraps(fn)
+        def run(*args, request_id: str = None, **kwargs):
+            trace = Trace(operation, request_id)
+            token = _current.set(trace)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                _finish(trace, "exception")
+                raise
+            finally:
+                _current.reset(token)
+            summary = _finish(trace, _outcome(result))
+            if isinstance(result, dict):
+                result["trace"] = summary
+            return result
+        return run
+
+    return decorate
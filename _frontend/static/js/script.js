@@ -1,3 +1,6 @@
+// Session of the most recently solved problem; doubts are answered against it
+let currentSessionId = "";
+
 function openTab(evt, tabName) {
     let tabcontent = document.getElementsByClassName("tabcontent");
     for (let i = 0; i < tabcontent.length; i++) {
@@ -36,6 +39,7 @@ function sendOCR() {
         if(data.error) {
             resultText.innerHTML = `<span style="color:#ff6b6b;">Error: ${data.message}</span>`;
         } else {
+            currentSessionId = data.session_id || "";
             resultText.innerHTML = "$$" + data.latex + "$$";
             MathJax.typeset(); 
         }
@@ -46,44 +50,93 @@ function sendOCR() {
     });
 }
 
+function renderSteps(steps) {
+    let stepsHtml = "";
+    if (steps && steps.length > 0) {
+        steps.forEach(s => {
+            stepsHtml += `<div class="step-item">
+                <strong>Step ${s.step_number} <span style="font-weight:400; color:#94a3b8;">(${s.type})</span></strong> 
+                $$ ${s.output} $$
+            </div>`;
+        });
+    } else {
+        stepsHtml = "<p style='color:#aaa'>No intermediate steps available.</p>";
+    }
+    document.getElementById("math_steps").innerHTML = stepsHtml;
+}
+
 function solveMath() {
     let input = document.getElementById("math_input").value;
     if(!input) return;
 
     let resultBox = document.getElementById("math_result_box");
+    let answerEl = document.getElementById("math_answer");
+    let explanationEl = document.getElementById("math_explanation");
+
     // Show loading
     resultBox.style.display = "block";
-    document.getElementById("math_answer").innerHTML = '<span style="color:#aaa;">Computing...</span>';
+    answerEl.innerHTML = '<span style="color:#aaa;">Computing...</span>';
     document.getElementById("math_steps").innerHTML = "";
-    document.getElementById("math_explanation").innerHTML = "";
+    explanationEl.innerHTML = "";
 
     let formData = new FormData();
     formData.append("math_input", input);
 
-    fetch("/solve_math", {method: "POST", body: formData})
-    .then(res => res.json())
-    .then(data => {
-        if(data.error) {
-            document.getElementById("math_answer").innerHTML = `<span style="color:#ff6b6b;">${data.message}</span>`;
-        } else {
-            document.getElementById("math_answer").innerHTML = "$$" + data.final_answer + "$$";
-
-            let stepsHtml = "";
-            if (data.steps && data.steps.length > 0) {
-                data.steps.forEach(s => {
-                    stepsHtml += `<div class="step-item">
-                        <strong>Step ${s.step_number} <span style="font-weight:400; color:#94a3b8;">(${s.type})</span></strong> 
-                        $$ ${s.output} $$
-                    </div>`;
-                });
-            } else {
-                stepsHtml = "<p style='color:#aaa'>No intermediate steps available.</p>";
+    let explanation = "";
+
+    // Server-sent events over a POST body: parse "event:/data:" frames by hand
+    function handleEvent(event, data) {
+        if (event === "error") {
+            answerEl.innerHTML = `<span style="color:#ff6b6b;">${data.message || data.error}</span>`;
+        } else if (event === "result") {
+            currentSessionId = data.session_id || "";
+            answerEl.innerHTML = "$$" + data.final_answer + "$$";
+            if (data.warning) {
+                answerEl.innerHTML += `<div style="color:#f0ad4e;">⚠ ${data.warning}</div>`;
             }
-            document.getElementById("math_steps").innerHTML = stepsHtml;
-            document.getElementById("math_explanation").innerHTML = data.explanation || "<p>No explanation provided.</p>";
-
+            renderSteps(data.steps);
+            explanationEl.innerHTML = '<span style="color:#aaa;">Writing explanation...</span>';
+            MathJax.typeset();
+        } else if (event === "explanation") {
+            explanation += data;
+            explanationEl.innerHTML = explanation;
+        } else if (event === "done") {
+            explanationEl.innerHTML = explanation || "<p>No explanation provided.</p>";
             MathJax.typeset();
         }
+    }
+
+    fetch("/solve_math_stream", {method: "POST", body: formData})
+    .then(res => {
+        // Input errors come back as plain JSON, not as a stream
+        if (!res.headers.get("content-type").startsWith("text/event-stream")) {
+            return res.json().then(data => handleEvent("error", data));
+        }
+
+        let reader = res.body.getReader();
+        let decoder = new TextDecoder();
+        let buffer = "";
+
+        function pump() {
+            return reader.read().then(({done, value}) => {
+                if (done) return;
+                buffer += decoder.decode(value, {stream: true});
+
+                let frames = buffer.split("\n\n");
+                buffer = frames.pop();
+                frames.forEach(frame => {
+                    let event = "message";
+                    let data = "";
+                    frame.split("\n").forEach(line => {
+                        if (line.startsWith("event: ")) event = line.slice(7);
+                        else if (line.startsWith("data: ")) data += line.slice(6);
+                    });
+                    handleEvent(event, JSON.parse(data));
+                });
+                return pump();
+            });
+        }
+        return pump();
     })
     .catch(err => console.error(err));
 }
@@ -105,12 +158,13 @@ function askDoubt() {
 
     let formData = new FormData();
     formData.append("question", question);
+    formData.append("session_id", currentSessionId);
     formData.append("step_number", stepNum ? stepNum : -1);
 
     fetch("/ask_doubt", {method: "POST", body: formData})
     .then(res => res.json())
     .then(data => {
-        answerText.innerHTML = data.answer || data.error;
+        answerText.innerHTML = data.answer || data.message || data.error;
 
     })
     .catch(err => console.error(err));
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+
+from .prompt_builder import count_tokens
+from .scheduler import ScheduledLLM, get_scheduler
+from _app import config
+
+
+# ---------------------------------------------------------
+# 🔌 BACKEND INTERFACE
+# ---------------------------------------------------------
+# A backend is anything with LangChain's chat-model surface:
+#   invoke(prompt) / await ainvoke(prompt) -> message with .content
+#   stream(prompt) / astream(prompt)       -> iterator of message chunks
+# StepExplainer, DoubtHandler and StatementParser only ever use these, always
+# through a ScheduledLLM (concurrency cap, rate limit, priorities, retries).
+
+def _gemini(model: str, temperature: float):
+    # langchain_google_genai is slow to import: only pay for it when selected
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=os.getenv("GEMINI_API_KEY"),
+        temperature=temperature,
+    )
+
+
+def _offline(model: str, temperature: float):
+    return OfflineLLM(
+        latency=config.OFFLINE_LLM_LATENCY,
+        jitter=config.OFFLINE_LLM_JITTER,
+        error_rate=config.OFFLINE_LLM_ERROR_RATE,
+        seed=config.OFFLINE_LLM_SEED,
+        model=model
+    )
+
+
+BACKENDS = {
+    "gemini": _gemini,
+    "offline": _offline,
+}
+
+
+def create_llm(model: str, temperature: float = 0.2, backend: str = None, priority: str = "explanation"):
+    """
+    Build the chat model for `backend` (defaults to LLM_BACKEND), scheduled
+    at `priority` (interactive | explanation | batch) unless a call says otherwise.
+    """
+    name = backend or config.LLM_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}' (expected one of: {', '.join(BACKENDS)})")
+    return ScheduledLLM(BACKENDS[name](model, temperature), get_scheduler(), priority)
+
+
+# ---------------------------------------------------------
+# 🧪 OFFLINE STAND-IN
+# ---------------------------------------------------------
+
+class OfflineLLMError(RuntimeError):
+    pass
+
+
+class LLMMessage:
+    """Minimal stand-in for LangChain's AIMessage / AIMessageChunk."""
+
+    def __init__(self, content: str, usage_metadata: dict = None):
+        self.content = content
+        self.usage_metadata = usage_metadata or {}
+
+
+class OfflineLLM:
+    """
+    Deterministic local backend for load tests and benchmarks.
+    Answers are templated from the prompt (explanations, batched explanations,
+    extracted expressions, doubts). Each call waits `latency` ± `jitter` seconds
+    and fails with probability `error_rate`; with a seed the sequence of
+    delays and failures is reproducible.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None,
+        model: str = "offline",
+        chunk_size: int = 16,
+        responses: dict = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.model = model
+        self.chunk_size = chunk_size
+        # Optional canned answers: {substring of prompt: response}
+        self.responses = responses or {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def invoke(self, prompt: str) -> LLMMessage:
+        delay, failed = self._next_call()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise OfflineLLMError(f"Injected failure ({self.model})")
+        return self._message(prompt)
+
+    async def ainvoke(self, prompt: str) -> LLMMessage:
+        delay, failed = self._next_call()
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            raise OfflineLLMError(f"Injected failure ({self.model})")
+        return self._message(prompt)
+
+    def stream(self, prompt: str):
+        delay, failed = self._next_call()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise OfflineLLMError(f"Injected failure ({self.model})")
+        for chunk in self._chunks(self.respond(prompt)):
+            yield LLMMessage(chunk)
+
+    async def astream(self, prompt: str):
+        delay, failed = self._next_call()
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            raise OfflineLLMError(f"Injected failure ({self.model})")
+        for chunk in self._chunks(self.respond(prompt)):
+            yield LLMMessage(chunk)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": self.calls, "errors": self.errors}
+
+    # ---------------------------------------------------------
+    # 🧾 RESPONSES
+    # ---------------------------------------------------------
+
+    def respond(self, prompt: str) -> str:
+        for needle, response in self.responses.items():
+            if needle in prompt:
+                return response
+
+        if "<!-- PROBLEM" in prompt:
+            count = len(re.findall(r"^Problem \d+ \(", prompt, flags=re.MULTILINE))
+            return "\n".join(
+                f"<!-- PROBLEM {n} -->\n<p>Offline explanation for problem {n}.</p>"
+                for n in range(1, count + 1)
+            )
+
+        if "math expression extractor" in prompt:
+            return self._extract_expression(prompt)
+
+        if "User question:" in prompt:
+            return "<p>Offline answer: re-read the step and check each operation.</p>"
+
+        steps = len(re.findall(r"^\d+\. ", prompt, flags=re.MULTILINE))
+        return f"<h3>Explanation</h3><p>Offline explanation of {steps} steps.</p>"
+
+    def _extract_expression(self, prompt: str) -> str:
+        # Longest run of formula tokens (numbers, single letters, operators) in the word problem
+        text = prompt.split("Word problem:", 1)[-1].split("Output format:", 1)[0]
+        best, run = "", []
+        for token in re.findall(r"\d+\.?\d*|[A-Za-z]+|\*\*|[-+*/^()=]|\S", text) + [""]:
+            if re.fullmatch(r"\d+\.?\d*|[a-z]|\*\*|[-+*/^()=]|sin|cos|tan|log|exp|sqrt", token):
+                run.append(token)
+                continue
+            candidate = " ".join(run)
+            if re.search(r"[=+*/^-]", candidate) and len(candidate) > len(best):
+                best = candidate
+            run = []
+        return best or "x = 0"
+
+    def _message(self, prompt: str) -> LLMMessage:
+        content = self.respond(prompt)
+        return LLMMessage(content, {
+            "input_tokens": count_tokens(prompt),
+            "output_tokens": count_tokens(content)
+        })
+
+    def _chunks(self, text: str):
+        for i in range(0, len(text), self.chunk_size):
+            yield text[i:i + self.chunk_size]
+
+    def _next_call(self) -> tuple:
+        """Count the call, draw its delay and decide whether it fails (after the delay, like a real timeout)."""
+        with self._lock:
+            self.calls += 1
+            delay = max(self.latency + self._random.uniform(-self.jitter, self.jitter), 0.0)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
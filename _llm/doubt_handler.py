@@ -1,39 +1,102 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from .prompts import DOUBT_HANDLER_PROMPT
-import os
+from .backends import create_llm
+from .prompt_builder import UsageTracker, compact_html, count_tokens, fit_steps, truncate
+from _app import config
+from _core import metrics
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
 class DoubtHandler:
-    def __init__(self,model_name="models/gemini-2.5-flash-preview-09-2025"):
-        api_key = os.getenv("GEMINI_API_KEY")
-        self.llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            google_api_key=api_key,
-            temperature=0.2,  # Keep explanations focused
-        )
+    def __init__(self,model_name="models/gemini-2.5-flash-preview-09-2025", prompt_budget: int = None, context_window: int = None):
+        self.model_name = model_name
+        self._llm = None
+        # Max prompt tokens per doubt, and how many neighbours of the asked-about step to send
+        self.prompt_budget = prompt_budget or config.DOUBT_PROMPT_BUDGET
+        self.context_window = config.DOUBT_CONTEXT_WINDOW if context_window is None else context_window
+        self.usage = UsageTracker()
+
+    @property
+    def llm(self):
+        # Built on first use: the Gemini client is slow to import
+        if self._llm is None:
+            # A student is waiting on the answer: ahead of explanations and batch work
+            self._llm = create_llm(self.model_name, temperature=0.2, priority="interactive")
+        return self._llm
 
     def answer_doubt(
         self,
         user_question: str,
         normalized_steps: list[dict],
         final_answer: str,
-        previous_explanation: str = ""
+        previous_explanation: str = "",
+        step_number: int = None
     ) -> str:
 
-        formatted_steps = "\n".join([
-            f"Step {s['step_number']}: {s['input']} → {s['output']} ({s['explanation_hint']})"
-            for s in normalized_steps
-        ])
+        prompt = self._build_prompt(user_question, normalized_steps, final_answer, previous_explanation, step_number)
 
-        prompt = DOUBT_HANDLER_PROMPT.format(
-            user_question=user_question,
-            steps=formatted_steps,
-            final_answer=final_answer,
-            explanation=previous_explanation
-        )
+        try:
+            response = self.llm.invoke(prompt)
+        except Exception:
+            metrics.LLM_ERRORS.inc(component="doubt")
+            raise
+
+        self.usage.record(prompt, response)
+        return response.content
+
+    async def aanswer_doubt(
+        self,
+        user_question: str,
+        normalized_steps: list[dict],
+        final_answer: str,
+        previous_explanation: str = "",
+        step_number: int = None
+    ) -> str:
+
+        prompt = self._build_prompt(user_question, normalized_steps, final_answer, previous_explanation, step_number)
+
+        try:
+            response = await self.llm.ainvoke(prompt)
+        except Exception:
+            metrics.LLM_ERRORS.inc(component="doubt")
+            raise
 
-        response = self.llm.invoke(prompt)
+        self.usage.record(prompt, response)
         return response.content
+
+    def _build_prompt(
+        self,
+        user_question: str,
+        normalized_steps: list[dict],
+        final_answer: str,
+        previous_explanation: str,
+        step_number: int = None
+    ) -> str:
+        """
+        Fill the doubt prompt within the token budget.
+        Priority: the question, the asked-about step and its neighbours,
+        the final answer, then as much of the old explanation (tags stripped) as still fits.
+        """
+        budget = self.prompt_budget - count_tokens(DOUBT_HANDLER_PROMPT)
+
+        question = truncate(user_question, budget // 5)
+        answer = truncate(str(final_answer), budget // 10)
+        budget -= count_tokens(question) + count_tokens(answer)
+
+        steps = fit_steps(
+            normalized_steps,
+            max(budget * 2 // 3, 1),
+            focus=step_number,
+            window=self.context_window
+        )
+        budget -= count_tokens(steps)
+
+        explanation = truncate(compact_html(previous_explanation), max(budget, 0))
+
+        return DOUBT_HANDLER_PROMPT.format(
+            user_question=question,
+            steps=steps,
+            final_answer=answer,
+            explanation=explanation
+        )
@@ -1,46 +1,215 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-import os
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import re
 from dotenv import load_dotenv
 
+from .prompts import STEP_EXPLAINER_PROMPT, STEP_EXPLAINER_BATCH_PROMPT
+from .backends import create_llm
+from .prompt_builder import SERIALIZER_VERSION, UsageTracker, fit_steps
+from _core import metrics
+from _core.cache import LRUCache, DiskStore, hash_key
+from _core.singleflight import SingleFlight
+from _app import config
+
 load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
+
+# Any edit to the prompt templates changes this and invalidates cached explanations
+PROMPT_VERSION = hashlib.sha256(
+    (STEP_EXPLAINER_PROMPT + STEP_EXPLAINER_BATCH_PROMPT + SERIALIZER_VERSION).encode("utf-8")
+).hexdigest()[:16]
+
+BATCH_MARKER = re.compile(r"<!--\s*PROBLEM\s+(\d+)\s*-->")
+
 
 class StepExplainer:
-    def __init__(self, model="gemini-2.5-flash-preview-09-2025"):
-        self.llm = ChatGoogleGenerativeAI(
-            model=model,
-            google_api_key=api_key,
-            temperature=0.2,
+    def __init__(self, model="gemini-2.5-flash-preview-09-2025", cache: LRUCache = None, prompt_budget: int = None):
+        self.model_name = model
+        self._llm = None
+        self.cache = cache if cache is not None else self._build_cache()
+        # Max tokens of serialized steps per prompt
+        self.prompt_budget = prompt_budget or config.EXPLAIN_PROMPT_BUDGET
+        self.usage = UsageTracker()
+        # A class submitting the same problem at once shares one LLM call per explanation
+        self.flights = SingleFlight("explainer")
+
+    @property
+    def llm(self):
+        # Built on first use: the Gemini client is slow to import
+        if self._llm is None:
+            self._llm = create_llm(self.model_name, temperature=0.2)
+        return self._llm
+
+    def _build_cache(self) -> LRUCache:
+        store = DiskStore(
+            config.CACHE_PATH,
+            namespace="explanations",
+            max_entries=config.EXPLANATION_CACHE_MAX_ENTRIES,
+            max_age=config.EXPLANATION_CACHE_MAX_AGE
         )
+        return LRUCache(maxsize=config.EXPLANATION_CACHE_SIZE, store=store)
+
+    def cache_key(self, normalized_steps: list[dict], final_answer: str, problem_type: str) -> str:
+        steps = json.dumps(normalized_steps, sort_keys=True, default=str)
+        return hash_key(problem_type, steps, final_answer, self.model_name, PROMPT_VERSION)
 
     def explain_steps(self, normalized_steps: list[dict], final_answer: str, problem_type: str = "general") -> str:
         """
         Convert structured steps into a friendly natural language explanation.
+        Explanations are served from the cache when the same steps were explained before.
         """
 
-        # Format steps into readable bullets
-        formatted_steps = "\n".join([
-            f"Step {s['step_number']}: {s['type']} → {s['output']}"
-            for s in normalized_steps
-        ])
+        key = self.cache_key(normalized_steps, final_answer, problem_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
 
-        prompt = f"""
-You are a friendly math tutor. Explain the steps for solving a {problem_type} problem.
-Explain the solution using ONLY valid HTML.
-DO NOT use Markdown syntax.
-DO NOT use ###, **, ---, or bullet dashes.
+        def call():
+            prompt = self._build_prompt(normalized_steps, final_answer, problem_type)
+            response = self.llm.invoke(prompt)
+            self.usage.record(prompt, response)
+            return self._store(key, response)
 
-Steps performed:
-{formatted_steps}
+        try:
+            return self.flights.do(key, call)
+        except Exception as e:
+            metrics.LLM_ERRORS.inc(component="explainer")
+            return f"Explanation unavailable due to error: {str(e)}"
 
-Final answer: {final_answer}
+    async def aexplain_steps(self, normalized_steps: list[dict], final_answer: str, problem_type: str = "general") -> str:
+        """Async variant of explain_steps using the LLM's ainvoke path."""
 
-Explain what is happening in each step, and why it is correct.
-Keep the explanation short, clean, and helpful for a student.
+        key = self.cache_key(normalized_steps, final_answer, problem_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def call():
+            prompt = self._build_prompt(normalized_steps, final_answer, problem_type)
+            response = await self.llm.ainvoke(prompt)
+            self.usage.record(prompt, response)
+            return self._store(key, response)
+
+        try:
+            return await self.flights.ado(key, call)
+        except Exception as e:
+            metrics.LLM_ERRORS.inc(component="explainer")
+            return f"Explanation unavailable due to error: {str(e)}"
+
+    def stream_explain(self, normalized_steps: list[dict], final_answer: str, problem_type: str = "general"):
         """
+        Yield the explanation as it is generated, chunk by chunk.
+        A cache hit is yielded as one chunk; a completed stream is cached.
+        """
+
+        key = self.cache_key(normalized_steps, final_answer, problem_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        prompt = self._build_prompt(normalized_steps, final_answer, problem_type)
 
+        chunks = []
         try:
-            response = self.llm.invoke(prompt)
-            return response.content if hasattr(response, "content") else str(response)
+            for chunk in self.llm.stream(prompt):
+                text = chunk.content if hasattr(chunk, "content") else str(chunk)
+                if text:
+                    chunks.append(text)
+                    yield text
         except Exception as e:
-            return f"Explanation unavailable due to error: {str(e)}"
\ No newline at end of file
+            metrics.LLM_ERRORS.inc(component="explainer")
+            yield f"Explanation unavailable due to error: {str(e)}"
+            return
+
+        explanation = "".join(chunks)
+        self.usage.record(prompt, explanation)
+        self.cache.put(key, explanation)
+
+    def explain_many(self, items: list[dict], group_size: int = 5, concurrency: int = 4) -> list[str]:
+        """
+        Explain several solved problems, sharing one LLM prompt per group.
+        Each item holds the explain_steps keyword arguments. Results keep input order.
+        """
+
+        results = [None] * len(items)
+        keys = [self.cache_key(**item) for item in items]
+
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                missing.append(i)
+
+        groups = [missing[j:j + group_size] for j in range(0, len(missing), group_size)]
+        if not groups:
+            return results
+
+        def explain_group(group):
+            try:
+                return self._explain_group([items[i] for i in group])
+            except Exception as e:
+                metrics.LLM_ERRORS.inc(component="explainer")
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(groups))) as io:
+            for group, texts in zip(groups, io.map(explain_group, groups)):
+                if isinstance(texts, Exception):
+                    for i in group:
+                        results[i] = f"Explanation unavailable due to error: {str(texts)}"
+                    continue
+
+                for i, text in zip(group, texts):
+                    if text is None:
+                        # The shared answer could not be split for this item: ask on its own
+                        results[i] = self.explain_steps(**items[i])
+                    else:
+                        self.cache.put(keys[i], text)
+                        results[i] = text
+
+        return results
+
+    def _explain_group(self, items: list[dict]) -> list:
+        if len(items) == 1:
+            return [None]
+
+        # The step budget is shared by every problem in the group
+        share = max(self.prompt_budget // len(items), 100)
+        problems = "\n\n".join([
+            f"Problem {n} ({item.get('problem_type', 'general')}):\n"
+            f"Steps performed:\n{self._format_steps(item['normalized_steps'], share)}\n"
+            f"Final answer: {item['final_answer']}"
+            for n, item in enumerate(items, start=1)
+        ])
+
+        prompt = STEP_EXPLAINER_BATCH_PROMPT.format(count=len(items), problems=problems)
+        response = self.llm.invoke(prompt, priority="batch")
+        self.usage.record(prompt, response)
+        content = response.content if hasattr(response, "content") else str(response)
+
+        # re.split keeps the captured problem numbers: [preamble, n1, text1, n2, text2, ...]
+        parts = BATCH_MARKER.split(content)
+        sections = {}
+        for number, text in zip(parts[1::2], parts[2::2]):
+            if text.strip():
+                sections[int(number)] = text.strip()
+
+        return [sections.get(n) for n in range(1, len(items) + 1)]
+
+    def _build_prompt(self, normalized_steps: list[dict], final_answer: str, problem_type: str) -> str:
+        return STEP_EXPLAINER_PROMPT.format(
+            problem_type=problem_type,
+            steps=self._format_steps(normalized_steps, self.prompt_budget),
+            final_answer=final_answer
+        )
+
+    def _format_steps(self, normalized_steps: list[dict], max_tokens: int) -> str:
+        # Compact "n. type | output" lines, trimmed to the token budget
+        return fit_steps(normalized_steps, max_tokens, fields=("type", "output"))
+
+    def _store(self, key: str, response) -> str:
+        explanation = response.content if hasattr(response, "content") else str(response)
+        self.cache.put(key, explanation)
+        return explanation
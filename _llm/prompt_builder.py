@@ -0,0 +1,143 @@
+import math
+import re
+import threading
+
+# Bump when the step serialization changes: it is part of the explanation cache key
+SERIALIZER_VERSION = "1"
+
+
+# ---------------------------------------------------------
+# 🔢 TOKEN COUNTING
+# ---------------------------------------------------------
+
+def count_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for Gemini/GPT tokenizers
+    on English + math). Good enough for budgeting; billing numbers come
+    from the provider's usage metadata.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / 4)
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    return text[:max(max_tokens, 0) * 4].rstrip() + " …"
+
+
+# ---------------------------------------------------------
+# 🪜 COMPACT SERIALIZATION
+# ---------------------------------------------------------
+
+def serialize_step(step: dict, fields=("type", "input", "output", "hint"), max_tokens: int = None) -> str:
+    """One step per line: 'n. type | input → output (hint)', empty fields omitted."""
+    kind = step.get("type") if "type" in fields else None
+    source = step.get("input") if "input" in fields else None
+    output = step.get("output") if "output" in fields else None
+    hint = step.get("hint") if "hint" in fields else None
+
+    line = f"{step.get('step_number')}."
+    if kind:
+        line += f" {kind} |"
+    if source:
+        line += f" {source} →"
+    if output:
+        line += f" {output}"
+    if hint:
+        line += f" ({hint})"
+
+    line = line.rstrip(" |")
+    return truncate(line, max_tokens) if max_tokens else line
+
+
+def fit_steps(steps: list[dict], max_tokens: int, focus: int = None, window: int = 1, **kwargs) -> str:
+    """
+    Serialize as many steps as fit in max_tokens.
+    With a focus step, that step and its `window` neighbours go first and the
+    rest are added by distance from it; otherwise steps are kept in order.
+    Dropped runs are replaced by a single '…' line.
+    """
+    if not steps:
+        return ""
+
+    numbers = [s.get("step_number") for s in steps]
+    if focus in numbers:
+        centre = numbers.index(focus)
+        order = sorted(range(len(steps)), key=lambda i: (abs(i - centre) > window, abs(i - centre), i))
+    else:
+        order = list(range(len(steps)))
+
+    # A single step may take at most half the budget so one huge expression cannot crowd out the rest
+    per_step = max(max_tokens // 2, 1)
+    lines = {i: serialize_step(steps[i], max_tokens=per_step, **kwargs) for i in range(len(steps))}
+
+    kept, used = set(), 0
+    for i in order:
+        cost = count_tokens(lines[i]) + 1
+        if used + cost > max_tokens and kept:
+            break
+        kept.add(i)
+        used += cost
+
+    out, skipped = [], False
+    for i in range(len(steps)):
+        if i in kept:
+            out.append(lines[i])
+            skipped = False
+        elif not skipped:
+            out.append("…")
+            skipped = True
+    return "\n".join(out)
+
+
+def compact_html(html: str) -> str:
+    """Strip tags and collapse whitespace: previous explanations are context, not markup."""
+    text = re.sub(r"<[^>]+>", " ", html or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+# ---------------------------------------------------------
+# 📊 USAGE
+# ---------------------------------------------------------
+
+class UsageTracker:
+    """Prompt/completion token totals for one LLM user, plus the last call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.last = None
+
+    def record(self, prompt: str, response) -> dict:
+        """
+        Record one call. Uses the provider's usage metadata when the response
+        carries it (LangChain AIMessage.usage_metadata), otherwise estimates.
+        """
+        meta = getattr(response, "usage_metadata", None) or {}
+        content = response.content if hasattr(response, "content") else str(response)
+
+        usage = {
+            "prompt_tokens": meta.get("input_tokens") or count_tokens(prompt),
+            "completion_tokens": meta.get("output_tokens") or count_tokens(content),
+            "estimated": not meta
+        }
+
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += usage["prompt_tokens"]
+            self.completion_tokens += usage["completion_tokens"]
+            self.last = usage
+        return usage
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "last": self.last
+            }
@@ -27,6 +27,37 @@ Final Answer:
 Explain the complete process in a student-friendly way:
 """
 
+STEP_EXPLAINER_PROMPT = """
+You are a friendly math tutor. Explain the steps for solving a {problem_type} problem.
+Explain the solution using ONLY valid HTML.
+DO NOT use Markdown syntax.
+DO NOT use ###, **, ---, or bullet dashes.
+
+Steps performed:
+{steps}
+
+Final answer: {final_answer}
+
+Explain what is happening in each step, and why it is correct.
+Keep the explanation short, clean, and helpful for a student.
+"""
+
+STEP_EXPLAINER_BATCH_PROMPT = """
+You are a friendly math tutor. Below are {count} separate problems that were already solved.
+Explain each of them for a student.
+Explain the solutions using ONLY valid HTML.
+DO NOT use Markdown syntax.
+DO NOT use ###, **, ---, or bullet dashes.
+
+Start the explanation of problem N with this exact marker on its own line:
+<!-- PROBLEM N -->
+
+{problems}
+
+For every problem, explain what is happening in each step, and why it is correct.
+Keep each explanation short, clean, and helpful for a student.
+"""
+
 DOUBT_HANDLER_PROMPT = """
 You are a math teaching assistant.
 
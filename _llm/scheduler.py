@@ -0,0 +1,322 @@
+import asyncio
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+
+from _app import config
+from _core import metrics
+
+# Lower runs first: a student waiting on a doubt beats a worksheet explanation
+PRIORITIES = {"interactive": 0, "explanation": 1, "batch": 2}
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_RETRYABLE_MESSAGE = re.compile(
+    r"\b(?:408|429|500|502|503|504)\b|rate.?limit|resource.?exhausted|quota|unavailable|overloaded|timed? ?out|deadline",
+    re.IGNORECASE
+)
+_RATE_LIMITED = re.compile(r"\b429\b|rate.?limit|resource.?exhausted|quota", re.IGNORECASE)
+
+
+def _status(error: BaseException):
+    for owner in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "code", "status"):
+            value = getattr(owner, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, dropped connections, 429 and 5xx: worth another try after a pause."""
+    from .backends import OfflineLLMError
+    if isinstance(error, (TimeoutError, ConnectionError, OfflineLLMError)):
+        return True
+    status = _status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return bool(_RETRYABLE_MESSAGE.search(str(error)))
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return _status(error) == 429 or bool(_RATE_LIMITED.search(str(error)))
+
+
+class _Ticket:
+    __slots__ = ("priority", "enqueued", "event", "loop", "future", "granted", "cancelled")
+
+    def __init__(self, priority: str, loop=None):
+        self.priority = priority
+        self.enqueued = time.perf_counter()
+        self.granted = False
+        self.cancelled = False
+        self.loop = loop
+        if loop is None:
+            self.event = threading.Event()
+            self.future = None
+        else:
+            self.event = None
+            self.future = loop.create_future()
+
+
+class LLMScheduler:
+    """
+    One gate in front of every LLM call in the process.
+
+    A call needs a concurrency slot (at most `max_concurrency` run at once)
+    and a token from a bucket refilled at `rate_per_minute` (up to `burst`
+    saved); 0 turns either limit off. Waiting calls form one priority
+    queue: interactive before explanation before batch, first come first
+    served within a class.
+    Slots are granted by whoever frees one, so thread and asyncio callers
+    share the queue without polling. A 429 from the provider empties the
+    bucket, slowing every caller instead of letting them all fail.
+    """
+
+    def __init__(self, max_concurrency: int = 8, rate_per_minute: float = 0, burst: int = 10,
+                 max_retries: int = 3, retry_base: float = 0.5, retry_max: float = 8.0, seed: int = None):
+        self.max_concurrency = max_concurrency
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(burst, 1)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._queue = []
+        self._order = itertools.count()
+        self._active = 0
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._timer = None
+        self.retries = 0
+        self.throttled = 0
+
+    # ---------------------------------------------------------
+    # 🎟 ADMISSION
+    # ---------------------------------------------------------
+
+    def acquire(self, priority: str = "explanation"):
+        ticket = self._enqueue(_Ticket(priority))
+        ticket.event.wait()
+        self._admitted(ticket)
+
+    async def aacquire(self, priority: str = "explanation"):
+        ticket = self._enqueue(_Ticket(priority, asyncio.get_running_loop()))
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            with self._lock:
+                ticket.cancelled = True
+                granted = ticket.granted
+            if granted:
+                # The slot arrived as we were cancelled: hand it on
+                self.release()
+            raise
+        self._admitted(ticket)
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+            self._dispatch()
+
+    def throttle(self):
+        """The provider said 429: spend the bucket so new calls wait for a refill."""
+        with self._lock:
+            self.throttled += 1
+            if self.rate > 0:
+                self._refill()
+                self._tokens = min(self._tokens, 0.0)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform in [0, min(retry_max, base * 2**attempt)]."""
+        with self._lock:
+            self.retries += 1
+            return self._random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+
+    def stats(self) -> dict:
+        with self._lock:
+            depth = {name: 0 for name in PRIORITIES}
+            for _, _, ticket in self._queue:
+                if not ticket.cancelled:
+                    depth[ticket.priority] += 1
+            return {
+                "active": self._active,
+                "queued": depth,
+                "tokens": round(self._tokens, 2) if self.rate > 0 else None,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "max_concurrency": self.max_concurrency
+            }
+
+    def _enqueue(self, ticket: _Ticket) -> _Ticket:
+        if ticket.priority not in PRIORITIES:
+            raise ValueError(f"Unknown LLM priority '{ticket.priority}' (expected one of: {', '.join(PRIORITIES)})")
+        with self._lock:
+            heapq.heappush(self._queue, (PRIORITIES[ticket.priority], next(self._order), ticket))
+            self._dispatch()
+        return ticket
+
+    def _admitted(self, ticket: _Ticket):
+        metrics.LLM_QUEUE_SECONDS.observe(time.perf_counter() - ticket.enqueued, priority=ticket.priority)
+
+    def _dispatch(self):
+        """Grant slots to the head of the queue while slots and tokens last. Caller holds the lock."""
+        while self._queue and (self.max_concurrency <= 0 or self._active < self.max_concurrency):
+            ticket = self._queue[0][2]
+            if ticket.cancelled:
+                heapq.heappop(self._queue)
+                continue
+
+            if self.rate > 0:
+                self._refill()
+                if self._tokens < 1:
+                    self._wake_in((1 - self._tokens) / self.rate)
+                    return
+                self._tokens -= 1
+
+            heapq.heappop(self._queue)
+            self._active += 1
+            ticket.granted = True
+            if ticket.loop is None:
+                ticket.event.set()
+            else:
+                ticket.loop.call_soon_threadsafe(self._resolve, ticket)
+
+    def _resolve(self, ticket: _Ticket):
+        if not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _wake_in(self, delay: float):
+        # One pending timer is enough: each dispatch re-arms it if tokens are still short
+        if self._timer is not None and self._timer.is_alive():
+            return
+        self._timer = threading.Timer(delay, self._wake)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _wake(self):
+        with self._lock:
+            self._timer = None
+            self._dispatch()
+
+
+class ScheduledLLM:
+    """
+    Chat model proxy that runs every call through an LLMScheduler, with the
+    same invoke / ainvoke / stream / astream surface as the wrapped backend.
+    Retryable failures are retried with jittered exponential backoff,
+    outside the concurrency slot. A stream is retried only if it failed
+    before its first chunk.
+    """
+
+    def __init__(self, llm, scheduler: LLMScheduler, priority: str = "explanation"):
+        self.llm = llm
+        self.scheduler = scheduler
+        self.priority = priority
+
+    def invoke(self, prompt, priority: str = None):
+        priority = priority or self.priority
+        for attempt in itertools.count():
+            self.scheduler.acquire(priority)
+            try:
+                return self.llm.invoke(prompt)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, priority)
+            finally:
+                self.scheduler.release()
+            time.sleep(delay)
+
+    async def ainvoke(self, prompt, priority: str = None):
+        priority = priority or self.priority
+        for attempt in itertools.count():
+            await self.scheduler.aacquire(priority)
+            try:
+                return await self.llm.ainvoke(prompt)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, priority)
+            finally:
+                self.scheduler.release()
+            await asyncio.sleep(delay)
+
+    def stream(self, prompt, priority: str = None):
+        priority = priority or self.priority
+        for attempt in itertools.count():
+            started = False
+            self.scheduler.acquire(priority)
+            try:
+                for chunk in self.llm.stream(prompt):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started:
+                    raise
+                delay = self._retry_delay(e, attempt, priority)
+            finally:
+                self.scheduler.release()
+            time.sleep(delay)
+
+    async def astream(self, prompt, priority: str = None):
+        priority = priority or self.priority
+        for attempt in itertools.count():
+            started = False
+            await self.scheduler.aacquire(priority)
+            try:
+                async for chunk in self.llm.astream(prompt):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started:
+                    raise
+                delay = self._retry_delay(e, attempt, priority)
+            finally:
+                self.scheduler.release()
+            await asyncio.sleep(delay)
+
+    def __getattr__(self, name):
+        # Anything else (stats, model name, ...) comes from the wrapped backend
+        return getattr(self.llm, name)
+
+    def _retry_delay(self, error: Exception, attempt: int, priority: str) -> float:
+        """Backoff before the next attempt; re-raises when the error is final."""
+        if attempt >= self.scheduler.max_retries or not is_retryable(error):
+            raise error
+        if is_rate_limited(error):
+            self.scheduler.throttle()
+        metrics.LLM_RETRIES.inc(priority=priority)
+        return self.scheduler.backoff(attempt)
+
+
+# ---------------------------------------------------------
+# 🌐 PROCESS-WIDE SCHEDULER
+# ---------------------------------------------------------
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler: every component shares its slots and rate budget."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(
+                    max_concurrency=config.LLM_MAX_CONCURRENCY,
+                    rate_per_minute=config.LLM_REQUESTS_PER_MINUTE,
+                    burst=config.LLM_BURST,
+                    max_retries=config.LLM_MAX_RETRIES,
+                    retry_base=config.LLM_RETRY_BASE,
+                    retry_max=config.LLM_RETRY_MAX
+                )
+    return _scheduler
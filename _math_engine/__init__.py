@@ -1,9 +1,10 @@
 from sympy import sympify, solve, Eq, symbols
 import sympy as sp
 
-__all__ = ["MathSolver", "StepExtractor", "StepNormalizer"]
+__all__ = ["MathSolver", "StepExtractor", "StepNormalizer", "SolverPool"]
 
 # Import other modules
 from .solver import MathSolver
 from .step_extractor import StepExtractor
 from .step_normalizer import StepNormalizer
+from .executor import SolverPool
@@ -0,0 +1,128 @@
+import sympy as sp
+
+
+class DifferentiationEngine:
+    """
+    Derivative plus a step tree, one step per distinct subexpression.
+
+    The expression is walked bottom-up and every node gets the rule that
+    fits it (sum, constant multiple, product, quotient, power, exponential,
+    chain). SymPy expressions hash structurally, so a memo keyed by the
+    node turns the tree into a DAG: sin(x) appearing three times is
+    differentiated once and its step is written once. The final answer is
+    assembled from the node derivatives, not from a separate sp.diff().
+    """
+
+    HINTS = {
+        "constant_rule": "d/dx(c) = 0",
+        "sum_rule": "(f + g)' = f' + g'",
+        "constant_multiple": "(c*f)' = c*f'",
+        "product_rule": "(f*g)' = f'*g + f*g'",
+        "quotient_rule": "(f/g)' = (f'*g - f*g') / g^2",
+        "power_rule": "d/dx(u^n) = n*u^(n-1)*u'",
+        "exponential_rule": "d/dx(a^u) = a^u*ln(a)*u'",
+        "logarithmic_differentiation": "d/dx(f^g) = f^g*(g'*ln(f) + g*f'/f)",
+        "chain_rule": "d/dx f(u) = f'(u)*u'",
+        "standard_derivative": "Table derivative of an elementary function",
+        "standard_rule": "Differentiate directly",
+    }
+
+    def differentiate(self, expr, var) -> tuple:
+        """Returns (derivative, step dicts in bottom-up order, number of reused sub-derivatives)."""
+        memo, steps = {}, []
+        reused = [0]
+
+        def d(node):
+            if node in memo:
+                reused[0] += 1
+                return memo[node]
+            result = self._rule(node, var, d, steps)
+            memo[node] = result
+            return result
+
+        expr = sp.sympify(expr)
+        derivative = d(expr)
+        if not steps:
+            # Constant or the bare variable: still show one step
+            rule = "constant_rule" if not expr.has(var) else "power_rule"
+            self._step(steps, rule, expr, var, derivative)
+        return derivative, steps, reused[0]
+
+    # ---------------------------------------------------------
+    # 🌳 RULES PER NODE
+    # ---------------------------------------------------------
+
+    def _rule(self, node, var, d, steps):
+        if not node.has(var):
+            return sp.Integer(0)
+        if node == var:
+            return sp.Integer(1)
+
+        if node.is_Add:
+            result = sp.Add(*[d(term) for term in node.args])
+            return self._step(steps, "sum_rule", node, var, result)
+
+        if node.is_Mul:
+            return self._mul(node, var, d, steps)
+
+        if node.is_Pow:
+            return self._pow(node, var, d, steps)
+
+        if isinstance(node, sp.Function) and len(node.args) == 1:
+            inner = node.args[0]
+            outer = node.fdiff(1)
+            if inner == var:
+                return self._step(steps, "standard_derivative", node, var, outer)
+            result = outer * d(inner)
+            return self._step(steps, "chain_rule", node, var, result, f"u = {sp.sstr(inner)}")
+
+        # Abs, Piecewise, multi-argument functions: no hand rule
+        return self._step(steps, "standard_rule", node, var, sp.diff(node, var))
+
+    def _mul(self, node, var, d, steps):
+        coeff, core = node.as_independent(var, as_Add=False)
+        if coeff != 1:
+            result = coeff * d(core)
+            return self._step(steps, "constant_multiple", node, var, result)
+
+        numer, denom = sp.fraction(node)
+        if denom.has(var) and numer.has(var):
+            result = (d(numer) * denom - numer * d(denom)) / denom**2
+            return self._step(
+                steps, "quotient_rule", node, var, result,
+                f"f = {sp.sstr(numer)}, g = {sp.sstr(denom)}"
+            )
+
+        factors = node.args
+        terms = []
+        for i, factor in enumerate(factors):
+            rest = sp.Mul(*(factors[:i] + factors[i + 1:]))
+            terms.append(d(factor) * rest)
+        return self._step(steps, "product_rule", node, var, sp.Add(*terms))
+
+    def _pow(self, node, var, d, steps):
+        base, exp = node.base, node.exp
+
+        if not exp.has(var):
+            result = exp * base ** (exp - 1) * d(base)
+            detail = None if base == var else f"u = {sp.sstr(base)}"
+            return self._step(steps, "power_rule", node, var, result, detail)
+
+        if not base.has(var):
+            result = node * sp.log(base) * d(exp)
+            return self._step(steps, "exponential_rule", node, var, result)
+
+        result = node * (d(exp) * sp.log(base) + exp * d(base) / base)
+        return self._step(steps, "logarithmic_differentiation", node, var, result)
+
+    def _step(self, steps, rule, node, var, result, detail=None):
+        output = f"d/d{var}({sp.sstr(node)}) = {sp.sstr(result)}"
+        if detail:
+            output = f"{detail}: {output}"
+        steps.append({
+            "type": rule,
+            "input": sp.sstr(node),
+            "output": output,
+            "hint": self.HINTS[rule]
+        })
+        return result
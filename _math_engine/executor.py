@@ -0,0 +1,178 @@
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import time
+
+
+class _Worker:
+    def __init__(self, ctx):
+        # Imported here, not at the top: runpy warns when the package __init__ already imported it
+        from _math_engine.worker import main
+
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        try:
+            if not self.ready and self.conn.poll(timeout):
+                self.ready = self.conn.recv() == "ready"
+        except (EOFError, OSError):
+            self.ready = False
+        return self.ready
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.join(timeout=1)
+        finally:
+            self.conn.close()
+
+
+class SolverPool:
+    """
+    Pool of warm worker processes running MathSolver.
+    Every call has a deadline; a worker that misses it is killed and
+    replaced in the background, so a runaway sp.solve never blocks a request thread.
+    A worker that fails to start is retried with backoff until the pool is back to size.
+    """
+
+    def __init__(self, size: int = 2, deadline: float = 10.0, start_timeout: float = 60.0):
+        self.size = size
+        self.deadline = deadline
+        self.start_timeout = start_timeout
+        self._ctx = mp.get_context("spawn")
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._ready = 0
+        self._starting = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.start_failures = 0
+
+        for _ in range(size):
+            self._spawn()
+
+    # ---------------------------------------------------------
+    # 🚀 PUBLIC API
+    # ---------------------------------------------------------
+
+    def solve(self, user_input: str, deadline: float = None) -> dict:
+        return self.call("solve", user_input, deadline=deadline)
+
+    def call(self, method: str, *args, deadline: float = None):
+        """
+        Run MathSolver.<method>(*args) in a worker.
+        Returns the method's result, or a "timed out" error dict.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        end = time.monotonic() + deadline
+
+        try:
+            worker = self._idle.get(timeout=max(deadline, 0))
+        except queue.Empty:
+            return self._timed_out(deadline)
+
+        try:
+            worker.conn.send((method, args))
+            if worker.conn.poll(max(end - time.monotonic(), 0)):
+                result = worker.conn.recv()
+                self._idle.put(worker)
+                return result
+        except (EOFError, OSError, BrokenPipeError):
+            self._replace(worker)
+            return {"error": "Solver failed", "message": "Solver worker exited unexpectedly."}
+
+        # ⏱ Deadline missed: hard-cancel the worker
+        self.timeouts += 1
+        self._replace(worker)
+        return self._timed_out(deadline)
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._retire(worker)
+
+    def stats(self) -> dict:
+        with self._lock:
+            ready, starting = self._ready, self._starting
+        idle = self._idle.qsize()
+        return {
+            "size": self.size,
+            "ready": ready,
+            "idle": idle,
+            "busy": max(ready - idle, 0),
+            "starting": starting,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+            "start_failures": self.start_failures
+        }
+
+    # ---------------------------------------------------------
+    # 🔧 WORKER MANAGEMENT
+    # ---------------------------------------------------------
+
+    def _spawn(self):
+        with self._lock:
+            self._starting += 1
+        threading.Thread(target=self._start_worker, daemon=True).start()
+
+    def _start_worker(self):
+        """Start one worker, retrying with backoff (1s, 2s, ... 30s) until it reports ready."""
+        try:
+            for attempt in itertools.count():
+                if self._closed:
+                    return
+                worker = None
+                try:
+                    worker = _Worker(self._ctx)
+                    ready = worker.wait_ready(self.start_timeout)
+                except Exception:
+                    ready = False
+
+                if ready and not self._closed:
+                    with self._lock:
+                        self._ready += 1
+                    self._idle.put(worker)
+                    return
+                if worker is not None:
+                    worker.kill()
+                if ready:
+                    return
+                self.start_failures += 1
+                time.sleep(min(30.0, 2.0 ** attempt))
+        finally:
+            with self._lock:
+                self._starting -= 1
+
+    def _replace(self, worker: _Worker):
+        self._retire(worker)
+        self.restarts += 1
+        if not self._closed:
+            self._spawn()
+
+    def _retire(self, worker: _Worker):
+        with self._lock:
+            self._ready -= 1
+        worker.kill()
+
+    @staticmethod
+    def _timed_out(deadline: float) -> dict:
+        return {
+            "error": "Solver timed out",
+            "message": f"The problem took longer than {deadline:g}s to solve. Try a simpler form.",
+            "timed_out": True,
+            "deadline": deadline
+        }
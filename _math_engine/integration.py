@@ -0,0 +1,371 @@
+import threading
+from collections import OrderedDict
+
+import sympy as sp
+
+# One fixed substitution variable per nesting level keeps memo keys stable across requests;
+# step texts show them as u, v, w, ... instead of SymPy's _u0 dummy names
+_NAMES = ("u", "v", "w", "s", "t", "p", "q", "r")
+_U = [sp.Dummy(f"u{level}") for level in range(len(_NAMES))]
+_SHOWN = {dummy: sp.Symbol(name) for dummy, name in zip(_U, _NAMES)}
+
+
+def _show(expr) -> str:
+    """sstr with substitution variables under their display names."""
+    return sp.sstr(sp.sympify(expr).xreplace(_SHOWN))
+
+
+class IntegrationEngine:
+    """
+    Rule-based antiderivatives with a readable rule trace.
+
+    Each term of the integrand is split from its constant factor and run
+    through: table lookup (powers, exp, trig, log of a linear argument),
+    polynomial expansion, partial fractions, u-substitution and integration
+    by parts (LIATE). Only when no rule applies does it call sp.integrate.
+    Results for normalized terms are memoized, so x**2 solved once serves
+    3*x**2 in the next request too.
+    """
+
+    # Bounds the parts/substitution recursion: coursework never needs more
+    MAX_DEPTH = 4
+
+    def __init__(self, memo_size: int = 2048):
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def integrate(self, expr, var, limits: tuple = None) -> tuple:
+        """
+        Returns (antiderivative or definite value, step texts without numbering).
+        `limits` is (lower, upper) for a definite integral.
+        """
+        steps = []
+        terms = sp.Add.make_args(expr)
+        if len(terms) > 1:
+            steps.append(f"Break into separate integrals: {' + '.join(f'∫{t} d{var}' for t in terms)}")
+
+        pieces = []
+        for term in terms:
+            result, rule = self.integrate_term(term, var)
+            steps.append(f"Apply {rule}: ∫{term} d{var} = {sp.sstr(result)}")
+            pieces.append(result)
+        antiderivative = sp.Add(*pieces)
+
+        if limits is None:
+            return antiderivative, steps
+
+        lower, upper = limits
+        if self._singular_between(expr, var, lower, upper):
+            # F(b) - F(a) is wrong across a pole: let SymPy treat it as an improper integral
+            value = sp.integrate(expr, (var, lower, upper))
+            step = f"The integrand is unbounded on [{lower}, {upper}]: evaluate as an improper integral"
+        else:
+            value = sp.simplify(self._at(antiderivative, var, upper) - self._at(antiderivative, var, lower))
+            step = f"Evaluate F({upper}) - F({lower}) with F = {sp.sstr(antiderivative)}"
+
+        divergence = self.divergence(value)
+        if divergence is None:
+            steps.append(f"{step}: {sp.sstr(value)}")
+        elif divergence == "undefined":
+            # nan / zoo / AccumBounds(0, 2) all mean the same to a student: no value at all
+            value = sp.nan
+            steps.append(f"{step}: it has no finite or infinite value, so the integral diverges")
+        else:
+            steps.append(f"{step}: {divergence}, so the integral diverges to {divergence}")
+        return value, steps
+
+    @staticmethod
+    def divergence(value):
+        """None for a convergent definite integral, else "oo", "-oo" or "undefined"."""
+        if value in (sp.oo, -sp.oo):
+            return sp.sstr(value)
+        if value.has(sp.nan, sp.zoo, sp.AccumBounds):
+            return "undefined"
+        return None
+
+    def integrate_term(self, term, var, depth: int = 0) -> tuple:
+        """(antiderivative, rule label) for one term; constant factors are pulled out first."""
+        coeff, core = term.as_independent(var, as_Add=False)
+        if core == 1:
+            return term * var, "constant rule"
+
+        result, rule = self._memoized(core, var, depth)
+        if coeff != 1:
+            rule = f"constant multiple + {rule}"
+        return coeff * result, rule
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._memo)}
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+
+    # ---------------------------------------------------------
+    # 🗂 MEMO
+    # ---------------------------------------------------------
+
+    def _memoized(self, core, var, depth: int) -> tuple:
+        key = (core, var)
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        found = self._apply_rules(core, var, depth)
+        with self._lock:
+            self._memo[key] = found
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return found
+
+    # ---------------------------------------------------------
+    # 📐 RULES
+    # ---------------------------------------------------------
+
+    def _apply_rules(self, f, var, depth: int) -> tuple:
+        found = self._table(f, var)
+        if found is not None:
+            return found
+
+        if f.is_polynomial(var):
+            expanded = sp.expand(f)
+            if expanded != f:
+                result = sum((self.integrate_term(t, var, depth)[0] for t in sp.Add.make_args(expanded)), sp.Integer(0))
+                return result, "expand the polynomial, then power rule"
+
+        if depth < self.MAX_DEPTH and f.is_rational_function(var):
+            found = self._partial_fractions(f, var, depth)
+            if found is not None:
+                return found
+
+        if depth < self.MAX_DEPTH:
+            found = self._substitution(f, var, depth)
+            if found is not None:
+                return found
+
+            found = self._parts(f, var, depth)
+            if found is not None:
+                return found
+
+        return sp.integrate(f, var), "symbolic integration (no elementary rule matched)"
+
+    def _linear(self, arg, var):
+        """Slope `a` if arg = a*var + b, else None."""
+        if arg.has(var) and arg.is_polynomial(var) and sp.degree(arg, var) == 1:
+            return sp.diff(arg, var)
+        return None
+
+    def _table(self, f, var):
+        if f == var:
+            return var**2 / 2, "power rule"
+
+        # Powers of a linear argument: (a*x + b)**n
+        if f.is_Pow and not f.exp.has(var):
+            base, n = f.base, f.exp
+            a = self._linear(base, var)
+            if a is not None:
+                shifted = "" if base == var else " with linear substitution"
+                if n == -1:
+                    return sp.log(base) / a, f"reciprocal rule (∫1/u du = ln|u|){shifted}"
+                return base**(n + 1) / ((n + 1) * a), f"power rule{shifted}"
+
+            # Squared trig in the denominator
+            if n == -2 and isinstance(base, (sp.cos, sp.sin)):
+                a = self._linear(base.args[0], var)
+                if a is not None:
+                    if isinstance(base, sp.cos):
+                        return sp.tan(base.args[0]) / a, "trig table (∫sec²u du = tan u)"
+                    return -sp.cot(base.args[0]) / a, "trig table (∫csc²u du = -cot u)"
+
+            # Power reduction: sin²u = (1 - cos 2u)/2, cos²u = (1 + cos 2u)/2
+            if n == 2 and isinstance(base, (sp.cos, sp.sin)):
+                u = base.args[0]
+                a = self._linear(u, var)
+                if a is not None:
+                    sign = 1 if isinstance(base, sp.cos) else -1
+                    return u / (2 * a) + sign * sp.sin(2 * u) / (4 * a), "power reduction (sin²u, cos²u = (1 ∓ cos 2u)/2)"
+
+            # 1/(1 + x**2) and 1/sqrt(1 - x**2)
+            if base == 1 + var**2 and n == -1:
+                return sp.atan(var), "inverse trig table (∫1/(1+x²) dx = atan x)"
+            if base == 1 - var**2 and n == sp.Rational(-1, 2):
+                return sp.asin(var), "inverse trig table (∫1/√(1-x²) dx = asin x)"
+
+        # Exponentials: exp(a*x + b) and c**(a*x + b)
+        if isinstance(f, sp.exp):
+            a = self._linear(f.args[0], var)
+            if a is not None:
+                return f / a, "exponential rule"
+        if f.is_Pow and not f.base.has(var):
+            a = self._linear(f.exp, var)
+            if a is not None:
+                return f / (a * sp.log(f.base)), "exponential rule (∫c^u du = c^u / ln c)"
+
+        # Trig / log of a linear argument
+        table = {
+            sp.sin: (lambda u: -sp.cos(u), "trig table (∫sin u du = -cos u)"),
+            sp.cos: (lambda u: sp.sin(u), "trig table (∫cos u du = sin u)"),
+            sp.tan: (lambda u: -sp.log(sp.cos(u)), "trig table (∫tan u du = -ln|cos u|)"),
+            sp.sinh: (lambda u: sp.cosh(u), "hyperbolic table"),
+            sp.cosh: (lambda u: sp.sinh(u), "hyperbolic table"),
+            sp.log: (lambda u: u * sp.log(u) - u, "log table (∫ln u du = u ln u - u, by parts)"),
+            sp.atan: (lambda u: u * sp.atan(u) - sp.log(u**2 + 1) / 2, "inverse trig table (by parts)"),
+            sp.asin: (lambda u: u * sp.asin(u) + sp.sqrt(1 - u**2), "inverse trig table (by parts)"),
+        }
+        for func, (antiderivative, rule) in table.items():
+            if isinstance(f, func):
+                a = self._linear(f.args[0], var)
+                if a is not None:
+                    return antiderivative(f.args[0]) / a, rule
+
+        return self._exp_trig(f, var)
+
+    def _exp_trig(self, f, var):
+        """exp(a x) * sin/cos(b x): parts twice brings back the integral, solved in closed form."""
+        factors = sp.Mul.make_args(f)
+        if len(factors) != 2:
+            return None
+        exps = [g for g in factors if isinstance(g, sp.exp)]
+        trig = [g for g in factors if isinstance(g, (sp.sin, sp.cos))]
+        if len(exps) != 1 or len(trig) != 1:
+            return None
+
+        a = self._linear(exps[0].args[0], var)
+        b = self._linear(trig[0].args[0], var)
+        if a is None or b is None:
+            return None
+        s, c = sp.sin(trig[0].args[0]), sp.cos(trig[0].args[0])
+        if isinstance(trig[0], sp.sin):
+            result = exps[0] * (a * s - b * c) / (a**2 + b**2)
+        else:
+            result = exps[0] * (a * c + b * s) / (a**2 + b**2)
+        return result, "integration by parts twice (the integral repeats, solve for it)"
+
+    def _partial_fractions(self, f, var, depth: int):
+        numer, denom = f.as_numer_denom()
+        if not denom.has(var):
+            return None
+
+        pieces = sp.Add.make_args(sp.apart(f, var))
+        if len(pieces) == 1:
+            # Already a single proper fraction: let substitution / table handle it
+            return None
+
+        result = sum((self.integrate_term(p, var, depth + 1)[0] for p in pieces), sp.Integer(0))
+        return result, f"partial fractions: {' + '.join(_show(p) for p in pieces)}"
+
+    def _substitution(self, f, var, depth: int):
+        """u-substitution: f = g(u(x)) * u'(x) * c for an inner function u of f."""
+        # The level below var's own: a substitution inside a substitution in u is named v
+        level = _U.index(var) + 1 if var in _U else 0
+        u = _U[level]
+
+        for inner in self._inner_candidates(f, var):
+            du = sp.diff(inner, var)
+            if du == 0:
+                continue
+
+            in_u = (f / du).subs(inner, u)
+            if in_u.has(var):
+                # Only pay for simplify() when plain cancellation was not enough
+                in_u = sp.simplify(f / du).subs(inner, u)
+                if in_u.has(var):
+                    continue
+
+            result_u, rule = self.integrate_term(in_u, u, depth + 1)
+            if result_u.has(sp.Integral):
+                continue
+            return result_u.subs(u, inner), f"substitution {_NAMES[level]} = {_show(inner)}, then {rule}"
+        return None
+
+    def _inner_candidates(self, f, var) -> list:
+        """Non-trivial inner expressions: function arguments, bases and exponents of powers."""
+        found = []
+        for node in sp.preorder_traversal(f):
+            if isinstance(node, sp.Function):
+                # sin(x) in sin(x)**3*cos(x) as well as x**2 in exp(x**2)
+                found.append(node)
+                found.extend(node.args)
+            elif node.is_Pow:
+                found.extend([node.base, node.exp])
+
+        seen, candidates = set(), []
+        for inner in found:
+            if inner.has(var) and inner != var and inner not in seen:
+                seen.add(inner)
+                candidates.append(inner)
+        # Arguments before whole functions (u = x**2 reads better than u = exp(x**2)),
+        # larger ones first: (x**2 + 1) before x**2
+        return sorted(candidates, key=lambda c: (isinstance(c, sp.Function), -sp.count_ops(c)))
+
+    def _parts(self, f, var, depth: int):
+        """Integration by parts with u chosen by LIATE (log, inverse trig, algebraic, trig, exp)."""
+        factors = sp.Mul.make_args(f)
+        if len(factors) < 2:
+            return None
+
+        def liate(factor):
+            if isinstance(factor, sp.log):
+                return 0
+            if isinstance(factor, (sp.asin, sp.acos, sp.atan)):
+                return 1
+            if factor.is_polynomial(var):
+                return 2
+            if isinstance(factor, (sp.sin, sp.cos)):
+                return 3
+            if isinstance(factor, sp.exp):
+                return 4
+            return None
+
+        ranked = [(liate(fac), fac) for fac in factors]
+        if any(rank is None for rank, _ in ranked):
+            return None
+
+        ranked.sort(key=lambda pair: pair[0])
+        u_part = ranked[0][1]
+        dv = sp.Mul(*[fac for _, fac in ranked[1:]])
+
+        found = self._table(dv, var) or (
+            self._substitution(dv, var, depth + 1) if depth + 1 < self.MAX_DEPTH else None
+        )
+        if found is None:
+            return None
+        v = found[0]
+
+        remainder, _ = self.integrate_term(sp.expand(v * sp.diff(u_part, var)), var, depth + 1)
+        if remainder.has(sp.Integral):
+            return None
+        # Named by role, not as u/dv: var itself may be the substitution variable u
+        return u_part * v - remainder, (
+            f"integration by parts (differentiate {_show(u_part)}, integrate {_show(dv)} d{_show(var)})"
+        )
+
+    # ---------------------------------------------------------
+    # 📏 DEFINITE INTEGRALS
+    # ---------------------------------------------------------
+
+    def _at(self, antiderivative, var, point):
+        # Infinite bounds: lim F(x) as x -> ±oo
+        if point.is_infinite:
+            return sp.limit(antiderivative, var, point)
+        return antiderivative.subs(var, point)
+
+    def _singular_between(self, expr, var, lower, upper) -> bool:
+        if not (lower.is_number and upper.is_number):
+            # Symbolic bounds: nothing to check, F(b) - F(a) is the answer
+            return False
+        try:
+            points = sp.singularities(expr, var)
+        except (NotImplementedError, ValueError, TypeError):
+            return True
+        if not points.is_FiniteSet:
+            return True
+        low, high = sorted([lower, upper], key=lambda p: float(p))
+        return any(p.is_real and low <= p <= high for p in points)
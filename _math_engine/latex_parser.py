@@ -0,0 +1,380 @@
+import re
+
+import sympy as sp
+
+
+class LatexParseError(ValueError):
+    """Raised for LaTeX outside the supported subset; callers fall back to ANTLR."""
+
+
+FUNCTIONS = {
+    "sin": sp.sin, "cos": sp.cos, "tan": sp.tan,
+    "sec": sp.sec, "csc": sp.csc, "cot": sp.cot,
+    "arcsin": sp.asin, "arccos": sp.acos, "arctan": sp.atan,
+    "sinh": sp.sinh, "cosh": sp.cosh, "tanh": sp.tanh,
+    "ln": sp.log, "exp": sp.exp,
+}
+# Longest first so "sinh x" is not read as sin(h*x)
+BARE_FUNCTIONS = sorted(FUNCTIONS, key=len, reverse=True)
+
+GREEK = {
+    "alpha", "beta", "gamma", "delta", "epsilon", "varepsilon", "zeta", "eta", "theta",
+    "vartheta", "iota", "kappa", "lambda", "mu", "nu", "xi", "rho", "sigma", "tau",
+    "upsilon", "phi", "varphi", "chi", "psi", "omega",
+}
+
+# Wrappers pix2tex puts around plain content: \mathrm{x} parses like x
+TRANSPARENT = {"mathrm", "mathit", "mathbf", "operatorname", "boldsymbol"}
+SPACING = {"quad", "qquad", "displaystyle", "left", "right", "big", "Big", "bigl", "bigr"}
+
+OPERATORNAME = re.compile(r"\\operatorname\{([a-zA-Z]+)\}")
+
+TOKEN = re.compile(r"""
+    (?P<space>\s+|\\[,;:!\ ])
+  | (?P<command>\\[a-zA-Z]+)
+  | (?P<number>\d+(?:\.\d+)?|\.\d+)
+  | (?P<letter>[a-zA-Z])
+  | (?P<op>[-+*/^_=(){}\[\]|!])
+""", re.VERBOSE)
+
+
+def tokenize(text: str) -> list:
+    tokens, pos = [], 0
+    # \mathrm{d}x and \, dx both mean the differential d x
+    text = text.replace("\\mathrm{d}", "d").replace("\\mathrm d", "d")
+    # \operatorname{sin} is \sin
+    text = OPERATORNAME.sub(r"\\\1", text)
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if match is None:
+            raise LatexParseError(f"Unexpected character {text[pos]!r} at {pos}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == "space":
+            continue
+        value = match.group()
+        if kind == "command":
+            name = value[1:]
+            if name in SPACING:
+                continue
+            if name in TRANSPARENT:
+                # The braces that follow are parsed as a plain group
+                continue
+            if name in ("cdot", "times"):
+                kind, value = "op", "*"
+            elif name == "div":
+                kind, value = "op", "/"
+        tokens.append((kind, value))
+    return tokens
+
+
+class LatexParser:
+    """
+    Recursive-descent parser for the LaTeX subset pix2tex emits:
+    + - * / \\cdot \\times, implicit multiplication (2x, 2\\sin x, (x+1)(x-1)),
+    ^{} and _{} scripts, \\frac, \\sqrt[n]{}, |x|, elementary functions
+    (\\sin^{2} x, \\log_{2} x, bare "sin x"), \\int with or without bounds,
+    \\frac{d}{dx}, Greek letters, \\pi, \\infty, e and =.
+
+        expr    := term (('+' | '-') term)*
+        term    := unary (('*' | '/' | <implicit>) unary)*
+        unary   := ('-' | '+') unary | power
+        power   := primary ('^' script)? '!'?
+        primary := number | symbol | group | \\frac | \\sqrt | function | \\int | |expr|
+
+    Anything else raises LatexParseError instead of guessing.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.pos = 0
+        self.integral_depth = 0
+        self.abs_depth = 0
+
+    def parse(self):
+        lhs = self.expr()
+        if self.accept("op", "="):
+            rhs = self.expr()
+            result = sp.Eq(lhs, rhs)
+        else:
+            result = lhs
+        if self.pos != len(self.tokens):
+            raise LatexParseError(f"Unexpected {self.peek()[1]!r}")
+        return result
+
+    # ---------------------------------------------------------
+    # 🔤 TOKENS
+    # ---------------------------------------------------------
+
+    def peek(self, offset: int = 0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def accept(self, kind, value=None) -> bool:
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, kind, value=None):
+        token = self.peek()
+        if not self.accept(kind, value):
+            raise LatexParseError(f"Expected {value or kind}, got {token[1]!r}")
+        return token[1]
+
+    # ---------------------------------------------------------
+    # 🌳 GRAMMAR
+    # ---------------------------------------------------------
+
+    def expr(self):
+        result = self.term()
+        while True:
+            if self.accept("op", "+"):
+                result = result + self.term()
+            elif self.accept("op", "-"):
+                result = result - self.term()
+            else:
+                return result
+
+    def term(self):
+        result = self.unary()
+        while True:
+            if self.at_differential():
+                return result
+            if self.accept("op", "*"):
+                result = result * self.unary()
+            elif self.accept("op", "/"):
+                result = result / self.unary()
+            elif self.starts_primary():
+                result = result * self.power()
+            else:
+                return result
+
+    def unary(self):
+        if self.accept("op", "-"):
+            return -self.unary()
+        if self.accept("op", "+"):
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        base = self.primary()
+        if self.accept("op", "^"):
+            base = base ** self.script()
+        if self.accept("op", "!"):
+            base = sp.factorial(base)
+        return base
+
+    def script(self):
+        """Argument of ^ or _: a braced group, or a single character (x^2y is x**2*y)."""
+        if self.peek() == ("op", "{"):
+            return self.group()
+        kind, value = self.peek()
+        if kind == "number":
+            self.pos += 1
+            if len(value) > 1:
+                # x^23 is x^2 * 3 in LaTeX: put the rest back as its own token
+                self.tokens.insert(self.pos, ("number", value[1:]))
+                value = value[0]
+            return sp.Integer(value)
+        if kind == "letter":
+            self.pos += 1
+            return self.symbol(value)
+        if kind == "command":
+            return self.primary()
+        raise LatexParseError(f"Bad script {value!r}")
+
+    def group(self, open_="{", close="}"):
+        self.expect("op", open_)
+        result = self.expr()
+        self.expect("op", close)
+        return result
+
+    def starts_primary(self) -> bool:
+        kind, value = self.peek()
+        if kind in ("number", "letter"):
+            return True
+        if kind == "command":
+            return value != "\\int" or self.integral_depth == 0
+        if kind == "op":
+            return value in ("(", "{", "[") or (value == "|" and self.abs_depth == 0)
+        return False
+
+    def at_differential(self) -> bool:
+        """Inside \\int: 'd' followed by a letter ends the integrand."""
+        return (
+            self.integral_depth > 0
+            and self.peek() == ("letter", "d")
+            and self.peek(1)[0] == "letter"
+        )
+
+    def primary(self):
+        kind, value = self.peek()
+        if kind is None:
+            raise LatexParseError("Unexpected end of input")
+
+        if kind == "number":
+            self.pos += 1
+            return sp.Rational(value) if "." not in value else sp.Float(value)
+
+        if kind == "letter":
+            return self.letters()
+
+        if kind == "op":
+            if value == "(":
+                return self.group("(", ")")
+            if value == "[":
+                return self.group("[", "]")
+            if value == "{":
+                return self.group()
+            if value == "|":
+                self.pos += 1
+                self.abs_depth += 1
+                inner = self.expr()
+                self.abs_depth -= 1
+                self.expect("op", "|")
+                return sp.Abs(inner)
+            raise LatexParseError(f"Unexpected {value!r}")
+
+        self.pos += 1
+        name = value[1:]
+        if name in ("frac", "dfrac", "tfrac"):
+            return self.fraction()
+        if name == "sqrt":
+            index = self.group("[", "]") if self.peek() == ("op", "[") else 2
+            return sp.root(self.group(), index) if index != 2 else sp.sqrt(self.group())
+        if name == "int":
+            return self.integral()
+        if name == "log":
+            return self.function(sp.log, log_base=True)
+        if name in FUNCTIONS:
+            return self.function(FUNCTIONS[name])
+        if name == "pi":
+            return sp.pi
+        if name == "infty":
+            return sp.oo
+        if name in GREEK:
+            return self.symbol(name)
+        raise LatexParseError(f"Unsupported command {value}")
+
+    def letters(self):
+        """A run of letters: bare function names (OCR drops the backslash), else one symbol per letter."""
+        run = ""
+        while self.peek(len(run))[0] == "letter":
+            run += self.peek(len(run))[1]
+        if run.startswith("log"):
+            self.pos += 3
+            return self.function(sp.log, log_base=True)
+        for name in BARE_FUNCTIONS:
+            if run.startswith(name):
+                self.pos += len(name)
+                return self.function(FUNCTIONS[name])
+
+        self.pos += 1
+        return self.symbol(run[0])
+
+    def symbol(self, name: str):
+        if self.accept("op", "_"):
+            sub = self.script()
+            name = f"{name}_{sub}"
+        if name == "e":
+            return sp.E
+        return sp.Symbol(name)
+
+    def function(self, func, log_base: bool = False):
+        base = None
+        if log_base and self.accept("op", "_"):
+            base = self.script()
+        exponent = self.script() if self.accept("op", "^") else None
+
+        if self.peek()[1] in ("(", "{", "["):
+            argument = self.primary()
+        else:
+            # \sin 2x: the argument runs over an implicit product, not past + - or another function
+            argument = self.power()
+            while True:
+                # clean_latex has already turned 3x into 3*x
+                explicit = self.peek() == ("op", "*") and self.peek(1)[0] in ("number", "letter")
+                if explicit:
+                    self.pos += 1
+                elif not self.starts_primary() or self.peek()[0] == "command" or self.at_differential():
+                    break
+                if self.peek()[0] == "letter" and self._function_name_ahead():
+                    if explicit:
+                        self.pos -= 1
+                    break
+                argument = argument * self.power()
+
+        result = sp.log(argument, base) if base is not None else func(argument)
+        # \sin^{-1} x is the inverse function, not 1/sin x
+        if exponent == -1 and func in (sp.sin, sp.cos, sp.tan):
+            return {sp.sin: sp.asin, sp.cos: sp.acos, sp.tan: sp.atan}[func](argument)
+        return result ** exponent if exponent is not None else result
+
+    def _function_name_ahead(self) -> bool:
+        run = ""
+        while self.peek(len(run))[0] == "letter" and len(run) < 6:
+            run += self.peek(len(run))[1]
+        return run.startswith("log") or any(run.startswith(name) for name in BARE_FUNCTIONS)
+
+    def fraction(self):
+        # \frac{d}{dx} f: derivative operator
+        if self.tokens[self.pos:self.pos + 3] == [("op", "{"), ("letter", "d"), ("op", "}")] and \
+                self.tokens[self.pos + 3:self.pos + 5] == [("op", "{"), ("letter", "d")] and \
+                self.peek(5)[0] == "letter" and self.peek(6) == ("op", "}"):
+            var = sp.Symbol(self.peek(5)[1])
+            self.pos += 7
+            return sp.Derivative(self.unary(), var)
+
+        # Any other d.../d... is Leibniz notation (dy/dx, d^2y/dx^2): not in the subset
+        if self.peek(1) == ("letter", "d"):
+            after = self._closing(self.pos) + 1
+            if self.tokens[after:after + 2] == [("op", "{"), ("letter", "d")]:
+                raise LatexParseError("Leibniz derivative notation")
+
+        numerator = self.group()
+        denominator = self.group()
+        return numerator / denominator
+
+    def _closing(self, start: int) -> int:
+        """Index of the brace closing the group that opens at `start`."""
+        depth = 0
+        for index in range(start, len(self.tokens)):
+            token = self.tokens[index]
+            if token == ("op", "{"):
+                depth += 1
+            elif token == ("op", "}"):
+                depth -= 1
+                if depth == 0:
+                    return index
+        raise LatexParseError("Unbalanced braces")
+
+    def integral(self):
+        lower = upper = None
+        for _ in range(2):
+            if self.accept("op", "_"):
+                lower = self.script()
+            elif self.accept("op", "^"):
+                upper = self.script()
+
+        self.integral_depth += 1
+        try:
+            integrand = self.expr()
+        finally:
+            self.integral_depth -= 1
+
+        if not self.accept("letter", "d"):
+            raise LatexParseError("Integral without a differential")
+        var = sp.Symbol(self.expect("letter"))
+
+        if lower is None and upper is None:
+            return sp.Integral(integrand, var)
+        if lower is None or upper is None:
+            raise LatexParseError("Integral with only one bound")
+        return sp.Integral(integrand, (var, lower, upper))
+
+
+def parse_latex_fast(text: str):
+    """SymPy expression (or Eq) for `text`; LatexParseError outside the supported subset."""
+    return LatexParser(text).parse()
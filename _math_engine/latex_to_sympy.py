@@ -1,8 +1,25 @@
-from sympy.parsing.latex import parse_latex
+from collections import OrderedDict
 from sympy import sympify, Eq
 import re
+import threading
+
+from _app.config import LATEX_MEMO_SIZE
+from .latex_parser import LatexParseError, parse_latex_fast
+
 
 class LatexToSympyConverter:
+    """
+    LaTeX -> SymPy in three tiers: the hand-written parser in latex_parser
+    (covers what pix2tex emits), then SymPy's ANTLR-based parse_latex, then
+    sympify. ANTLR is imported only the first time the fast path gives up.
+    Results are memoized on the cleaned string: OCR of the same worksheet
+    yields the same LaTeX again and again.
+    """
+
+    _memo = OrderedDict()
+    _lock = threading.Lock()
+    stats = {"hits": 0, "fast": 0, "antlr": 0, "sympify": 0}
+
     @staticmethod
     def clean_latex(latex: str) -> str:
         if not latex: return ""
@@ -13,25 +30,64 @@ class LatexToSympyConverter:
         latex = re.sub(r"(\d)([a-zA-Z])", r"\1*\2", latex)
         return latex.strip()
 
+    @staticmethod
+    def _antlr_parse(text: str):
+        # Importing sympy.parsing.latex (and the ANTLR runtime) costs ~0.5 s: only pay it when needed
+        from sympy.parsing.latex import parse_latex
+        return parse_latex(text)
+
     @staticmethod
     def _safe_parse(text: str):
         """Try LaTeX parser, failover to SymPy string parser"""
         try:
             # parse_latex is strict. If it fails...
-            return parse_latex(text)
+            result = LatexToSympyConverter._antlr_parse(text)
+            LatexToSympyConverter.stats["antlr"] += 1
+            return result
         except Exception:
             # ...sympify is flexible (handles '2*x+5' well)
+            LatexToSympyConverter.stats["sympify"] += 1
             return sympify(text)
 
     @staticmethod
-    def to_sympy(latex: str):
-        cleaned = LatexToSympyConverter.clean_latex(latex)
-        
+    def _parse(cleaned: str):
+        try:
+            result = parse_latex_fast(cleaned)
+            LatexToSympyConverter.stats["fast"] += 1
+            return result
+        except (LatexParseError, ZeroDivisionError, TypeError):
+            pass
+
         # ✅ THE CRITICAL CHECK
         if "=" in cleaned:
             parts = cleaned.split("=", 1)
             lhs = LatexToSympyConverter._safe_parse(parts[0].strip())
             rhs = LatexToSympyConverter._safe_parse(parts[1].strip())
             return Eq(lhs, rhs)
-            
-        return LatexToSympyConverter._safe_parse(cleaned)
\ No newline at end of file
+
+        return LatexToSympyConverter._safe_parse(cleaned)
+
+    @staticmethod
+    def to_sympy(latex: str):
+        cls = LatexToSympyConverter
+        cleaned = cls.clean_latex(latex)
+
+        with cls._lock:
+            if cleaned in cls._memo:
+                cls._memo.move_to_end(cleaned)
+                cls.stats["hits"] += 1
+                return cls._memo[cleaned]
+
+        # SymPy objects are immutable, so sharing the cached result is safe
+        result = cls._parse(cleaned)
+
+        with cls._lock:
+            cls._memo[cleaned] = result
+            while len(cls._memo) > LATEX_MEMO_SIZE:
+                cls._memo.popitem(last=False)
+        return result
+
+    @staticmethod
+    def clear_memo():
+        with LatexToSympyConverter._lock:
+            LatexToSympyConverter._memo.clear()
@@ -0,0 +1,142 @@
+import numpy as np
+import mpmath
+import sympy as sp
+
+
+class PolynomialEngine:
+    """
+    Roots of polynomial equations of degree >= 3, with steps.
+
+    The polynomial is factored over the rationals first (rational roots fall
+    out as linear factors). Each factor is then solved by the cheapest exact
+    method: root formula for degree 1-2, Cardano/Ferrari closed forms for
+    degree 3-4 as long as the result stays readable. Anything else (degree 5+,
+    oversized radicals, real roots only expressible through complex radicals)
+    gets numeric roots: NumPy's companion-matrix eigenvalues up to float
+    precision, mpmath.polyroots beyond that.
+    """
+
+    def __init__(self, digits: int = 15, max_exact_ops: int = 30):
+        self.digits = digits
+        self.max_exact_ops = max_exact_ops
+
+    def solve(self, poly: sp.Poly) -> tuple[list, list[str]]:
+        """
+        Returns (distinct roots, step texts without numbering).
+        Factors over the rationals are irreducible, so no root repeats across them.
+        """
+        var = poly.gen
+        steps = []
+
+        if poly.domain.is_Exact:
+            constant, factors = poly.factor_list()
+        else:
+            # Float coefficients: factoring is meaningless, go straight to numeric roots
+            constant, factors = 1, [(poly, 1)]
+
+        # ---- Factor / rational roots ----
+        linear = [f for f, _ in factors if f.degree() == 1]
+        if len(factors) > 1 or any(m > 1 for _, m in factors):
+            factored = sp.Mul(constant, *[f.as_expr() ** m for f, m in factors])
+            steps.append(f"Factor over the rationals: {sp.sstr(factored)} = 0")
+        elif not linear and poly.domain.is_Exact:
+            steps.append(
+                f"Rational root test: no candidate ±p/q "
+                f"(p | {sp.sstr(poly.TC())}, q | {sp.sstr(poly.LC())}) is a root, so it does not factor"
+            )
+
+        roots = []
+        for factor, _ in factors:
+            found, text = self._solve_factor(factor, var)
+            roots.extend(found)
+            steps.append(text)
+
+        return self._ordered(roots), steps
+
+    # ---------------------------------------------------------
+    # 🧩 PER FACTOR
+    # ---------------------------------------------------------
+
+    def _solve_factor(self, factor: sp.Poly, var) -> tuple[list, str]:
+        expr = sp.sstr(factor.as_expr())
+        degree = factor.degree()
+
+        if degree == 1:
+            c1, c0 = factor.all_coeffs()
+            root = -c0 / c1
+            return [root], f"Solve {expr} = 0: {var} = {sp.sstr(root)}"
+
+        if degree == 2:
+            a, b, c = factor.all_coeffs()
+            D = b**2 - 4*a*c
+            roots = [(-b + sp.sqrt(D)) / (2 * a), (-b - sp.sqrt(D)) / (2 * a)]
+            return roots, (
+                f"Quadratic formula on {expr} = 0 (D = {sp.sstr(D)}): "
+                f"{var} = {', '.join(sp.sstr(r) for r in roots)}"
+            )
+
+        if degree <= 4 and factor.domain.is_Exact:
+            exact = self._closed_form(factor)
+            if exact is not None:
+                method = "Cardano's formula" if degree == 3 else "Ferrari's method"
+                return exact, f"Apply {method} to {expr} = 0: {var} = {', '.join(sp.sstr(r) for r in exact)}"
+
+        roots = self._ordered(self.numeric_roots(factor))
+        return roots, (
+            f"{expr} = 0 has no compact closed form: approximate its roots numerically "
+            f"({self.digits} significant digits): {var} ≈ {', '.join(sp.sstr(r) for r in roots)}"
+        )
+
+    def _closed_form(self, factor: sp.Poly):
+        """Cardano/Ferrari roots, or None if they are too big to be useful."""
+        roots = list(sp.roots(factor, cubics=True, quartics=True, multiple=False))
+        if len(roots) != factor.degree():
+            return None
+
+        for root in roots:
+            if sp.count_ops(root) > self.max_exact_ops:
+                return None
+            # Casus irreducibilis: a real root written with complex cube roots helps nobody
+            if root.has(sp.I) and abs(sp.im(root.evalf(15))) < 1e-12:
+                return None
+        return roots
+
+    # ---------------------------------------------------------
+    # 🔢 NUMERIC
+    # ---------------------------------------------------------
+
+    def numeric_roots(self, poly: sp.Poly) -> list:
+        """All complex roots of a numeric-coefficient Poly as SymPy Floats."""
+        if self.digits <= 15:
+            coeffs = np.array([complex(c) for c in poly.all_coeffs()])
+            found = np.roots(coeffs)
+            # One vectorized Newton step polishes every root at once
+            derivative = np.polyder(coeffs)
+            slope = np.polyval(derivative, found)
+            safe = np.abs(slope) > 1e-14
+            found[safe] -= np.polyval(coeffs, found[safe]) / slope[safe]
+            values = [complex(r) for r in found]
+        else:
+            with mpmath.workdps(self.digits + 5):
+                coeffs = [mpmath.mpmathify(sp.N(c, self.digits + 5)) for c in poly.all_coeffs()]
+                values = mpmath.polyroots(coeffs, maxsteps=200, extraprec=4 * self.digits)
+                # Convert inside the context: mpmath prints at the working precision
+                return [self._to_sympy(v) for v in values]
+
+        return [self._to_sympy(v) for v in values]
+
+    def _to_sympy(self, value):
+        re_part = sp.Float(str(mpmath.re(value)), self.digits)
+        im_part = sp.Float(str(mpmath.im(value)), self.digits)
+        # Imaginary parts below the working precision are rounding noise
+        scale = max(abs(complex(value)), 1.0)
+        if abs(im_part) < scale * 10 ** (1 - self.digits):
+            return re_part
+        return re_part + im_part * sp.I
+
+    def _ordered(self, roots: list) -> list:
+        """Real roots ascending, then complex ones by (re, im)."""
+        def key(root):
+            value = complex(root.evalf(15))
+            return (abs(value.imag) > 1e-12, value.real, value.imag)
+        return sorted(roots, key=key)
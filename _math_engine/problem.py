@@ -0,0 +1,107 @@
+from functools import cached_property
+
+import sympy as sp
+
+
+class ParsedProblem:
+    """
+    A problem parsed into SymPy exactly once.
+    Derived forms (standard form, Poly, coefficients, factorization) are
+    computed on first use and shared by step generation and the final answer.
+
+    Systems keep their unknowns as a tuple in `var` and either the standard
+    forms as a Tuple in `expr` or, for matrix input, sparse coefficient rows
+    in `lhs` and the right-hand side in `rhs`.
+
+    Read-only: MathSolver memoizes parses, so one instance is shared by
+    concurrent requests. Answers travel separately (solver → verifier).
+    """
+
+    def __init__(self, kind: str, var: sp.Symbol, expr=None, lhs=None, rhs=None, limits=None):
+        # limits: (lower, upper) for a definite integral
+        self.__dict__.update(kind=kind, var=var, expr=expr, lhs=lhs, rhs=rhs, limits=limits)
+
+    def __setattr__(self, name, value):
+        # cached_property writes to __dict__ directly, so derived forms still fill in
+        raise AttributeError(f"ParsedProblem is shared between requests and read-only (tried to set '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"ParsedProblem is shared between requests and read-only (tried to delete '{name}')")
+
+    @property
+    def key(self) -> str:
+        """Canonical form used as the result-cache key."""
+        if self.kind == "system":
+            if self.expr is None:
+                return f"{self.kind}|{self.var}|{self.lhs}|{self.rhs}"
+            return f"{self.kind}|{sp.srepr(self.expr)}"
+        if self.kind == "equation":
+            return f"{self.kind}|{sp.srepr(self.lhs)}|{sp.srepr(self.rhs)}"
+        if self.limits is not None:
+            return f"{self.kind}|{sp.srepr(self.expr)}|{self.var}|{sp.srepr(sp.Tuple(*self.limits))}"
+        return f"{self.kind}|{sp.srepr(self.expr)}|{self.var}"
+
+    # ---------------------------------------------------------
+    # ➕ EQUATION ARTEFACTS
+    # ---------------------------------------------------------
+
+    @cached_property
+    def std_form(self):
+        # expand() is enough for the polynomial cases and far cheaper than simplify()
+        return sp.expand(self.lhs - self.rhs)
+
+    @cached_property
+    def poly(self):
+        """Poly of the standard form in `var`, or None if it is not a polynomial."""
+        if not self.std_form.is_polynomial(self.var):
+            return None
+        return sp.Poly(self.std_form, self.var)
+
+    @cached_property
+    def degree(self):
+        return self.poly.degree() if self.poly is not None else None
+
+    @cached_property
+    def coeffs(self) -> list:
+        """Dense coefficients, highest power first (a, b, c for a quadratic)."""
+        return self.poly.all_coeffs()
+
+    @cached_property
+    def factor_list(self) -> tuple:
+        """(constant, [(factor Poly, multiplicity), ...]) over the coefficient domain."""
+        return self.poly.factor_list()
+
+    @cached_property
+    def factored(self):
+        # Rebuilt from factor_list instead of a second sp.factor() pass
+        constant, factors = self.factor_list
+        return sp.Mul(constant, *[f.as_expr() ** m for f, m in factors])
+
+    # ---------------------------------------------------------
+    # 🧮 SYSTEM ARTEFACTS
+    # ---------------------------------------------------------
+
+    @cached_property
+    def linear_system(self):
+        """(rows as {column: coefficient}, right-hand side), or None if any equation is nonlinear."""
+        if self.expr is None:
+            return self.lhs, self.rhs
+
+        column = {u: j for j, u in enumerate(self.var)}
+        rows, rhs = [], []
+        for equation in self.expr:
+            row, constant = {}, sp.Integer(0)
+            for term, coeff in sp.expand(equation).as_coefficients_dict().items():
+                unknowns = term.free_symbols & column.keys()
+                if not unknowns:
+                    # Numbers and parameters (a in a*x + y = 1)
+                    constant += coeff * term
+                    continue
+                u = unknowns.pop()
+                factor = term / u
+                if unknowns or factor.free_symbols & column.keys():
+                    return None
+                row[column[u]] = row.get(column[u], 0) + coeff * factor
+            rows.append(row)
+            rhs.append(-constant)
+        return rows, rhs
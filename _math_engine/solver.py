@@ -1,83 +1,253 @@
+import json
 import sympy as sp
-from sympy import Eq, simplify
 import re
+import threading
+from collections import OrderedDict
+
+from .differentiation import DifferentiationEngine
+from .integration import IntegrationEngine
+from .polynomial import PolynomialEngine
+from .problem import ParsedProblem
+from .systems import SystemEngine
+from .verifier import AnswerVerifier
+from _app import config
 
 
 class MathSolver:
+    # Recent parses kept: the pipeline asks for canonical_key, then solve, on the same input
+    PARSE_MEMO_SIZE = 64
+
     def __init__(self):
-        pass
+        self._parsed = OrderedDict()
+        self._parsed_lock = threading.Lock()
+        self.polynomial = PolynomialEngine(
+            digits=config.POLY_NUMERIC_DIGITS,
+            max_exact_ops=config.POLY_MAX_EXACT_OPS
+        )
+        self.integration = IntegrationEngine(memo_size=config.INTEGRAL_MEMO_SIZE)
+        self.differentiation = DifferentiationEngine()
+        self.systems = SystemEngine(
+            exact_max_unknowns=config.SYSTEM_EXACT_MAX_UNKNOWNS,
+            nonlinear_max_unknowns=config.SYSTEM_NONLINEAR_MAX_UNKNOWNS,
+            sparse_min_unknowns=config.SYSTEM_SPARSE_MIN_UNKNOWNS
+        )
+        self.verifier = AnswerVerifier(samples=config.VERIFY_SAMPLES, tolerance=config.VERIFY_TOLERANCE)
 
     def solve(self, user_input: str) -> dict:
         """Classify automatically based on keywords & solve."""
         cleaned = user_input.replace(" ", "").replace("^", "**")
 
+        kind = self._classify(cleaned)
+        if kind is None:
+            return {"error": "Unknown command", "message": "Try: differentiate(x^2) or x^2+5=0"}
+
         try:
-            # 1. Differentiation detection
-            # Matches: diff, differentiate, d/dx, derivative
-            if re.match(r"^(d/dx|diff|differentiate|derivative)\s*\(.*\)$", cleaned, re.IGNORECASE):
-                return self._solve_differentiation(cleaned)
-
-            # 2. Integration detection
-            # Matches: ∫, integrate, integral
-            int_keywords = ["∫", "integrate", "integral"]
-            if any(k in cleaned.lower() for k in int_keywords):
-                return self._solve_integration(self._extract_integrand(cleaned))
-            
-            # 3. Equation detection (if "=" is present)
-            if "=" in cleaned:
-                return self._solve_equation(cleaned)
+            problem = self.parse(user_input)
+        except Exception:
+            if kind == "differentiation":
+                return {
+                    "error": f"SymPy could not parse expression: {user_input}",
+                    "message": "Ensure your parentheses match."
+                }
+            return self._not_understood(user_input)
+
+        # The parsed problem is shared with other requests: solvers return the raw answer instead of storing it
+        try:
+            if kind == "differentiation":
+                result, answer = self._solve_differentiation(problem)
+            elif kind == "integration":
+                result, answer = self._solve_integration(problem)
+            elif kind == "system":
+                result, answer = self._solve_system(problem)
+            else:
+                result, answer = self._solve_equation(problem)
 
         except Exception:
-            return {
-                "error": f"I couldn't understand the input: {user_input}",
-                "message": "Try rewriting using normal math syntax.",
-                "hint": "Example: differentiate(x^2) or integrate(x+2)"
-            }
-        
-        return {"error": "Unknown command", "message": "Try: differentiate(x^2) or x^2+5=0"}
+            return self._not_understood(user_input)
+
+        if config.VERIFY_ANSWERS and "error" not in result:
+            verification = self.verifier.verify(problem, answer)
+            if verification["verdict"] == "failed":
+                result, verification = self._recheck(problem, result, verification)
+            result["verification"] = verification
+        return result
+
+    def _recheck(self, problem: ParsedProblem, result: dict, verification: dict) -> tuple:
+        """
+        A known-wrong answer is never shown as final: re-solve once with plain
+        SymPy and keep that answer if it verifies, otherwise flag the original.
+        """
+        try:
+            retry, answer = self._solve_plain(problem)
+        except Exception:
+            retry = None
+
+        if retry is not None and "error" not in retry:
+            second = self.verifier.verify(problem, answer)
+            if second["verdict"] == "verified":
+                second["resolved"] = True
+                return retry, second
+
+        result["unverified"] = True
+        result["warning"] = (
+            "This answer failed an automatic check (plugging it back in did not satisfy the problem). "
+            "Please double-check it."
+        )
+        return result, verification
+
+    def _solve_plain(self, problem: ParsedProblem) -> tuple:
+        """(response, answer) straight from SymPy, skipping the rule engines; (None, None) for systems."""
+        if problem.kind == "equation":
+            return self._solve_equation_generic(problem, [f"1. Rewrite in standard form: {sp.sstr(problem.std_form)} = 0"])
+
+        if problem.kind == "differentiation":
+            final = sp.diff(problem.expr, problem.var)
+            steps = [f"1. Differentiate with SymPy: d/d{problem.var} [{sp.sstr(problem.expr)}] = {sp.sstr(final)}"]
+            return self._differentiation_response(final, steps), final
+
+        if problem.kind == "integration":
+            target = problem.var if problem.limits is None else (problem.var, *problem.limits)
+            result = sp.integrate(problem.expr, target)
+            steps = [f"1. Integrate with SymPy: ∫{sp.sstr(problem.expr)} d{problem.var} = {sp.sstr(result)}"]
+            return self._integration_response(problem, result, steps), result
+
+        return None, None
+
+    def _not_understood(self, user_input: str) -> dict:
+        return {
+            "error": f"I couldn't understand the input: {user_input}",
+            "message": "Try rewriting using normal math syntax.",
+            "hint": "Example: differentiate(x^2) or integrate(x+2)"
+        }
+
+    def _classify(self, cleaned: str):
+        # 1. Differentiation detection
+        # Matches: diff, differentiate, d/dx, derivative
+        if re.match(r"^(d/dx|diff|differentiate|derivative)\s*\(.*\)$", cleaned, re.IGNORECASE):
+            return "differentiation"
+
+        # 2. Integration detection
+        # Matches: ∫, integrate, integral
+        int_keywords = ["∫", "integrate", "integral"]
+        if any(k in cleaned.lower() for k in int_keywords):
+            return "integration"
+
+        # 3. Systems: equations separated by ; , or newlines, or [[A]]=[b]
+        if cleaned.startswith("[[") and "=" in cleaned:
+            return "system"
+        if len(self._split_system(cleaned)) > 1:
+            return "system"
+
+        # 4. Equation detection (if "=" is present)
+        if "=" in cleaned:
+            return "equation"
+
+        return None
+
     # --------------------------------------------------------------------
-    # ➕ EQUATIONS (Linear & Quadratic)
+    # 🧩 Parse once
     # --------------------------------------------------------------------
-    def _solve_equation(self, eq_str: str) -> dict:
-        left, right = eq_str.split("=", 1)
-        left = sp.sympify(left)
-        right = sp.sympify(right)
+    def parse(self, user_input: str) -> ParsedProblem:
+        """
+        Parse the input into SymPy once. Raises ValueError for unknown input.
+        Repeated calls with the same text return the same ParsedProblem,
+        so its derived forms are computed only once as well.
+        """
+        with self._parsed_lock:
+            problem = self._parsed.get(user_input)
+            if problem is not None:
+                self._parsed.move_to_end(user_input)
+                return problem
+
+        problem = self._parse(user_input)
+
+        with self._parsed_lock:
+            self._parsed[user_input] = problem
+            while len(self._parsed) > self.PARSE_MEMO_SIZE:
+                self._parsed.popitem(last=False)
+        return problem
+
+    def clear_cache(self):
+        with self._parsed_lock:
+            self._parsed.clear()
+        self.integration.clear()
+
+    def _parse(self, user_input: str) -> ParsedProblem:
+        cleaned = user_input.replace(" ", "").replace("^", "**")
+        kind = self._classify(cleaned)
+
+        if kind == "differentiation":
+            parsed = self._parse_differentiation(cleaned)
+            if parsed is None:
+                raise ValueError("Could not parse differentiation input.")
+            expr_str, var = parsed
+            return ParsedProblem(kind, var, expr=sp.sympify(expr_str))
 
-        eq = Eq(left, right)
-        var = list(eq.free_symbols)[0] if eq.free_symbols else sp.Symbol("x")
+        if kind == "integration":
+            return self._parse_integral(cleaned)
 
-        # Rewrite to standard form (move everything to LHS)
-        std_form = simplify(left - right)
+        if kind == "system":
+            return self._parse_system(cleaned)
+
+        if kind == "equation":
+            left, right = cleaned.split("=", 1)
+            lhs, rhs = sp.sympify(left), sp.sympify(right)
+            var = self._pick_variable(lhs.free_symbols | rhs.free_symbols)
+            return ParsedProblem(kind, var, lhs=lhs, rhs=rhs)
+
+        raise ValueError(f"Unknown command: {user_input}")
+
+    # --------------------------------------------------------------------
+    # 🔑 Canonical cache key
+    # --------------------------------------------------------------------
+    def canonical_key(self, user_input: str):
+        """
+        Canonical SymPy form of the problem, used as a result-cache key.
+        Inputs that only differ in spacing, term order or command spelling
+        (diff vs d/dx) map to the same key. Returns None if unparseable.
+        """
+        try:
+            return self.parse(user_input).key
+        except Exception:
+            return None
+
+    # --------------------------------------------------------------------
+    # ➕ EQUATIONS (Linear & Quadratic)
+    # --------------------------------------------------------------------
+    def _solve_equation(self, problem: ParsedProblem) -> dict:
+        var = problem.var
+        std_form = problem.std_form
 
         steps = [
             f"1. Rewrite in standard form: {sp.sstr(std_form)} = 0"
         ]
 
-        deg = sp.degree(std_form, var)
+        deg = problem.degree
 
         if deg == 1:
-            # Linear equation
-            solution = sp.solve(eq, var)
+            # Linear equation: a*x + b = 0
+            a, b = problem.coeffs
             steps.append("2. Solve by isolating the variable")
-            return self._format_response(solution, steps, "equation")
+            solution = [-b / a]
+            return self._format_response(solution, steps, "equation"), solution
 
         elif deg == 2:
             # Quadratic: Try factorization
-            factored = sp.factor(std_form)
+            _, factors = problem.factor_list
 
-            if factored != std_form:
+            if all(f.degree() == 1 for f, _ in factors):
                 steps.append(
-                    f"2. Factor the quadratic: {sp.sstr(factored)} = 0"
+                    f"2. Factor the quadratic: {sp.sstr(problem.factored)} = 0"
                 )
-                roots = sp.solve(eq, var)
+                # Each linear factor c1*x + c0 gives the root -c0/c1
+                roots = {-f.all_coeffs()[1] / f.all_coeffs()[0] for f, _ in factors}
                 steps.append("3. Set each factor = 0 and solve")
-                return self._format_response(roots, steps, "equation")
+                solution = self._ordered(roots)
+                return self._format_response(solution, steps, "equation"), solution
 
             # Fallback to quadratic formula
             steps.append("2. Use Quadratic Formula")
-            a = std_form.as_coefficients_dict()[var**2]
-            b = std_form.as_coefficients_dict()[var]
-            c = std_form.as_coefficients_dict().get(1, 0)
+            a, b, c = problem.coeffs
 
             D = b**2 - 4*a*c
             steps.append(f"3. Compute discriminant: D = {sp.sstr(D)}")
@@ -85,16 +255,33 @@ class MathSolver:
             x1 = (-b + sp.sqrt(D)) / (2 * a)
             x2 = (-b - sp.sqrt(D)) / (2 * a)
 
-            solution = [sp.simplify(x1), sp.simplify(x2)]
+            # radsimp (rationalize denominators) instead of sp.simplify: ~0.3ms instead of 10-200ms
+            solution = [sp.radsimp(x1), sp.radsimp(x2)]
             steps.append("4. Apply quadratic formula and simplify")
 
-            return self._format_response(solution, steps, "equation")
+            return self._format_response(solution, steps, "equation"), solution
+
+        elif deg is not None and deg >= 3 and problem.poly.domain.is_Numerical:
+            # Higher degree: factor, closed forms up to quartics, numeric roots beyond
+            solution, texts = self.polynomial.solve(problem.poly)
+            steps.extend(f"{n}. {text}" for n, text in enumerate(texts, start=2))
+            return self._format_response(solution, steps, "equation"), solution
 
         else:
-            # fallback generic solver
-            solution = sp.solve(eq, var)
-            steps.append("2. Solve equation using symbolic solver")
-            return self._format_response(solution, steps, "equation")
+            # fallback generic solver (symbolic coefficients or not a polynomial)
+            return self._solve_equation_generic(problem, steps)
+
+    def _solve_equation_generic(self, problem: ParsedProblem, steps: list) -> tuple:
+        solution = sp.solve(problem.std_form, problem.var)
+        steps.append(f"{len(steps) + 1}. Solve equation using symbolic solver")
+        return self._format_response(solution, steps, "equation"), solution
+
+    def _ordered(self, roots) -> list:
+        try:
+            return sorted(roots)
+        except TypeError:
+            # Symbolic roots have no numeric order
+            return sorted(roots, key=sp.default_sort_key)
 
     # --------------------------------------------------------------------
     # 🔁 Shared Formatting
@@ -142,10 +329,194 @@ class MathSolver:
             "display": full_output   # Use this for printing to the user
         }
     # ------------------------------------------------------------
+    # Systems of equations
+    # ------------------------------------------------------------
+    def _split_system(self, cleaned: str) -> list:
+        """Equations of a system, or [] unless every separated part is an equation."""
+        parts = [p for p in re.split(r"[;,\n]", cleaned) if p.strip()]
+        if all(p.count("=") == 1 for p in parts):
+            return parts
+        return []
+
+    def _parse_system(self, cleaned: str) -> ParsedProblem:
+        if cleaned.startswith("[["):
+            # Matrix form A = b, unknowns x1..xn. JSON keeps large numeric input fast
+            left, right = cleaned.split("=", 1)
+            A, b = self._literal(left), self._literal(right)
+            n = len(A[0])
+            if len(A) != len(b) or any(len(row) != n for row in A):
+                raise ValueError("Matrix and right-hand side sizes do not match")
+            unknowns = tuple(sp.Symbol(f"x{j}") for j in range(1, n + 1))
+            rows = [{j: self._number(v) for j, v in enumerate(row) if v != 0} for row in A]
+            return ParsedProblem("system", unknowns, lhs=rows, rhs=[self._number(v) for v in b])
+
+        parts = self._split_system(cleaned)
+        fast = self._linear_rows(parts)
+        if fast is not None:
+            return fast
+
+        exprs = []
+        for part in parts:
+            left, right = part.split("=")
+            exprs.append(sp.sympify(left) - sp.sympify(right))
+
+        symbols = set().union(*(e.free_symbols for e in exprs))
+        return ParsedProblem("system", self._pick_unknowns(symbols, len(exprs)), expr=sp.Tuple(*exprs))
+
+    # Plain linear terms: 3*x1, -x2, 0.5*y, 7/2, 4
+    LINEAR_TERM = re.compile(r"([+-]?)(?:(\d+(?:\.\d+)?(?:/\d+)?)(?:\*([A-Za-z_]\w*))?|([A-Za-z_]\w*))")
+
+    def _linear_rows(self, parts: list):
+        """
+        Sparse rows straight from the text when every equation is a sum of
+        number*name terms. sympify costs milliseconds per equation, which adds
+        up to seconds for the several-hundred-equation systems; anything
+        fancier (products, powers, functions, constants like pi) returns None.
+        """
+        equations = []
+        for part in parts:
+            sides = []
+            for side in part.split("="):
+                terms, pos = [], 0
+                while pos < len(side):
+                    match = self.LINEAR_TERM.match(side, pos)
+                    if match is None or (pos > 0 and not match.group(1)):
+                        return None
+                    sign, number, scaled, name = match.groups()
+                    name = scaled or name
+                    if name and name in vars(sp):
+                        return None
+                    if number is None:
+                        value = sp.Integer(1)
+                    else:
+                        value = sp.Float(number) if "." in number else sp.Rational(number)
+                    terms.append((name, -value if sign == "-" else value))
+                    pos = match.end()
+                sides.append(terms)
+            equations.append(sides)
+
+        symbols = {sp.Symbol(name) for sides in equations for side in sides for name, _ in side if name}
+        unknowns = self._pick_unknowns(symbols, len(equations))
+        column = {u.name: j for j, u in enumerate(unknowns)}
+        rows, rhs = [], []
+        for left, right in equations:
+            row, constant = {}, sp.Integer(0)
+            for sign, terms in ((1, left), (-1, right)):
+                for name, value in terms:
+                    if name in column:
+                        row[column[name]] = row.get(column[name], 0) + sign * value
+                    elif name:
+                        # Parameter: moves to the right-hand side like a number
+                        constant -= sign * value * sp.Symbol(name)
+                    else:
+                        constant -= sign * value
+            rows.append({j: c for j, c in sorted(row.items()) if c != 0})
+            rhs.append(constant)
+        return ParsedProblem("system", unknowns, lhs=rows, rhs=rhs)
+
+    def _pick_unknowns(self, symbols, count: int) -> tuple:
+        """
+        As many unknowns as equations, picked like _pick_variable: x, y, z, t
+        and indexed names (x1, y_2) first, then alphabetical. The remaining
+        symbols are parameters (a*x + y = 1; x - y = 2 is solved for x, y).
+        """
+        ordered = sorted(
+            self._natural_order(symbols),
+            key=lambda s: s.name not in ("x", "y", "z", "t") and not re.search(r"\d$", s.name)
+        )
+        return self._natural_order(ordered[:count])
+
+    def _natural_order(self, symbols) -> tuple:
+        """Sorted so that x2 comes before x10."""
+        return tuple(sorted(
+            symbols,
+            key=lambda s: (re.sub(r"\d+$", "", s.name), int(re.search(r"\d*$", s.name).group() or 0))
+        ))
+
+    def _literal(self, text: str) -> list:
+        try:
+            return json.loads(text)
+        except ValueError:
+            # Fractions or symbols such as 1/3 or sqrt(2)
+            return sp.sympify(text)
+
+    def _number(self, value):
+        if isinstance(value, float):
+            return sp.Float(value)
+        return sp.sympify(value)
+
+    def _solve_system(self, problem: ParsedProblem) -> dict:
+        unknowns = list(problem.var)
+        count = len(problem.lhs) if problem.expr is None else len(problem.expr)
+        linear = problem.linear_system
+
+        steps = [
+            f"1. Collect {count} equation{'s' * (count != 1)} in {len(unknowns)} unknown{'s' * (len(unknowns) != 1)} "
+            f"({'linear' if linear is not None else 'nonlinear'})"
+        ]
+        if linear is not None:
+            found, texts = self.systems.solve_linear(unknowns, *linear)
+        else:
+            try:
+                found, texts = self.systems.solve_nonlinear(unknowns, list(problem.expr))
+            except ValueError as e:
+                return {"error": str(e), "message": "Try a smaller system or a linear one."}, None
+        steps.extend(f"{n}. {text}" for n, text in enumerate(texts, start=2))
+
+        if isinstance(found, dict):
+            final = self._assignment(found)
+            display = [sp.Eq(u, v, evaluate=False) for u, v in found.items()]
+        elif isinstance(found, list) and found:
+            final = "[" + ", ".join(self._assignment(f) for f in found) + "]"
+            display = [[sp.Eq(u, v, evaluate=False) for u, v in f.items()] for f in found]
+        elif found == "infinitely many":
+            final = display = "Infinitely many solutions"
+        else:
+            final = display = "No solution"
+
+        response = self._format_response(display, steps, "system")
+        response["final_answer"] = final
+        response["problem_type"] = "system"
+        return response, found
+
+    def _assignment(self, solution: dict) -> str:
+        """{x: 2, y: 1} in unknown order (sstr would sort x10 before x2)."""
+        return "{" + ", ".join(f"{u}: {sp.sstr(v)}" for u, v in solution.items()) + "}"
+
+    # ------------------------------------------------------------
     # Integration
     # ------------------------------------------------------------
-    def _extract_integrand(self, text: str) -> str:
-        """Extracts the math part from integrate() or ∫...dx strings."""
+    def _parse_integral(self, cleaned: str) -> ParsedProblem:
+        """
+        Accepts integrate(f), ∫f dx, integrate(f, x), integrate(f, x, a, b)
+        and integrate(f, (x, a, b)). Without an explicit variable the
+        differential (dy) wins, then the usual x, y, z, t preference.
+        """
+        content, differential = self._extract_integrand(cleaned)
+        parsed = sp.sympify(content)
+
+        var, limits = None, None
+        if isinstance(parsed, (tuple, sp.Tuple)):
+            expr, *spec = parsed
+            if len(spec) == 1 and isinstance(spec[0], (tuple, sp.Tuple)):
+                spec = list(spec[0])
+            if len(spec) not in (1, 3) or not isinstance(spec[0], sp.Symbol):
+                raise ValueError(f"Could not parse integration bounds: {content}")
+            var = spec[0]
+            if len(spec) == 3:
+                limits = (spec[1], spec[2])
+        else:
+            expr = parsed
+
+        if var is None:
+            var = sp.Symbol(differential) if differential else self._pick_variable(expr.free_symbols)
+        return ParsedProblem("integration", var, expr=expr, limits=limits)
+
+    def _extract_integrand(self, text: str) -> tuple:
+        """
+        Extracts the math part from integrate() or ∫...dx strings.
+        Returns (integrand text, differential variable name or None).
+        """
         text = text.replace("^", "**")
 
         # 1. Remove the keywords (integrate, ∫, integral)
@@ -162,45 +533,38 @@ class MathSolver:
 
         # 3. Remove trailing 'dx', 'dy', 'dt' if present
         # This handles "integrate(x^2 dx)" or "∫ x^2 dx"
-        clean = re.sub(r"\s*d[a-zA-Z]$", "", clean, flags=re.IGNORECASE)
-
-        return clean.strip()
-
-    def _solve_integration(self, expr_str: str) -> dict:
-        expr = sp.sympify(expr_str)
-        var = self._infer_variable(expr_str)
-
-        steps = []
-        if isinstance(expr, sp.Add):
-            terms = expr.args
-            steps.append(f"1. Break into separate integrals: {expr}")
-
-            integrated_terms = []
-            step = 2
-
-            for term in terms:
-                result = sp.integrate(term, var)
-                rule = "constant rule" if term.is_Number else "power rule"
-
-                steps.append(f"{step}. Apply {rule}: ∫{term} dx = {result}")
-                step += 1
-                integrated_terms.append(result)
-
-            final = sum(integrated_terms)
+        differential = re.search(r"d([a-zA-Z])$", clean)
+        if differential:
+            clean = clean[:differential.start()]
+            differential = differential.group(1)
+
+        return clean.strip(), differential
+
+    def _solve_integration(self, problem: ParsedProblem) -> dict:
+        result, texts = self.integration.integrate(problem.expr, problem.var, problem.limits)
+        steps = [f"{i}. {text}" for i, text in enumerate(texts, start=1)]
+        return self._integration_response(problem, result, steps), result
+
+    def _integration_response(self, problem: ParsedProblem, result, steps: list) -> dict:
+        response = {"steps": steps, "problem_type": "integration"}
+        if problem.limits is None:
+            response["final_answer"] = f"{sp.sstr(result)} + C"
+            return response
+
+        divergence = self.integration.divergence(result)
+        if divergence is None:
+            response["final_answer"] = sp.sstr(result)
         else:
-            final = sp.integrate(expr, var)
-            steps.append(f"1. Apply power rule: ∫{expr} dx = {final}")
-
-        return {
-            "final_answer": f"{sp.sstr(final)} + C",
-            "steps": steps,
-            "problem_type": "integration"
-        }
+            # Never show nan / zoo: a divergent integral says so, with its sign when it has one
+            response["final_answer"] = "Diverges" if divergence == "undefined" else f"Diverges to {divergence}"
+            response["diverges"] = True
+        return response
 
     # ------------------------------------------------------------
     # Differentiation
     # ------------------------------------------------------------
-    def _solve_differentiation(self, user_input: str) -> dict:
+    def _parse_differentiation(self, user_input: str):
+        """Split diff input into (expression string, variable). None if no match."""
         expr_txt = user_input.replace("^", "**")
 
         # Regex explanation:
@@ -216,7 +580,7 @@ class MathSolver:
             if content.endswith(")") and not content.count("(") == content.count(")"):
                 content = content[:-1]
         else:
-            return {"error": "Could not parse differentiation input."}
+            return None
 
         # Check for explicitly defined variable (e.g., "x**2, y")
         # We look for a comma followed by a single letter at the end
@@ -233,143 +597,13 @@ class MathSolver:
             var = sp.Symbol("x")
             expr_str = content
 
-        try:
-            expr = sp.sympify(expr_str)
-        except Exception:
-            return {
-                "error": f"SymPy could not parse expression: {expr_str}",
-                "message": "Ensure your parentheses match."
-            }
-        steps = []
-        final = sp.diff(expr, var) 
-
-        # 2. Step Logic (Now generating Data Objects)
-        try:
-            # ---- Quotient Rule Check ----
-            if isinstance(expr, sp.Mul):
-                denom = [a for a in expr.args if (isinstance(a, sp.Pow) and a.exp == -1)]
-                if denom:
-                    g_part = denom[0].base 
-                    f_part = expr * g_part 
-                    
-                    f_prime = sp.diff(f_part, var)
-                    g_prime = sp.diff(g_part, var)
-                    
-                    # Store steps as distinct data points
-                    steps.append({
-                        "type": "identification",
-                        "output": f"Identify Quotient Rule: f(x)={sp.sstr(f_part)}, g(x)={sp.sstr(g_part)}",
-                        "hint": "Formula: (f'g - fg') / g^2"
-                    })
-                    
-                    steps.append({
-                        "type": "derivation",
-                        "output": f"Differentiate Numerator: f'(x) = {sp.sstr(f_prime)}"
-                    })
-
-                    steps.append({
-                        "type": "derivation",
-                        "output": f"Differentiate Denominator: g'(x) = {sp.sstr(g_prime)}"
-                    })
-                    
-                    steps.append({
-                        "type": "calculation",
-                        "output": f"Apply Rule: ({sp.sstr(f_prime)})*({sp.sstr(g_part)}) - ({sp.sstr(f_part)})*({sp.sstr(g_prime)}) / ({sp.sstr(g_part)})^2"
-                    })
-                    
-                    steps.append({
-                        "type": "simplification",
-                        "output": f"Simplify: {sp.sstr(final)}"
-                    })
-                    
-                    # Return the data-rich response
-                    return {
-                        "final_answer": sp.sstr(final),
-                        "latex": sp.latex(final),
-                        "problem_type": "Differentiation",
-                        "steps": steps
-                    }
-
-            # ---- Product Rule Check ----
-            if isinstance(expr, sp.Mul):
-                factors = expr.as_ordered_factors()
-                if len(factors) >= 2:
-                    f = factors[0]
-                    g = sp.Mul(*factors[1:])
-                    
-                    f_prime = sp.diff(f, var)
-                    g_prime = sp.diff(g, var)
-
-                    steps.append({
-                        "type": "identification",
-                        "output": f"Identify Product Rule: f={sp.sstr(f)}, g={sp.sstr(g)}",
-                        "hint": "Formula: f'g + fg'"
-                    })
-                    
-                    steps.append({
-                        "type": "derivation",
-                        "output": f"Differentiate terms: f'={sp.sstr(f_prime)}, g'={sp.sstr(g_prime)}"
-                    })
-                    
-                    steps.append({
-                        "type": "calculation",
-                        "output": f"Apply Rule: ({sp.sstr(f_prime)})({sp.sstr(g)}) + ({sp.sstr(f)})({sp.sstr(g_prime)})"
-                    })
-                    
-                    return {
-                        "final_answer": sp.sstr(final),
-                        "latex": sp.latex(final),
-                        "problem_type": "Differentiation",
-                        "steps": steps
-                    }
-
-            # ---- Chain Rule Check ----
-            if hasattr(expr, 'args') and expr.args:
-                inner = expr.args[0]
-                if inner != var and not inner.is_Number:
-                    u = inner
-                    u_prime = sp.diff(u, var)
-                    outer_prime = sp.diff(expr, u).subs(u, inner)
-                    
-                    steps.append({
-                        "type": "identification",
-                        "output": f"Identify Chain Rule: Inner function u = {sp.sstr(u)}",
-                        "hint": "Formula: f'(g(x)) * g'(x)"
-                    })
-                    
-                    steps.append({
-                        "type": "derivation",
-                        "output": f"Differentiate Inner: u' = {sp.sstr(u_prime)}"
-                    })
-
-                    steps.append({
-                        "type": "derivation",
-                        "output": f"Differentiate Outer: f'(u) = {sp.sstr(outer_prime)}"
-                    })
-                    
-                    steps.append({
-                        "type": "calculation",
-                        "output": f"Multiply: ({sp.sstr(outer_prime)}) * ({sp.sstr(u_prime)})"
-                    })
-
-                    return {
-                        "final_answer": sp.sstr(final),
-                        "latex": sp.latex(final),
-                        "problem_type": "Differentiation",
-                        "steps": steps
-                    }
+        return expr_str, var
 
-        except Exception:
-            # Fallback if specific detection fails
-            pass
-
-        # ---- Generic Fallback ----
-        steps.append({
-            "type": "standard_rule",
-            "output": f"Differentiate using standard power rules: d/dx({sp.sstr(expr)})",
-            "hint": "Power Rule: d/dx(x^n) = n*x^(n-1)"
-        })
-        
+    def _solve_differentiation(self, problem: ParsedProblem) -> dict:
+        final, steps, _ = self.differentiation.differentiate(problem.expr, problem.var)
+        return self._differentiation_response(final, steps), final
+
+    def _differentiation_response(self, final, steps: list) -> dict:
         return {
             "final_answer": sp.sstr(final),
             "latex": sp.latex(final),
@@ -380,6 +614,7 @@ class MathSolver:
     # ------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------
-    def _infer_variable(self, expr_str: str):
-        symbols = re.findall(r"[a-zA-Z]", expr_str)
-        return sp.Symbol(symbols[0]) if symbols else sp.Symbol("x")
\ No newline at end of file
+    def _pick_variable(self, symbols) -> sp.Symbol:
+        """Conventional unknowns first (x**3 - a = 0 is solved for x), then alphabetical."""
+        ordered = sorted(symbols, key=lambda s: (s.name not in ("x", "y", "z", "t"), s.name))
+        return ordered[0] if ordered else sp.Symbol("x")
\ No newline at end of file
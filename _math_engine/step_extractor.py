@@ -1,3 +1,6 @@
+import re
+
+
 class StepExtractor:
     def __init__(self):
         pass
@@ -11,12 +14,16 @@ class StepExtractor:
         extracted_steps = []
 
         for idx, step in enumerate(raw_steps, start=1):
+            # Equation / integration solvers emit plain "1. ..." strings
+            if isinstance(step, str):
+                step = {"output": re.sub(r"^\d+\.\s*", "", step)}
+
             extracted_steps.append({
                 "step_number": idx,
                 "type": step.get("type", "info"),
                 "input": step.get("input"),
                 "output": step.get("output"),
-                "hint": step.get("explanation_hint")
+                "hint": step.get("hint") or step.get("explanation_hint")
             })
 
         return extracted_steps
@@ -0,0 +1,213 @@
+import numpy as np
+import sympy as sp
+
+try:
+    from scipy import sparse
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    # SciPy is optional: without it large systems use NumPy's dense LU
+    sparse = None
+
+
+class SystemEngine:
+    """
+    Systems of equations, small and large.
+
+    Linear systems are given as sparse rows ({column: coefficient}) plus a
+    right-hand side. Small exact ones get Gauss-Jordan elimination on
+    exact numbers with every row operation as a step. Larger or float systems
+    go to LAPACK through NumPy (dense LU), or SciPy's sparse LU when the
+    matrix is big and mostly zeros. Small nonlinear polynomial systems are
+    triangularized with a lex Gröbner basis, anything else goes to
+    nonlinsolve.
+    """
+
+    # Beyond this condition number a float solution is rounding noise
+    MAX_CONDITION = 1e12
+
+    def __init__(self, exact_max_unknowns: int = 8, nonlinear_max_unknowns: int = 4, sparse_min_unknowns: int = 200):
+        self.exact_max_unknowns = exact_max_unknowns
+        self.nonlinear_max_unknowns = nonlinear_max_unknowns
+        self.sparse_min_unknowns = sparse_min_unknowns
+
+    def solve_linear(self, unknowns: list, rows: list, rhs: list) -> tuple:
+        """
+        Returns (solution, step texts without numbering). The solution is a
+        {unknown: value} dict, None when inconsistent, or the string
+        "infinitely many" when the numeric path finds a rank-deficient system.
+        """
+        exact = not any(c.is_Float for row in rows for c in row.values()) and \
+            not any(c.is_Float for c in rhs)
+
+        # Parameters (a*x + y = 1) have no numeric value: eliminate symbolically at any size
+        parametric = any(c.free_symbols for row in rows for c in row.values()) or \
+            any(c.free_symbols for c in rhs)
+
+        if parametric or (exact and len(unknowns) <= self.exact_max_unknowns):
+            return self._eliminate(unknowns, rows, rhs)
+        return self._numeric(unknowns, rows, rhs)
+
+    def solve_nonlinear(self, unknowns: list, exprs: list) -> tuple:
+        """Returns (list of solution dicts, step texts). Raises ValueError when too large."""
+        if len(unknowns) > self.nonlinear_max_unknowns:
+            raise ValueError(
+                f"Nonlinear systems are limited to {self.nonlinear_max_unknowns} unknowns (got {len(unknowns)})"
+            )
+
+        steps = []
+        if all(e.is_polynomial(*unknowns) for e in exprs):
+            basis = sp.groebner(exprs, *unknowns, order="lex")
+            steps.append(
+                f"Compute a lex Gröbner basis (triangular: later polynomials drop earlier unknowns): "
+                f"{', '.join(sp.sstr(g) for g in basis.exprs)}"
+            )
+            if list(basis.exprs) == [1]:
+                steps.append("The basis is {1}: the equations contradict each other")
+                return [], steps
+            found = sp.solve(list(basis.exprs), unknowns, dict=True)
+            steps.append("Solve the triangular basis from the last polynomial upwards, back-substituting each root")
+        else:
+            solved = sp.nonlinsolve(exprs, unknowns)
+            if not isinstance(solved, sp.FiniteSet):
+                raise ValueError("No closed-form solution for this nonlinear system")
+            found = [dict(zip(unknowns, values)) for values in solved]
+            steps.append("Solve by substitution and elimination (nonlinsolve)")
+
+        return found, steps
+
+    # ---------------------------------------------------------
+    # ✏️ EXACT ELIMINATION
+    # ---------------------------------------------------------
+
+    def _eliminate(self, unknowns, rows, rhs) -> tuple:
+        n = len(unknowns)
+        matrix = [[row.get(j, sp.Integer(0)) for j in range(n)] + [b] for row, b in zip(rows, rhs)]
+        steps = [f"Write the augmented matrix [A | b]: {self._show(matrix)}"]
+
+        pivots = []
+        r = 0
+        for col in range(n):
+            pivot = next((i for i in range(r, len(matrix)) if matrix[i][col] != 0), None)
+            if pivot is None:
+                continue
+            if pivot != r:
+                matrix[r], matrix[pivot] = matrix[pivot], matrix[r]
+                steps.append(f"Swap R{r + 1} ↔ R{pivot + 1}")
+
+            lead = matrix[r][col]
+            if lead != 1:
+                matrix[r] = [self._tidy(v / lead) for v in matrix[r]]
+                divisor = sp.sstr(lead) if lead.is_Integer and lead > 0 else f"({sp.sstr(lead)})"
+                steps.append(f"R{r + 1} → R{r + 1} / {divisor}")
+
+            for i in range(len(matrix)):
+                factor = matrix[i][col]
+                if i != r and factor != 0:
+                    matrix[i] = [self._tidy(a - factor * b) for a, b in zip(matrix[i], matrix[r])]
+                    steps.append(f"R{i + 1} → R{i + 1} - ({sp.sstr(factor)})·R{r + 1}")
+
+            pivots.append(col)
+            r += 1
+            if r == len(matrix):
+                break
+
+        steps.append(f"Reduced row echelon form: {self._show(matrix)}")
+
+        if any(all(v == 0 for v in row[:-1]) and row[-1] != 0 for row in matrix):
+            steps.append("A row reads 0 = c with c ≠ 0: the system has no solution")
+            return None, steps
+
+        free = [unknowns[j] for j in range(n) if j not in pivots]
+        solution = {}
+        for i, col in enumerate(pivots):
+            value = matrix[i][-1] - sum(matrix[i][j] * unknowns[j] for j in range(n) if j not in pivots)
+            solution[unknowns[col]] = self._tidy(value)
+        for symbol in free:
+            solution[symbol] = symbol
+
+        if free:
+            steps.append(f"{', '.join(map(str, free))} free: infinitely many solutions, read off the pivot rows")
+        else:
+            steps.append("Read each unknown off its pivot row")
+        return {u: solution[u] for u in unknowns}, steps
+
+    def _tidy(self, value):
+        """Entries with parameters as one rational function, not nested fractions."""
+        return sp.cancel(value) if value.free_symbols else value
+
+    def _show(self, matrix) -> str:
+        return "[" + ", ".join("[" + ", ".join(sp.sstr(v) for v in row) + "]" for row in matrix) + "]"
+
+    # ---------------------------------------------------------
+    # 🔢 NUMERIC (NumPy / SciPy)
+    # ---------------------------------------------------------
+
+    def _numeric(self, unknowns, rows, rhs) -> tuple:
+        m, n = len(rows), len(unknowns)
+        nonzeros = sum(len(row) for row in rows)
+        density = nonzeros / (m * n)
+        b = np.array([float(v) for v in rhs])
+
+        use_sparse = sparse is not None and m == n and n >= self.sparse_min_unknowns and density < 0.1
+        steps = [f"Write the system as A·x = b: A is {m}×{n} with {nonzeros} nonzeros ({density:.1%} dense)"]
+
+        if use_sparse:
+            data, row_idx, col_idx = [], [], []
+            for i, row in enumerate(rows):
+                for j, c in row.items():
+                    row_idx.append(i)
+                    col_idx.append(j)
+                    data.append(float(c))
+            A = sparse.csr_matrix((data, (row_idx, col_idx)), shape=(m, n))
+            x = spsolve(A.tocsc(), b)
+            if np.all(np.isfinite(x)):
+                steps.append("Solve with a sparse LU factorization (SciPy SuperLU): zeros are never stored")
+                steps.append(f"Check the residual: ‖A·x - b‖ = {np.linalg.norm(A @ x - b):.2e}")
+                return self._numeric_solution(unknowns, x), steps
+            # Singular: the dense rank analysis decides between none and infinitely many
+            return self._dense(unknowns, A.toarray(), b, steps)
+
+        A = np.zeros((m, n))
+        for i, row in enumerate(rows):
+            for j, c in row.items():
+                A[i, j] = float(c)
+        return self._dense(unknowns, A, b, steps)
+
+    def _dense(self, unknowns, A, b, steps) -> tuple:
+        m, n = A.shape
+        # LAPACK only raises on exactly singular pivots: treat ill-conditioned A as singular too
+        if m == n and np.linalg.cond(A) < self.MAX_CONDITION:
+            try:
+                x = np.linalg.solve(A, b)
+                steps.append("Solve with an LU factorization with partial pivoting (NumPy / LAPACK)")
+                steps.append(f"Check the residual: ‖A·x - b‖ = {np.linalg.norm(A @ x - b):.2e}")
+                return self._numeric_solution(unknowns, x), steps
+            except np.linalg.LinAlgError:
+                pass
+
+        rank = np.linalg.matrix_rank(A)
+        augmented = np.linalg.matrix_rank(np.column_stack([A, b]))
+        steps.append(f"Compare ranks: rank(A) = {rank}, rank([A | b]) = {augmented}, {n} unknowns")
+
+        if augmented > rank:
+            steps.append("rank([A | b]) > rank(A): the system has no solution")
+            return None, steps
+        if rank < n:
+            steps.append(f"rank(A) < {n}: infinitely many solutions")
+            return "infinitely many", steps
+
+        # Full column rank and consistent: least squares is exact here
+        x = np.linalg.lstsq(A, b, rcond=None)[0]
+        steps.append(f"Consistent and full rank: solve the {m}×{n} system by least squares (the residual is zero)")
+        return self._numeric_solution(unknowns, x), steps
+
+    def _numeric_solution(self, unknowns, x) -> dict:
+        solution = {}
+        for symbol, value in zip(unknowns, x):
+            nearest = round(value)
+            # Integral answers show as integers instead of 2.99999999999999
+            if abs(value - nearest) <= 1e-10 * max(1.0, abs(value)):
+                solution[symbol] = sp.Integer(nearest)
+            else:
+                solution[symbol] = sp.Float(value, 12)
+        return solution
@@ -0,0 +1,286 @@
+import threading
+import time
+
+import mpmath
+import numpy as np
+import sympy as sp
+
+from .problem import ParsedProblem
+
+# Functions that are not analytic: sample them on the real line only
+_NON_ANALYTIC = (sp.Abs, sp.sign, sp.Piecewise, sp.floor, sp.ceiling, sp.re, sp.im, sp.arg, sp.Heaviside)
+
+
+class AnswerVerifier:
+    """
+    Checks a solved problem by plugging the answer back in.
+
+    Equations: every root must make lhs - rhs vanish. Systems: every
+    equation must hold for every solution. Derivatives and antiderivatives:
+    the slope of F must match f, measured with a five-point finite
+    difference so no symbolic derivative is needed. Definite integrals are
+    compared with numeric quadrature.
+
+    Everything is decided numerically: expressions are compiled once with
+    lambdify and evaluated on a batch of random points in one NumPy call.
+    Only when the samples disagree with each other or too few are finite
+    does it fall back to a symbolic check.
+    """
+
+    # Finite-difference step: truncation ~h^4, rounding ~1e-16/h, both far below DERIVATIVE_TOLERANCE
+    STEP = 1e-3
+    DERIVATIVE_TOLERANCE = 1e-7
+
+    def __init__(self, samples: int = 8, tolerance: float = 1e-8, seed: int = 0):
+        self.samples = samples
+        self.tolerance = tolerance
+        self.rng = np.random.default_rng(seed)
+        # One verifier serves every request thread; Generator is not thread-safe
+        self._rng_lock = threading.Lock()
+
+    def verify(self, problem: ParsedProblem, answer) -> dict:
+        """
+        Check `answer` (the raw SymPy answer the solver produced for `problem`).
+        {"verdict": verified | failed | inconclusive | skipped, "method": ..., "ms": ...}
+        """
+        start = time.perf_counter()
+        try:
+            verdict, method = self._dispatch(problem, answer)
+        except Exception:
+            verdict, method = "inconclusive", "error"
+        return {
+            "verdict": verdict,
+            "method": method,
+            "ms": round((time.perf_counter() - start) * 1000, 3)
+        }
+
+    def _dispatch(self, problem: ParsedProblem, answer) -> tuple:
+        if answer is None:
+            return "skipped", "none"
+
+        if problem.kind == "equation":
+            return self._roots(problem.std_form, problem.var, answer)
+
+        if problem.kind == "differentiation":
+            return self._slope_matches(problem.expr, answer, problem.var)
+
+        if problem.kind == "integration":
+            if problem.limits is None:
+                return self._slope_matches(answer, problem.expr, problem.var)
+            return self._quadrature(problem, answer)
+
+        if problem.kind == "system":
+            return self._system(problem, answer)
+
+        return "skipped", "none"
+
+    # ---------------------------------------------------------
+    # 🎲 NUMERIC ZERO TEST
+    # ---------------------------------------------------------
+
+    def _all_vanish(self, exprs: list) -> tuple:
+        """Every expression must be identically zero."""
+        method = "numeric"
+        for expr in exprs:
+            verdict = self._vanishes(expr)
+            if verdict is None:
+                # Numeric test could not decide: ask SymPy
+                method = "symbolic"
+                verdict = sp.sympify(expr).equals(0)
+                if verdict is None:
+                    return "inconclusive", method
+            if not verdict:
+                return "failed", method
+        return "verified", method
+
+    def _roots(self, std_form, var, roots) -> tuple:
+        """Numeric roots go through one compiled std_form; roots with parameters are sampled one by one."""
+        if not roots:
+            # Nothing to plug in (and _all_vanish([]) would call that verified)
+            return "skipped", "none"
+        if not all(root.is_number for root in roots) or std_form.free_symbols != {var}:
+            return self._all_vanish([std_form.subs(var, root) for root in roots])
+
+        terms = sp.Add.make_args(std_form)
+        try:
+            f = sp.lambdify([var], list(terms), modules="numpy")
+        except Exception:
+            return self._all_vanish([std_form.subs(var, root) for root in roots])
+
+        values = self._evaluate(f, len(terms), [np.array([complex(sp.N(root, 17)) for root in roots])])
+        if values is not None:
+            verdict = self._agree(
+                np.abs(values.sum(axis=0)), np.maximum(1.0, np.abs(values).sum(axis=0)), self.tolerance
+            )
+            if verdict is not None:
+                return ("verified" if verdict else "failed"), "numeric"
+        return self._all_vanish([std_form.subs(var, root) for root in roots])
+
+    def _vanishes(self, expr):
+        """True / False when the random samples agree, None when inconclusive."""
+        expr = sp.sympify(expr)
+        if expr == 0:
+            return True
+
+        symbols = sorted(expr.free_symbols, key=lambda s: s.name)
+        terms = sp.Add.make_args(expr)
+        try:
+            f = sp.lambdify(symbols, list(terms), modules="numpy")
+        except Exception:
+            return None
+
+        n = self.samples if symbols else 1
+        values = self._evaluate(f, len(terms), self._points(expr, symbols, n))
+        if values is None:
+            return None
+
+        residual = np.abs(values.sum(axis=0))
+        scale = np.maximum(1.0, np.abs(values).sum(axis=0))
+        return self._agree(residual, scale, self.tolerance)
+
+    def _points(self, expr, symbols, n: int) -> list:
+        analytic = not expr.has(*_NON_ANALYTIC)
+        with self._rng_lock:
+            # Random points away from 0 and 1, where poles and log branch points sit
+            points = [self.rng.uniform(0.2, 1.8, n) for _ in symbols]
+            if analytic:
+                # Complex points keep log/sqrt of negative arguments finite and branch-consistent
+                points = [p + 1j * self.rng.uniform(-0.5, 0.5, n) for p in points]
+        return points
+
+    def _evaluate(self, f, count: int, points: list):
+        """(count, n) complex array of f's outputs, or None if NumPy cannot evaluate it."""
+        n = len(points[0]) if points else 1
+        with np.errstate(all="ignore"):
+            try:
+                return np.array([np.broadcast_to(v, (n,)) for v in f(*points)], dtype=complex).reshape(count, n)
+            except Exception:
+                return None
+
+    def _agree(self, residual, scale, tolerance):
+        finite = np.isfinite(residual) & np.isfinite(scale)
+        if finite.sum() < max(1, len(residual) // 2):
+            return None
+
+        close = residual[finite] <= tolerance * scale[finite]
+        if close.all():
+            return True
+        if not close.any():
+            return False
+        return None
+
+    # ---------------------------------------------------------
+    # 📈 DERIVATIVE CHECK
+    # ---------------------------------------------------------
+
+    def _slope_matches(self, F, f, var) -> tuple:
+        """dF/dvar == f, from F sampled at x ± h, x ± 2h (five-point stencil)."""
+        F, f = sp.sympify(F), sp.sympify(f)
+        others = sorted((F.free_symbols | f.free_symbols) - {var}, key=lambda s: s.name)
+        symbols = [var] + others
+        try:
+            compiled = sp.lambdify(symbols, [F, f], modules="numpy")
+        except Exception:
+            compiled = None
+
+        if compiled is not None:
+            n, h = self.samples, self.STEP
+            points = self._points(F + f, symbols, n)
+            x, rest = points[0], points[1:]
+            shifted = [x + 2 * h, x + h, x - h, x - 2 * h, x]
+            values = self._evaluate(compiled, 2, [np.concatenate(shifted)] + [np.tile(p, 5) for p in rest])
+            if values is not None:
+                F2, F1, Fm1, Fm2, _ = values[0].reshape(5, n)
+                slope = (-F2 + 8 * F1 - 8 * Fm1 + Fm2) / (12 * h)
+                expected = values[1].reshape(5, n)[4]
+                verdict = self._agree(
+                    np.abs(slope - expected),
+                    np.maximum(1.0, np.abs(expected)),
+                    self.DERIVATIVE_TOLERANCE
+                )
+                if verdict is not None:
+                    return ("verified" if verdict else "failed"), "numeric"
+
+        # Inconclusive: differentiate symbolically after all
+        verdict = (sp.diff(F, var) - f).equals(0)
+        if verdict is None:
+            return "inconclusive", "symbolic"
+        return ("verified" if verdict else "failed"), "symbolic"
+
+    # ---------------------------------------------------------
+    # ∫ DEFINITE INTEGRALS
+    # ---------------------------------------------------------
+
+    def _quadrature(self, problem: ParsedProblem, value) -> tuple:
+        lower, upper = problem.limits
+        if value.has(sp.nan, sp.zoo, sp.AccumBounds) or value.is_infinite:
+            # Divergent: quadrature has no value to compare with
+            return "skipped", "divergent"
+        if value.free_symbols - {problem.var}:
+            # Symbolic bounds: nothing numeric to compare with
+            return "skipped", "none"
+
+        f = sp.lambdify(problem.var, problem.expr, modules="mpmath")
+        estimate = mpmath.quad(f, [self._mp(lower), self._mp(upper)])
+        expected = complex(sp.N(value))
+        ok = abs(complex(estimate) - expected) <= 1e-6 * max(1.0, abs(expected))
+        return ("verified" if ok else "failed"), "quadrature"
+
+    def _mp(self, bound):
+        if bound.is_infinite:
+            return mpmath.inf if bound == sp.oo else -mpmath.inf
+        return mpmath.mpmathify(sp.N(bound))
+
+    # ---------------------------------------------------------
+    # 🧮 SYSTEMS
+    # ---------------------------------------------------------
+
+    def _system(self, problem: ParsedProblem, answer) -> tuple:
+        if not isinstance(answer, (dict, list)):
+            # "No solution" / "infinitely many": nothing to substitute
+            return "skipped", "none"
+        solutions = answer if isinstance(answer, list) else [answer]
+        if not solutions:
+            # Empty nonlinear solution list: nothing to plug in either
+            return "skipped", "none"
+        solutions = [{u: sp.sympify(v) for u, v in solution.items()} for solution in solutions]
+
+        linear = problem.linear_system
+        if linear is not None and all(v.is_number for s in solutions for v in s.values()):
+            return self._linear_residual(problem.var, *linear, solutions[0])
+
+        exprs = []
+        for solution in solutions:
+            if problem.expr is not None:
+                exprs.extend(e.subs(solution) for e in problem.expr)
+            else:
+                rows, rhs = linear
+                exprs.extend(
+                    sp.Add(*[c * solution[problem.var[j]] for j, c in row.items()]) - b
+                    for row, b in zip(rows, rhs)
+                )
+        return self._all_vanish(exprs)
+
+    def _linear_residual(self, unknowns, rows, rhs, solution) -> tuple:
+        """A·x - b with NumPy, no SymPy per row: cheap even for hundreds of unknowns."""
+        x = np.array([self._complex(solution[u]) for u in unknowns])
+        row_idx = np.array([i for i, row in enumerate(rows) for _ in row], dtype=int)
+        col_idx = np.array([j for row in rows for j in row], dtype=int)
+        coeffs = np.array([self._complex(c) for row in rows for c in row.values()])
+        b = np.array([self._complex(v) for v in rhs])
+
+        products = coeffs * x[col_idx] if len(coeffs) else np.zeros(0, dtype=complex)
+        ax = np.bincount(row_idx, weights=products.real, minlength=len(rows)) + \
+            1j * np.bincount(row_idx, weights=products.imag, minlength=len(rows))
+        scale = np.bincount(row_idx, weights=np.abs(products), minlength=len(rows)) + np.abs(b)
+
+        # Float solutions are printed with 12 digits: judge them at that precision
+        ok = np.abs(ax - b) <= max(self.tolerance, 1e-9) * np.maximum(1.0, scale)
+        return ("verified" if ok.all() else "failed"), "numeric"
+
+    def _complex(self, value) -> complex:
+        # float() is fast for Integer/Rational/Float, complex() goes through evalf
+        try:
+            return float(value)
+        except TypeError:
+            return complex(value)
@@ -0,0 +1,32 @@
+"""
+Entry point of a SolverPool worker process.
+
+Spawn still re-imports the parent's main module in every worker, so that
+module must not build anything heavy on import (app.py builds its Pipeline
+in get_pipeline()). This one imports nothing beyond the solver.
+"""
+
+
+def main(conn):
+    """Worker process loop: keep one warm MathSolver and serve calls forever."""
+    from _math_engine.solver import MathSolver
+
+    solver = MathSolver()
+    # Warm up: pulls in the lazily imported parts of SymPy before the first request
+    solver.solve("x+1=0")
+    conn.send("ready")
+
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+
+        method, args = msg
+        try:
+            result = getattr(solver, method)(*args)
+        except Exception as e:
+            result = {"error": "Solver failed", "message": str(e)}
+        conn.send(result)
@@ -0,0 +1,194 @@
+import hashlib
+import re
+import threading
+
+import numpy as np
+
+from .templates import words_to_numbers
+
+# Words that rewording adds, drops or moves around without changing the problem
+STOPWORDS = {
+    "a", "an", "the", "of", "is", "are", "was", "be", "it", "its", "this", "that",
+    "what", "which", "how", "find", "calculate", "compute", "determine", "please",
+    "and", "then", "if", "so", "does", "do", "will", "can", "you", "given", "has", "have",
+}
+
+# What the problem asks for: statements that differ here are different problems,
+# however similar the rest of the wording ("find the area" vs "find the perimeter")
+QUESTION_WORDS = {
+    "area", "perimeter", "circumference", "radius", "diameter", "volume", "surface",
+    "length", "width", "height", "side", "angle", "speed", "velocity", "acceleration",
+    "time", "distance", "rate", "derivative", "differentiate", "integral", "integrate",
+    "slope", "root", "sum", "difference", "product", "quotient", "remainder", "ratio",
+    "average", "mean", "total", "cost", "price", "profit", "loss", "interest", "percent",
+    "percentage", "age", "number", "square", "cube", "maximum", "minimum",
+}
+# How the numbers combine; matched before plural stripping ("times" is not "time")
+OPERATORS = {
+    "plus", "minus", "times", "multiplied", "divided", "over", "more", "less", "fewer",
+    "twice", "double", "triple", "half", "squared", "cubed", "increased", "decreased",
+    "added", "subtracted",
+}
+
+# Mersenne prime for the universal hashes: a*h + b stays below 2**64
+_PRIME = (1 << 31) - 1
+
+
+def normalize(text: str) -> tuple:
+    """
+    (content words, numbers, intent): lowercase, number words as digits,
+    stopwords and plural s dropped. Numbers stay in order of appearance
+    ("5 minus 3" is not "3 minus 5"). Intent is the sorted question words
+    and operators the statement uses.
+    """
+    text = words_to_numbers(text.lower())
+    numbers = tuple(re.findall(r"\d+(?:\.\d+)?", text))
+    words, intent = [], set()
+    for word in re.findall(r"[a-z]+", text):
+        if word in STOPWORDS:
+            continue
+        if word in OPERATORS:
+            intent.add(word)
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        if word in QUESTION_WORDS:
+            intent.add(word)
+        words.append(word)
+    return tuple(words), numbers, tuple(sorted(intent))
+
+
+class StatementIndex:
+    """
+    Near-duplicate word problem → extracted expression index.
+
+    A statement is reduced to its set of content words and its numbers.
+    Two statements are the same problem when their numbers and their
+    intent (question words and operators, see QUESTION_WORDS / OPERATORS)
+    are identical and the Jaccard similarity of their word sets is at least `threshold`
+    ("A train travels 120 km in 2 hours, find its speed" vs "Find the speed
+    of a train that travels 120 km in 2 hours"). Word sets are compared
+    through MinHash signatures, and LSH banding over the signatures keeps a
+    lookup to a few candidates however large the index grows.
+    Entries are mirrored to a DiskStore so the index survives restarts.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 32,
+                 store=None, max_entries: int = 20000, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.store = store
+        self.max_entries = max_entries
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+        self._entries = {}    # normalized key -> (signature, numbers, intent, expression)
+        self._buckets = {}    # (band, band bytes) -> set of keys
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if store is not None:
+            for _, value in store.items():
+                self._insert(value["text"], value["expression"])
+
+    def lookup(self, text: str):
+        """Stored expression of the closest earlier statement, or None."""
+        words, numbers, intent = normalize(text)
+        key = self._key(words, numbers)
+
+        with self._lock:
+            exact = self._entries.get(key)
+            if exact is not None:
+                self.hits += 1
+                return exact[3]
+            if not words:
+                self.misses += 1
+                return None
+
+            signature = self._signature(words)
+            candidates = set()
+            for band, chunk in self._bands(signature):
+                candidates |= self._buckets.get((band, chunk), set())
+
+            best, best_similarity = None, self.threshold
+            for candidate in candidates:
+                other, other_numbers, other_intent, expression = self._entries[candidate]
+                if other_numbers != numbers or other_intent != intent:
+                    # Same wording, different numbers or a different question: a different problem
+                    continue
+                similarity = float(np.mean(signature == other))
+                if similarity >= best_similarity:
+                    best, best_similarity = expression, similarity
+
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return best
+
+    def add(self, text: str, expression: str):
+        words, numbers, _ = normalize(text)
+        if not words:
+            return
+        with self._lock:
+            self._insert(text, expression)
+
+        if self.store is not None:
+            self.store.put(self._key(words, numbers), {"text": text, "expression": expression})
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "threshold": self.threshold
+        }
+
+    # ---------------------------------------------------------
+    # 🔐 MINHASH + LSH
+    # ---------------------------------------------------------
+
+    def _insert(self, text: str, expression: str):
+        words, numbers, intent = normalize(text)
+        key = self._key(words, numbers)
+        if key in self._entries:
+            self._remove(key)
+        elif len(self._entries) >= self.max_entries:
+            # Drop the oldest entry (dicts keep insertion order)
+            self._remove(next(iter(self._entries)))
+
+        signature = self._signature(words)
+        self._entries[key] = (signature, numbers, intent, expression)
+        for bucket in self._bands(signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+
+    def _remove(self, key: str):
+        signature = self._entries.pop(key)[0]
+        for bucket in self._bands(signature):
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def _key(self, words: tuple, numbers: tuple) -> str:
+        return " ".join(sorted(set(words))) + "|" + " ".join(numbers)
+
+    def _signature(self, words: tuple) -> np.ndarray:
+        """Minimum of num_perm universal hashes over the word set."""
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(w.encode(), digest_size=4).digest(), "little") % _PRIME
+             for w in set(words)],
+            dtype=np.uint64
+        )
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _bands(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
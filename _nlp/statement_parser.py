@@ -1,6 +1,12 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
-import os
+
+from _llm.backends import create_llm
+from _llm.prompt_builder import UsageTracker, truncate
+from _app import config
+from _core import metrics
+from _core.cache import hash_key
+from _core.singleflight import SingleFlight
+from . import templates
 
 load_dotenv()
 
@@ -9,17 +15,103 @@ class StatementParser:
     """
     Converts word problems into math expressions.
     Does NOT solve.
+
+    Templated phrasings ("find the derivative of x squared") are extracted
+    by rules, reworded repeats of earlier statements come from the optional
+    StatementIndex; only novel statements reach the LLM.
     """
 
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash-preview-09-2025",
-            google_api_key=os.getenv("GEMINI_API_KEY"),
-            temperature=0.0  # deterministic
-        )
+    def __init__(self, prompt_budget: int = None, index=None, use_rules: bool = True):
+        self._llm = None
+        # Max tokens of word-problem text sent to the LLM
+        self.prompt_budget = prompt_budget or config.PARSE_PROMPT_BUDGET
+        self.usage = UsageTracker()
+        # Optional StatementIndex of earlier LLM extractions
+        self.index = index
+        self.use_rules = use_rules
+        self.rule_hits = 0
+        # Identical statements submitted at the same time share one LLM call
+        self.flights = SingleFlight("statement_parser")
+
+    @property
+    def llm(self):
+        # Built on first use: the Gemini client is slow to import
+        if self._llm is None:
+            # The solve request is blocked on this short call: schedule it like a doubt
+            self._llm = create_llm("gemini-2.5-flash-preview-09-2025", temperature=0.0, priority="interactive")
+        return self._llm
+
+    def parse(self, text: str, priority: str = None) -> dict:
+        known = self._known(text)
+        if known is not None:
+            return known
+
+        prompt = self._build_prompt(text)
+
+        def call():
+            response = self.llm.invoke(prompt, priority=priority)
+            self.usage.record(prompt, response)
+            return self._remember(text, self._to_result(response))
+
+        try:
+            # Waiters share the leader's dict: hand each caller its own copy
+            return dict(self.flights.do(hash_key(prompt), call))
+
+        except Exception:
+            metrics.LLM_ERRORS.inc(component="statement_parser")
+            return {
+                "error": "Failed to extract math expression from statement"
+            }
+
+    async def aparse(self, text: str) -> dict:
+        known = self._known(text)
+        if known is not None:
+            return known
+
+        prompt = self._build_prompt(text)
+
+        async def call():
+            response = await self.llm.ainvoke(prompt)
+            self.usage.record(prompt, response)
+            return self._remember(text, self._to_result(response))
+
+        try:
+            return dict(await self.flights.ado(hash_key(prompt), call))
 
-    def parse(self, text: str) -> dict:
-        prompt = f"""
+        except Exception:
+            metrics.LLM_ERRORS.inc(component="statement_parser")
+            return {
+                "error": "Failed to extract math expression from statement"
+            }
+
+    def _known(self, text: str):
+        """Rule-based or previously extracted expression, without an LLM call."""
+        if self.use_rules:
+            expression = templates.extract(text)
+            if expression is not None:
+                self.rule_hits += 1
+                return {"expression": expression, "source": "rules"}
+
+        if self.index is not None:
+            expression = self.index.lookup(text)
+            if expression is not None:
+                return {"expression": expression, "source": "nlp_index"}
+        return None
+
+    def _remember(self, text: str, result: dict) -> dict:
+        if self.index is not None:
+            self.index.add(text, result["expression"])
+        return result
+
+    def stats(self) -> dict:
+        stats = {"rule_hits": self.rule_hits, "flights": self.flights.stats()}
+        if self.index is not None:
+            stats["index"] = self.index.stats()
+        return stats
+
+    def _build_prompt(self, text: str) -> str:
+        text = truncate(text.strip(), self.prompt_budget)
+        return f"""
 You are a math expression extractor.
 
 Your task:
@@ -39,19 +131,13 @@ Output format:
 <math_expression_only>
 """
 
-        try:
-            response = self.llm.invoke(prompt)
-            expr = response.content.strip()
-
-            if not expr:
-                raise ValueError("Empty extraction")
+    def _to_result(self, response) -> dict:
+        expr = response.content.strip()
 
-            return {
-                "expression": expr,
-                "source": "nlp"
-            }
+        if not expr:
+            raise ValueError("Empty extraction")
 
-        except Exception:
-            return {
-                "error": "Failed to extract math expression from statement"
-            }
+        return {
+            "expression": expr,
+            "source": "nlp"
+        }
@@ -0,0 +1,258 @@
+import re
+
+import sympy as sp
+from sympy.parsing.sympy_parser import (
+    convert_xor,
+    implicit_multiplication_application,
+    parse_expr,
+    standard_transformations,
+)
+
+# ---------------------------------------------------------
+# 🗣 SPOKEN MATH → SYMPY TEXT
+# ---------------------------------------------------------
+
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17,
+    "eighteen": 18, "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40,
+    "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90, "hundred": 100,
+}
+_NUMBER_WORD = re.compile(r"\b(" + "|".join(NUMBER_WORDS) + r")\b")
+
+# Longest phrases first: "square root of" before "square"
+_SPOKEN = [
+    (r"\bsquared\b", "^2"),
+    (r"\bcubed\b", "^3"),
+    (r"\bsquare root of\b|\bsquare root\b|\broot of\b", " sqrt "),
+    (r"\bcube root of\b", " cbrt "),
+    (r"\bnatural log(?:arithm)? of\b|\bnatural log(?:arithm)?\b|\bln of\b", " log "),
+    (r"\blog(?:arithm)? of\b", " log "),
+    (r"\bsine of\b|\bsine\b|\bsin of\b", " sin "),
+    (r"\bcosine of\b|\bcosine\b|\bcos of\b", " cos "),
+    (r"\btangent of\b|\btangent\b|\btan of\b", " tan "),
+    (r"\bmultiplied by\b|\btimes\b", "*"),
+    (r"\bdivided by\b|\bover\b", "/"),
+    (r"\bplus\b", "+"),
+    (r"\bminus\b", "-"),
+    (r"\bis equal to\b|\bequal to\b|\bequals\b|\bis\b", "="),
+    (r"\binfinity\b", "oo"),
+    (r"\bthe quantity\b|\bthe function\b|\bthe expression\b|\bthe\b", " "),
+]
+_SPOKEN = [(re.compile(pattern), repl) for pattern, repl in _SPOKEN]
+
+# "e to the two x" is e^(2x), "e to the minus x squared" e^(-x^2): the exponent is the run that follows
+_POWER = re.compile(
+    r"\b(?:raised to the power of|to the power of|raised to|to the)\s+"
+    r"((?:minus\s+|-\s*)?(?:\d+(?:\.\d+)?\s*)?(?:[a-z]\b)?(?:\s+squared\b|\s+cubed\b)?)"
+)
+
+# Words allowed to survive the rewrite: anything else means this is not plain spoken math
+_KNOWN_NAMES = {"sqrt", "cbrt", "log", "sin", "cos", "tan", "exp", "pi", "oo"}
+
+_TRANSFORMS = standard_transformations + (implicit_multiplication_application, convert_xor)
+
+
+def words_to_numbers(text: str) -> str:
+    return _NUMBER_WORD.sub(lambda m: str(NUMBER_WORDS[m.group(1)]), text)
+
+
+def spoken_to_sympy(phrase: str):
+    """
+    "x squared plus three x" -> x**2 + 3*x (a SymPy expression, or Eq when
+    the phrase says "equals"). None when the phrase contains anything
+    that is not spoken math.
+    """
+    text = words_to_numbers(phrase.lower())
+    text = _POWER.sub(lambda m: f"^({m.group(1).strip()})", text)
+    for pattern, repl in _SPOKEN:
+        text = pattern.sub(repl, text)
+    # "e^x" and "e to the x" mean exp(x)
+    text = re.sub(r"\be\s*\^", "E^", text)
+
+    words = re.findall(r"[a-zA-Z]+", text)
+    if any(len(w) > 1 and w not in _KNOWN_NAMES and w != "E" for w in words):
+        return None
+    if re.search(r"[^0-9a-zA-Z\s+\-*/^=().,]", text):
+        return None
+
+    sides = text.split("=")
+    if len(sides) > 2 or not all(side.strip() for side in sides):
+        return None
+    try:
+        parsed = [parse_expr(side, transformations=_TRANSFORMS) for side in sides]
+    except Exception:
+        return None
+    if not all(isinstance(p, sp.Expr) for p in parsed):
+        return None
+    return sp.Eq(*parsed, evaluate=False) if len(parsed) == 2 else parsed[0]
+
+
+# ---------------------------------------------------------
+# 🧩 TEMPLATES
+# ---------------------------------------------------------
+
+_LEAD = re.compile(
+    r"^(?:please\s+)?(?:can you\s+|could you\s+)?"
+    r"(?:find|compute|calculate|determine|evaluate|work out|give|what is|what's)?\s*(?:the\s+)?"
+)
+_WRT = re.compile(r"\s+(?:with respect to|wrt)\s+([a-z])\b")
+_DIFFERENTIAL = re.compile(r"\s+d([a-z])\b")
+_BOUNDS = re.compile(r"\s+(?:from|between)\s+(.+?)\s+(?:to|and)\s+(.+)$")
+
+_DERIVATIVE = re.compile(r"^(?:first\s+)?derivative\s+of\s+(.+)$|^differentiate\s+(.+)$")
+_INTEGRAL = re.compile(r"^(?:(?:in)?definite\s+)?integral\s+of\s+(.+)$|^integrate\s+(.+)$")
+_SOLVE = re.compile(
+    r"^solve\s+(?:the\s+equation\s+)?(.+?)(?:\s+for\s+[a-z])?$"
+    r"|^(?:roots?|zeros?|solutions?)\s+of\s+(?:the\s+equation\s+)?(.+)$"
+    r"|^value\s+of\s+[a-z]\s+(?:if|when|such that|given)\s+(.+)$"
+)
+
+_NUM = r"(\d+(?:\.\d+)?)"
+_SHAPE = re.compile(
+    r"\b(area|perimeter|circumference)\s+of\s+(?:a|an|the)?\s*"
+    r"(?:" + _NUM + r"\s+by\s+" + _NUM + r"\s+)?(circle|square|rectangle|triangle)\b(.*)$"
+)
+_DIMENSION = re.compile(r"\b(radius|diameter|side|length|width|breadth|base|height)\s+(?:of\s+|is\s+|=\s*)?" + _NUM)
+_BY = re.compile(_NUM + r"\s+by\s+" + _NUM)
+_SHAPE_FORMULAS = {
+    ("area", "circle"): ("A", lambda d: f"pi*({d['radius']})**2" if "radius" in d else f"pi*({d['diameter']}/2)**2"),
+    ("area", "square"): ("A", lambda d: f"({d['side']})**2"),
+    ("area", "rectangle"): ("A", lambda d: f"{d['length']}*{d['width']}"),
+    ("area", "triangle"): ("A", lambda d: f"{d['base']}*{d['height']}/2"),
+    ("circumference", "circle"): ("C", lambda d: f"2*pi*{d['radius']}" if "radius" in d else f"pi*{d['diameter']}"),
+    ("perimeter", "circle"): ("C", lambda d: f"2*pi*{d['radius']}" if "radius" in d else f"pi*{d['diameter']}"),
+    ("perimeter", "square"): ("P", lambda d: f"4*{d['side']}"),
+    ("perimeter", "rectangle"): ("P", lambda d: f"2*({d['length']}+{d['width']})"),
+}
+
+_DISTANCE = re.compile(r"\bdistance\b.*?\bat\s+" + _NUM + r"\s+\w+\s+per\s+(\w+)\s+for\s+" + _NUM + r"\s+(\w+)")
+_SPEED = re.compile(r"\b(?:travels|covers|goes|runs|drives)\s+" + _NUM + r"\s+\w+\s+in\s+" + _NUM + r"\s+(\w+)")
+
+
+def extract(text: str):
+    """
+    Solver input for a templated word problem ("find the derivative of x
+    squared", "area of a circle with radius 3"), or None when no template
+    matches and the statement needs the LLM.
+    """
+    text = words_to_numbers(text.lower().strip().rstrip("?.! "))
+    text = re.sub(r"\s+", " ", text)
+    body = _LEAD.sub("", text, count=1)
+
+    for extractor in (_derivative, _integral, _solve):
+        result = extractor(body)
+        if result is not None:
+            return result
+    return _geometry(text) or _motion(text)
+
+
+def _variable(body: str) -> tuple:
+    """Strip "with respect to t" / a trailing "dt": (rest, variable name or None)."""
+    var = None
+    for pattern in (_WRT, _DIFFERENTIAL):
+        match = pattern.search(body)
+        if match:
+            var = var or match.group(1)
+            body = body[:match.start()] + body[match.end():]
+    return body.strip(), var
+
+
+def _default_variable(expr, var):
+    if var is not None:
+        return sp.Symbol(var)
+    symbols = sorted(expr.free_symbols, key=lambda s: (s.name not in ("x", "y", "z", "t"), s.name))
+    return symbols[0] if symbols else sp.Symbol("x")
+
+
+def _derivative(body: str):
+    match = _DERIVATIVE.match(body)
+    if not match:
+        return None
+    phrase, var = _variable(match.group(1) or match.group(2))
+    expr = spoken_to_sympy(phrase)
+    if expr is None or isinstance(expr, sp.Eq):
+        return None
+    return f"diff({sp.sstr(expr)}, {_default_variable(expr, var)})"
+
+
+def _integral(body: str):
+    match = _INTEGRAL.match(body)
+    if not match:
+        return None
+    phrase, var = _variable(match.group(1) or match.group(2))
+
+    bounds = _BOUNDS.search(phrase)
+    limits = None
+    if bounds:
+        phrase = phrase[:bounds.start()]
+        limits = [spoken_to_sympy(bound) for bound in bounds.groups()]
+        if any(limit is None or isinstance(limit, sp.Eq) for limit in limits):
+            return None
+        phrase, var = _variable(phrase) if var is None else (phrase, var)
+
+    expr = spoken_to_sympy(phrase)
+    if expr is None or isinstance(expr, sp.Eq):
+        return None
+    var = _default_variable(expr, var)
+    if limits:
+        return f"integrate({sp.sstr(expr)}, ({var}, {sp.sstr(limits[0])}, {sp.sstr(limits[1])}))"
+    return f"integrate({sp.sstr(expr)}, {var})"
+
+
+def _solve(body: str):
+    match = _SOLVE.match(body)
+    if not match:
+        return None
+    phrase = next(group for group in match.groups() if group)
+    expr = spoken_to_sympy(phrase)
+    if expr is None or not expr.free_symbols:
+        return None
+    if isinstance(expr, sp.Eq):
+        return f"{sp.sstr(expr.lhs)}={sp.sstr(expr.rhs)}"
+    return f"{sp.sstr(expr)}=0"
+
+
+def _geometry(text: str):
+    match = _SHAPE.search(text)
+    if not match:
+        return None
+    quantity, length, width, shape, rest = match.groups()
+    formula = _SHAPE_FORMULAS.get((quantity, shape))
+    if formula is None:
+        return None
+
+    dims = {name: value for name, value in _DIMENSION.findall(rest)}
+    if "breadth" in dims:
+        dims.setdefault("width", dims.pop("breadth"))
+    by = _BY.search(rest)
+    if by:
+        length, width = by.groups()
+    if length and shape == "rectangle":
+        dims.setdefault("length", length)
+        dims.setdefault("width", width)
+    if shape == "square" and "side" not in dims and "length" in dims:
+        dims["side"] = dims["length"]
+
+    name, build = formula
+    try:
+        return f"{name}={build(dims)}"
+    except KeyError:
+        # A dimension the formula needs is missing
+        return None
+
+
+def _motion(text: str):
+    match = _DISTANCE.search(text)
+    if match:
+        speed, per, duration, unit = match.groups()
+        if unit.rstrip("s") == per.rstrip("s"):
+            return f"d={speed}*{duration}"
+        return None
+
+    match = _SPEED.search(text)
+    if match and re.search(r"\b(?:speed|velocity)\b", text):
+        distance, duration, _ = match.groups()
+        return f"v={distance}/{duration}"
+    return None
@@ -1,4 +1,20 @@
-from .ocr import OCRProcessor
-from .preprocessing import Preprocessor
+# Lazy exports: importing _vision must not pull in cv2 / torch / pix2tex
+# until one of these names is actually used.
+_EXPORTS = {
+    "OCRProcessor": ".ocr",
+    "Preprocessor": ".preprocessing",
+    "OCRBatcher": ".batcher",
+    "get_model": ".registry",
+    "warm_up": ".registry",
+}
 
-__all__ = ["OCRProcessor", "Preprocessor"]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    return getattr(module, name)
@@ -0,0 +1,83 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class OCRBatcher:
+    """
+    Micro-batches concurrent OCR requests.
+    The first image in an empty queue opens a short window; everything that
+    arrives inside it (up to max_batch) goes through one batched forward pass.
+    """
+
+    def __init__(self, processor, window: float = 0.02, max_batch: int = 8):
+        self.processor = processor
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.images = 0
+
+    def submit(self, image) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((image, future))
+        return future
+
+    def image_to_latex(self, image, timeout: float = None) -> str:
+        return self.submit(image).result(timeout=timeout)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "images": self.images,
+            "pending": self._queue.qsize()
+        }
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="ocr-batcher", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            closes_at = time.monotonic() + self.window
+
+            while len(batch) < self.max_batch:
+                remaining = closes_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self.batches += 1
+            self.images += len(batch)
+            self._process(batch)
+
+    def _process(self, batch):
+        images = [image for image, _ in batch]
+
+        try:
+            results = self.processor.image_to_latex_batch(images)
+        except Exception:
+            results = None
+
+        if results is not None and len(results) == len(batch):
+            for (_, future), latex in zip(batch, results):
+                future.set_result(latex)
+            return
+
+        # Batched pass failed: retry one by one so a single bad image fails alone
+        for image, future in batch:
+            try:
+                future.set_result(self.processor.image_to_latex(image))
+            except Exception as e:
+                future.set_exception(e)
@@ -1,20 +1,135 @@
 import re
-from pix2tex.cli import LatexOCR
+import numpy as np
 from PIL import Image
 from .preprocessing import Preprocessor
+from . import registry
+from .phash import fingerprint
 
 class OCRProcessor:
-    def __init__(self, use_preprocessing=True):
+    def __init__(self, use_preprocessing=True, preprocess_tier="balanced", hash_index=None):
         self.use_preprocessing = use_preprocessing
-        self.model = LatexOCR()
+        self.preprocess_tier = preprocess_tier
+        # Optional PerceptualHashIndex: near-identical images skip preprocessing + OCR
+        self.hash_index = hash_index
+
+    @property
+    def model(self):
+        # Shared, lazily built LatexOCR (see _vision/registry.py)
+        return registry.get_model()
 
     def image_to_latex(self, image: Image.Image) -> str:
         if not isinstance(image, Image.Image):
             raise TypeError("Input must be PIL.Image")
 
+        # 🔎 Seen (almost) this image before?
+        key = None
+        if self.hash_index is not None:
+            key = fingerprint(image)
+            cached = self.hash_index.lookup(*key)
+            if cached is not None:
+                return cached
+
+        latex = self._forward(image)
+
+        if key is not None:
+            self.hash_index.add(key[0], latex, key[1])
+        return latex
+
+    def image_to_latex_batch(self, images: list[Image.Image]) -> list[str]:
+        """
+        Run several crops through the encoder/decoder in one forward pass.
+        Each crop is sized exactly as image_to_latex would size it; crops
+        that end up the same shape are decoded together.
+        """
+        if not all(isinstance(img, Image.Image) for img in images):
+            raise TypeError("Input must be a list of PIL.Image")
+
+        if len(images) == 1:
+            return [self.image_to_latex(images[0])]
+
+        # 🔎 Only images without a near-duplicate go through the model
+        results = [None] * len(images)
+        keys = [None] * len(images)
+        if self.hash_index is not None:
+            keys = [fingerprint(img) for img in images]
+            results = [self.hash_index.lookup(*key) for key in keys]
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        if not pending:
+            return results
+
+        if len(pending) == 1:
+            fresh = [self._forward(images[pending[0]])]
+        else:
+            fresh = self._forward_batch([images[i] for i in pending])
+
+        for i, latex in zip(pending, fresh):
+            results[i] = latex
+            if keys[i] is not None:
+                self.hash_index.add(keys[i][0], latex, keys[i][1])
+        return results
+
+    def _forward(self, image: Image.Image) -> str:
         # 🧹 Preprocessing
         if self.use_preprocessing:
-            image = Preprocessor.clean(image)
+            image = Preprocessor.clean(image, tier=self.preprocess_tier)
+
+        with registry.inference_lock:
+            return self.model(image).strip()
+
+    def _forward_batch(self, images: list[Image.Image]) -> list[str]:
+        # 🧹 Preprocessing
+        if self.use_preprocessing:
+            images = [Preprocessor.clean(img, tier=self.preprocess_tier) for img in images]
+
+        import torch
+        from pix2tex.utils import post_process, token2str
+
+        model = self.model
+        args = model.args
+
+        with registry.inference_lock, torch.no_grad():
+            inputs = [self._model_input(model, img) for img in images]
+
+        # Only inputs of the same shape share a pass: padding to a common canvas changes what the encoder sees
+        groups = {}
+        for i, tensor in enumerate(inputs):
+            groups.setdefault(tuple(tensor.shape), []).append(i)
+
+        results = [None] * len(images)
+        for indices in groups.values():
+            batch = torch.cat([inputs[i] for i in indices]).to(args.device)
+            with registry.inference_lock, torch.no_grad():
+                dec = model.model.generate(batch, temperature=args.get("temperature", .25))
+            for i, latex in zip(indices, token2str(dec, model.tokenizer)):
+                results[i] = post_process(latex).strip()
+        return results
+
+    @staticmethod
+    def _model_input(model, img: Image.Image):
+        """
+        The encoder input LatexOCR.__call__ builds for one image, resizer net
+        included, so a batched image is read exactly as a single one would be.
+        """
+        from pix2tex.cli import minmax_size
+        from pix2tex.utils import pad
+        from pix2tex.dataset.transforms import test_transform
+
+        args = model.args
+        img = minmax_size(pad(img), args.max_dimensions, args.min_dimensions)
+        if model.image_resizer is None or args.get("no_resize", False):
+            return test_transform(image=np.array(pad(img).convert("RGB")))["image"][:1].unsqueeze(0)
 
-        latex = self.model(image)
-        return latex.strip()
+        # Let the resizer pick the width the model reads best, as the single-image path does
+        source = img.convert("RGB").copy()
+        ratio, width, height = 1, source.size[0], source.size[1]
+        for _ in range(10):
+            height = int(height * ratio)
+            resample = Image.Resampling.BILINEAR if ratio > 1 else Image.Resampling.LANCZOS
+            img = pad(minmax_size(source.resize((width, height), resample), args.max_dimensions, args.min_dimensions))
+            tensor = test_transform(image=np.array(img.convert("RGB")))["image"][:1].unsqueeze(0)
+            width = (model.image_resizer(tensor.to(args.device)).argmax(-1).item() + 1) * 32
+            if width == img.size[0]:
+                break
+            ratio = width / img.size[0]
+        return tensor
@@ -0,0 +1,166 @@
+import base64
+import threading
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Ink-cropped grayscale thumbnail used to confirm a hash hit before its LaTeX is reused
+THUMB_SIZE = (64, 16)
+THUMB_TILE = 4
+
+
+def _ink_crop(image: Image.Image) -> Image.Image:
+    gray = image.convert("L")
+
+    # Formulas are small marks on a large page: hash the content, not the margins
+    ink = ImageOps.invert(gray).point(lambda p: 255 if p > 64 else 0)
+    bbox = ink.getbbox()
+    if bbox is not None:
+        gray = gray.crop(bbox)
+    return gray
+
+
+def dhash(image: Image.Image, size: int = 16) -> int:
+    """
+    Difference hash: crop to the ink, shrink to (size+1) x size grayscale and
+    record whether each pixel is brighter than its right neighbour.
+    Returns a size*size bit int. Robust to rescaling, recompression,
+    margins and small brightness changes.
+    """
+    small = _ink_crop(image).resize((size + 1, size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(small, dtype=np.float32)
+
+    # Row-major bits, first pixel most significant; packbits pads the tail to a whole byte
+    bits = (pixels[:, :-1] > pixels[:, 1:]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big") >> (-bits.size % 8)
+
+
+def thumbnail(image: Image.Image) -> bytes:
+    """The ink-cropped image as THUMB_SIZE grayscale bytes."""
+    return _ink_crop(image).resize(THUMB_SIZE, Image.Resampling.BOX).tobytes()
+
+
+def fingerprint(image: Image.Image) -> tuple:
+    """(dhash, thumbnail): what PerceptualHashIndex looks images up by."""
+    return dhash(image), thumbnail(image)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def thumbnail_distance(a: bytes, b: bytes) -> float:
+    """Mean absolute difference of the most different THUMB_TILE x THUMB_TILE tile (0-255)."""
+    width, height = THUMB_SIZE
+    diff = np.abs(
+        np.frombuffer(a, dtype=np.uint8).astype(np.int16) - np.frombuffer(b, dtype=np.uint8).astype(np.int16)
+    ).reshape(height // THUMB_TILE, THUMB_TILE, width // THUMB_TILE, THUMB_TILE)
+    return float(diff.mean(axis=(1, 3)).max())
+
+
+class PerceptualHashIndex:
+    """
+    Near-duplicate image → LaTeX index.
+
+    A hit needs a stored hash within `threshold` bits (out of 256 for the
+    default 16x16 dHash; 0 means the exact hash) and a thumbnail whose most
+    different tile stays within `max_tile_diff`. The hash only finds
+    candidates: a changed digit or sign moves a dHash by as little as 3-6
+    bits, but leaves one tile of the thumbnail clearly different.
+    Near lookups use multi-index hashing: the hash is split into threshold+1
+    chunks, and any hash within the threshold shares at least one chunk
+    exactly, so only those buckets are scanned.
+    Entries are mirrored to a DiskStore so the index survives restarts.
+    """
+
+    def __init__(self, threshold: int = 0, store=None, max_entries: int = 50000,
+                 max_tile_diff: float = 32.0, bits: int = 256):
+        self.threshold = threshold
+        self.store = store
+        self.max_entries = max_entries
+        self.max_tile_diff = max_tile_diff
+        # (shift, mask) of each chunk; none needed when only exact hashes match
+        bounds = [i * bits // (threshold + 1) for i in range(threshold + 2)] if threshold > 0 else [0]
+        self._spans = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(bounds, bounds[1:])]
+        self._entries = {}    # hash -> (latex, thumbnail bytes or None)
+        self._buckets = {}    # (chunk, chunk bits) -> set of hashes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+        if store is not None:
+            for key, value in store.items():
+                if isinstance(value, str):
+                    # Written before thumbnails were stored: only an exact hash can confirm it
+                    value = {"latex": value, "thumb": None}
+                thumb = base64.b64decode(value["thumb"]) if value["thumb"] else None
+                self._insert(int(key, 16), value["latex"], thumb)
+
+    def lookup(self, image_hash: int, thumb: bytes = None):
+        """Stored LaTeX of the closest confirmed match, or None."""
+        with self._lock:
+            candidates = {image_hash} if image_hash in self._entries else set()
+            for chunk in self._chunks(image_hash):
+                candidates |= self._buckets.get(chunk, set())
+
+            nearby = sorted(
+                (distance, known)
+                for known in candidates
+                if (distance := hamming(known, image_hash)) <= self.threshold
+            )
+            for distance, known in nearby:
+                latex, known_thumb = self._entries[known]
+                if thumb is None or known_thumb is None:
+                    confirmed = distance == 0
+                else:
+                    confirmed = thumbnail_distance(thumb, known_thumb) <= self.max_tile_diff
+                if confirmed:
+                    self.hits += 1
+                    return latex
+                self.rejected += 1
+
+            self.misses += 1
+        return None
+
+    def add(self, image_hash: int, latex: str, thumb: bytes = None):
+        with self._lock:
+            self._insert(image_hash, latex, thumb)
+
+        if self.store is not None:
+            self.store.put(f"{image_hash:x}", {
+                "latex": latex,
+                "thumb": base64.b64encode(thumb).decode() if thumb else None
+            })
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "size": len(self._entries),
+            "threshold": self.threshold
+        }
+
+    def _insert(self, image_hash: int, latex: str, thumb: bytes):
+        if image_hash in self._entries:
+            self._remove(image_hash)
+        elif len(self._entries) >= self.max_entries:
+            # Drop the oldest entry (dicts keep insertion order)
+            self._remove(next(iter(self._entries)))
+
+        self._entries[image_hash] = (latex, thumb)
+        for chunk in self._chunks(image_hash):
+            self._buckets.setdefault(chunk, set()).add(image_hash)
+
+    def _remove(self, image_hash: int):
+        del self._entries[image_hash]
+        for chunk in self._chunks(image_hash):
+            hashes = self._buckets.get(chunk)
+            if hashes is not None:
+                hashes.discard(image_hash)
+                if not hashes:
+                    del self._buckets[chunk]
+
+    def _chunks(self, image_hash: int) -> list:
+        return [(i, (image_hash >> shift) & mask) for i, (shift, mask) in enumerate(self._spans)]
@@ -1,11 +1,28 @@
 import cv2
 import numpy as np
-from PIL import Image, ImageEnhance
+from PIL import Image
 
 class Preprocessor:
 
+    # Largest input pix2tex reads (LatexOCR max_dimensions); anything bigger is shrunk again before the model
+    MODEL_INPUT = (672, 192)
+
+    # Quality tiers
+    # max_side : longest edge after downscaling. fast/balanced stop near MODEL_INPUT, with a
+    #            little headroom for the margins pix2tex crops; best, the fallback for hard
+    #            photos where the formula fills only part of the frame, keeps twice that
+    # denoise  : "never" | "auto" (only when the noise estimate is high) | "always"
+    TIERS = {
+        "fast": {"max_side": 672, "denoise": "never", "search_window": 0, "morphology": False},
+        "balanced": {"max_side": 800, "denoise": "auto", "search_window": 15, "morphology": True},
+        "best": {"max_side": 1344, "denoise": "always", "search_window": 21, "morphology": True},
+    }
+
+    # Noise sigma (0-255 scale) above which "auto" tiers run the denoiser
+    NOISE_THRESHOLD = 4.0
+
     @staticmethod
-    def clean(image: Image.Image) -> Image.Image:
+    def clean(image: Image.Image, tier: str = "best") -> Image.Image:
         """
         Best preprocessing for Math OCR (pix2tex)
         Returns PIL Image
@@ -14,27 +31,23 @@ class Preprocessor:
         if not isinstance(image, Image.Image):
             raise TypeError("Input must be PIL.Image")
 
-        # Convert PIL → OpenCV
-        img = np.array(image.convert("RGB"))
+        if tier not in Preprocessor.TIERS:
+            raise ValueError(f"Unknown preprocessing tier: {tier}")
+        settings = Preprocessor.TIERS[tier]
 
-        # Grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        # Grayscale straight from PIL → OpenCV (one conversion in, one out)
+        gray = np.asarray(image.convert("L"))
+
+        # Downscale before the expensive filters
+        gray = Preprocessor.resize(gray, settings["max_side"])
 
         # Denoise
-        gray = cv2.fastNlMeansDenoising(gray, None, 30, 7, 21)
+        if settings["denoise"] == "always" or (
+            settings["denoise"] == "auto"
+            and Preprocessor.estimate_noise(gray) > Preprocessor.NOISE_THRESHOLD
+        ):
+            gray = cv2.fastNlMeansDenoising(gray, None, 30, 7, settings["search_window"])
 
-<<<<<<< HEAD
-    @staticmethod
-    def preprocess(img: Union[str, np.ndarray, Image.Image]) -> np.ndarray:
-        """Full preprocessing pipeline: read → grayscale → enhance → denoise → threshold."""
-        img = Preprocessor.read_image(img)
-        img = Preprocessor.enhance_contrast(img)
-        img = Preprocessor.to_grayscale(img)
-        img = Preprocessor.denoise(img)
-        img = Preprocessor.threshold(img)
-        return img
-
-=======
         # Adaptive Threshold
         thresh = cv2.adaptiveThreshold(
             gray,
@@ -46,15 +59,33 @@ class Preprocessor:
         )
 
         # Morphological cleaning
-        kernel = np.ones((2, 2), np.uint8)
-        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+        if settings["morphology"]:
+            kernel = np.ones((2, 2), np.uint8)
+            thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+
+        # The thresholded image is already pure black/white, so the old
+        # PIL contrast pass (factor 2.0) left it unchanged and is skipped
+        return Image.fromarray(thresh)
 
-        # Convert back to PIL
-        pil_img = Image.fromarray(cleaned)
+    @staticmethod
+    def resize(gray: np.ndarray, max_side: int) -> np.ndarray:
+        h, w = gray.shape[:2]
+        scale = max_side / max(h, w)
+        if scale >= 1:
+            return gray
+        return cv2.resize(gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def estimate_noise(gray: np.ndarray) -> float:
+        """
+        Fast noise sigma estimate (Immerkaer, 1996): one 3x3 convolution
+        that cancels image structure and leaves mostly noise.
+        """
+        h, w = gray.shape[:2]
+        if h < 3 or w < 3:
+            return 0.0
 
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(pil_img)
-        pil_img = enhancer.enhance(2.0)
+        kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+        response = cv2.filter2D(gray.astype(np.float32), -1, kernel)[1:-1, 1:-1]
 
-        return pil_img
->>>>>>> d650762247c0519fda0bd6231f11f821ed3c6595
+        return float(np.sqrt(np.pi / 2) * np.abs(response).sum() / (6 * (w - 2) * (h - 2)))
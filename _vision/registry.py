@@ -0,0 +1,35 @@
+import threading
+from PIL import Image, ImageDraw
+
+# One LatexOCR per process: building it loads the encoder/decoder weights
+_model = None
+_model_lock = threading.Lock()
+
+# The transformer is not safe to run from several threads at once
+inference_lock = threading.Lock()
+
+
+def get_model():
+    """Return the process-wide LatexOCR model, building it on first use."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from pix2tex.cli import LatexOCR
+                _model = LatexOCR()
+    return _model
+
+
+def warm_up():
+    """Build the model and push one tiny image through it so the first real request is fast."""
+    model = get_model()
+
+    img = Image.new("RGB", (96, 48), "white")
+    ImageDraw.Draw(img).text((10, 15), "x+1", fill="black")
+
+    try:
+        with inference_lock:
+            model(img)
+    except Exception:
+        # Warm-up is best effort; a real request will surface real errors
+        pass
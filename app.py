@@ -1,9 +1,13 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, g
 from PIL import Image
+import json
 import os
+import threading
 
 # ✅ Import Pipeline
 from _core.pipeline import Pipeline
+from _app import config
+from _core.tracing import new_request_id
 
 # ✅ Flask configuration
 app = Flask(
@@ -12,8 +16,74 @@ app = Flask(
     static_folder="_frontend/static"
 )
 
-# ✅ Initialize pipeline once
-pipeline = Pipeline()
+# ✅ One pipeline per server process, built by get_pipeline() and never on import:
+# solver pool workers are spawned, and spawn re-imports the main module (this file) in each of them
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> Pipeline:
+    """
+    The process's Pipeline, built and warmed up on the first call: at server
+    start when run directly, on the first request under a WSGI server.
+    Components are still built lazily, see PRELOAD_COMPONENTS.
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                pipeline = Pipeline()
+                pipeline.warm_up(*config.PRELOAD_COMPONENTS)
+
+                if config.OCR_WARMUP:
+                    from _vision.registry import warm_up
+                    warm_up()
+                _pipeline = pipeline
+    return _pipeline
+
+
+def take_trace(result: dict) -> dict:
+    """Move the pipeline trace off the JSON body and into the response headers."""
+    g.trace = result.pop("trace", None)
+    return result
+
+
+def solution_payload(result: dict) -> dict:
+    """Public fields of a solved problem."""
+    return {
+        "expression": result.get("expression", ""),
+        "final_answer": result.get("final_answer", ""),
+        "steps": result.get("steps", []),
+        "explanation": result.get("explanation", ""),
+        "problem_type": result.get("problem_type", ""),
+        "session_id": result.get("session_id", ""),
+        "warning": result.get("warning", "")
+    }
+
+
+# --------------------------------------------------
+# 🏷 REQUEST IDS + TIMING HEADERS
+# --------------------------------------------------
+@app.before_request
+def assign_request_id():
+    # Honour an upstream id (load balancer, client) so logs line up end to end
+    g.request_id = request.headers.get("X-Request-ID", "")[:64] or new_request_id()
+
+
+def server_timing(trace: dict) -> str:
+    return ", ".join(
+        [f"{stage};dur={ms}" for stage, ms in trace["stages_ms"].items()]
+        + [f"total;dur={trace['total_ms']}"]
+    )
+
+
+@app.after_request
+def tag_response(response):
+    response.headers["X-Request-ID"] = g.request_id
+    trace = g.get("trace")
+    if trace:
+        response.headers["Server-Timing"] = server_timing(trace)
+    return response
 
 
 # --------------------------------------------------
@@ -35,18 +105,12 @@ def upload_ocr():
 
     try:
         img = Image.open(file)
-        result = pipeline.solve_and_explain(img)
+        result = take_trace(get_pipeline().solve_and_explain(img, request_id=g.request_id))
 
         if result.get("error"):
             return jsonify(result)
 
-        return jsonify({
-            "expression": result.get("expression", ""),
-            "final_answer": result.get("final_answer", ""),
-            "steps": result.get("steps", []),
-            "explanation": result.get("explanation", ""),
-            "problem_type": result.get("problem_type", "")
-        })
+        return jsonify(solution_payload(result))
 
     except Exception as e:
         return jsonify({
@@ -58,52 +122,139 @@ def upload_ocr():
 # --------------------------------------------------
 # 🧮 TEXT / STATEMENT INPUT
 # --------------------------------------------------
-@app.route("/solve_math", methods=["POST"])
-def solve_math():
-    user_input = request.form.get("math_input")
+async def solve_math_body(form, request_id: str) -> dict:
+    """
+    JSON body of /solve_math, shared by the Flask view and asgi.py.
+    Statement parsing and the explanation go through ainvoke, SymPy through the CPU executor.
+    """
+    user_input = form.get("math_input")
 
     if not user_input:
-        return jsonify({"error": "No input provided"})
+        return {"error": "No input provided"}
 
-    result = pipeline.solve_and_explain(user_input)
+    result = await get_pipeline().asolve_and_explain(user_input, request_id=request_id)
 
     if result.get("error"):
-        return jsonify(result)
+        return result
+
+    return {**solution_payload(result), "trace": result.get("trace")}
+
+
+@app.route("/solve_math", methods=["POST"])
+async def solve_math():
+    # Under a WSGI server each request thread runs its own event loop: this view
+    # only awaits inside one request. Serve asgi.py for many requests on one loop
+    return jsonify(take_trace(await solve_math_body(request.form, g.request_id)))
+
+
+# --------------------------------------------------
+# 📚 WORKSHEET / BATCH INPUT
+# --------------------------------------------------
+@app.route("/solve_batch", methods=["POST"])
+def solve_batch():
+    # JSON body {"inputs": [...]} or a form field with one problem per line
+    payload = request.get_json(silent=True) or {}
+    inputs = payload.get("inputs")
+    if inputs is None:
+        raw = request.form.get("math_inputs", "")
+        inputs = [line for line in raw.splitlines() if line.strip()]
+
+    if not inputs or not isinstance(inputs, list):
+        return jsonify({"error": "No input provided"})
+
+    if len(inputs) > config.BATCH_MAX_ITEMS:
+        return jsonify({
+            "error": "Batch too large",
+            "message": f"Send at most {config.BATCH_MAX_ITEMS} problems per batch."
+        })
+
+    results = get_pipeline().solve_many(inputs, request_id=g.request_id)
 
     return jsonify({
-        "expression": result.get("expression", ""),
-        "final_answer": result.get("final_answer", ""),
-        "steps": result.get("steps", []),
-        "explanation": result.get("explanation", ""),
-        "problem_type": result.get("problem_type", "")
+        "results": [
+            r if r.get("error") else solution_payload(r)
+            for r in results
+        ]
     })
 
 
+# --------------------------------------------------
+# 📡 STREAMING TEXT / STATEMENT INPUT (SSE)
+# --------------------------------------------------
+@app.route("/solve_math_stream", methods=["POST"])
+def solve_math_stream():
+    user_input = request.form.get("math_input")
+
+    if not user_input:
+        return jsonify({"error": "No input provided"})
+
+    request_id = g.request_id
+
+    def events():
+        try:
+            for event, data in get_pipeline().solve_and_stream(user_input, request_id=request_id):
+                if event == "result":
+                    data = {
+                        "expression": data.get("expression", ""),
+                        "final_answer": data.get("final_answer", ""),
+                        "steps": data.get("steps", []),
+                        "problem_type": data.get("problem_type", ""),
+                        "session_id": data.get("session_id", ""),
+                        "warning": data.get("warning", "")
+                    }
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            error = {"error": "Solver failed", "message": str(e)}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # --------------------------------------------------
 # ❓ STEP-BASED DOUBTS
 # --------------------------------------------------
-@app.route("/ask_doubt", methods=["POST"])
-def ask_doubt():
+async def ask_doubt_body(form, request_id: str) -> dict:
+    """JSON body of /ask_doubt, shared by the Flask view and asgi.py."""
     try:
-        step_number = int(request.form.get("step_number", -1))
-        question = request.form.get("question", "").strip()
+        session_id = form.get("session_id", "").strip()
+        step_number = int(form.get("step_number", -1))
+        question = form.get("question", "").strip()
 
         if not question:
-            return jsonify({"error": "Please ask a valid question"})
+            return {"error": "Please ask a valid question"}
 
-        answer = pipeline.answer_doubt(step_number, question)
+        if not session_id:
+            return {"error": "Please solve a problem before asking a doubt"}
 
-        return jsonify({"answer": answer})
+        return await get_pipeline().aanswer_doubt(session_id, step_number, question, request_id=request_id)
 
     except Exception as e:
-        return jsonify({
+        return {
             "error": "Doubt handling failed",
             "message": str(e)
-        })
+        }
+
+
+@app.route("/ask_doubt", methods=["POST"])
+async def ask_doubt():
+    return jsonify(take_trace(await ask_doubt_body(request.form, g.request_id)))
+
+
+# --------------------------------------------------
+# 📈 METRICS (Prometheus text format)
+# --------------------------------------------------
+@app.route("/metrics")
+def metrics():
+    return Response(get_pipeline().metrics_text(), mimetype="text/plain; version=0.0.4")
 
 
 # --------------------------------------------------
 # 🚀 RUN
 # --------------------------------------------------
 if __name__ == "__main__":
+    get_pipeline()
     app.run(debug=True, port=5000)
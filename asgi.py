@@ -0,0 +1,88 @@
+"""
+ASGI entry point: many requests in flight on one event loop.
+
+    uvicorn asgi:application --workers 1
+
+Flask's async views (app.py) run one event loop per request thread under a
+WSGI server, so a request only overlaps its own LLM calls. Here /solve_math
+and /ask_doubt are served natively on the server's loop: while one request
+waits on the LLM the loop serves the others, with SymPy and OCR in the
+pipeline's CPU executor. Every other route is passed to the Flask app
+unchanged (asgiref runs it in a thread).
+"""
+import asyncio
+import io
+import json
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.wrappers import Request
+
+from app import app, ask_doubt_body, get_pipeline, server_timing, solve_math_body
+from _core.tracing import new_request_id
+
+# Routes served on the event loop: path -> coroutine(form, request_id) -> JSON body
+ASYNC_ROUTES = {
+    "/solve_math": solve_math_body,
+    "/ask_doubt": ask_doubt_body,
+}
+
+_flask = WsgiToAsgi(app)
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+    elif scope["type"] == "http" and scope["method"] == "POST" and scope["path"] in ASYNC_ROUTES:
+        await _serve(ASYNC_ROUTES[scope["path"]], scope, receive, send)
+    else:
+        await _flask(scope, receive, send)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            # Build and warm the pipeline before the first request, off the loop
+            await asyncio.get_running_loop().run_in_executor(None, get_pipeline)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _serve(handler, scope, receive, send):
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+
+    headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+    # Honour an upstream id (load balancer, client) so logs line up end to end
+    request_id = headers.get("x-request-id", "")[:64] or new_request_id()
+
+    result = await handler(_form(headers, bytes(body)), request_id)
+    trace = result.pop("trace", None)
+
+    response_headers = [
+        (b"content-type", b"application/json"),
+        (b"x-request-id", request_id.encode("latin-1")),
+    ]
+    if trace:
+        response_headers.append((b"server-timing", server_timing(trace).encode("latin-1")))
+
+    await send({"type": "http.response.start", "status": 200, "headers": response_headers})
+    await send({"type": "http.response.body", "body": json.dumps(result).encode("utf-8")})
+
+
+def _form(headers: dict, body: bytes):
+    """Form fields of a urlencoded or multipart body, parsed by Werkzeug as Flask would."""
+    return Request({
+        "REQUEST_METHOD": "POST",
+        "CONTENT_TYPE": headers.get("content-type", ""),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+    }).form
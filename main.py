@@ -6,7 +6,13 @@ st.set_page_config(page_title="📐 AI Math Tutor")
 
 st.title("📐 AI Math Tutor")
 
-pipeline = Pipeline()
+@st.cache_resource
+def get_pipeline():
+    # Streamlit reruns this script on every interaction; build the pipeline once
+    return Pipeline()
+
+
+pipeline = get_pipeline()
 
 uploaded = st.file_uploader(
     "Upload math image",
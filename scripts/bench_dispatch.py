@@ -0,0 +1,94 @@
+"""
+Compare per-request solver cost between a git revision and the working tree.
+
+Usage:
+    python scripts/bench_dispatch.py [--ref HEAD~1] [--repeat 20] [--corpus data/examples]
+
+A request costs what the pipeline does with the solver: canonical_key()
+for the result cache, then solve(). Both solvers run the same corpus with
+the SymPy cache cleared before every request, and the report shows the
+per-category median for each side plus the reduction.
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sympy.core.cache import clear_cache
+
+import _math_engine
+from _math_engine.solver import MathSolver
+from bench_solver import load_corpus, percentile
+
+
+def load_ref_solver(ref: str):
+    """Import _math_engine/solver.py as it was at `ref` (relative imports resolve to this tree)."""
+    source = subprocess.run(
+        ["git", "show", f"{ref}:_math_engine/solver.py"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+    spec = importlib.util.spec_from_loader("_math_engine._ref_solver", loader=None)
+    module = importlib.util.module_from_spec(spec)
+    module.__package__ = _math_engine.__name__
+    exec(compile(source, f"{ref}:_math_engine/solver.py", "exec"), module.__dict__)
+    return module.MathSolver()
+
+
+def time_requests(solver, corpus: list[dict], repeat: int) -> dict:
+    by_category = {}
+    for item in corpus:
+        samples = by_category.setdefault(item["category"], [])
+        for _ in range(repeat):
+            clear_cache()
+            if hasattr(solver, "clear_cache"):
+                solver.clear_cache()
+
+            start = time.perf_counter()
+            solver.canonical_key(item["input"])
+            solver.solve(item["input"])
+            samples.append((time.perf_counter() - start) * 1000)
+    return by_category
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ref", default="HEAD~1", help="git revision to compare against")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "data", "examples"))
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    before, after = load_ref_solver(args.ref), MathSolver()
+
+    # Untimed pass: lazy SymPy imports land here, not in the first category
+    for item in corpus:
+        before.solve(item["input"])
+        after.solve(item["input"])
+
+    old = time_requests(before, corpus, args.repeat)
+    new = time_requests(after, corpus, args.repeat)
+
+    print(f"{len(corpus)} problems x {args.repeat} requests, {args.ref} vs working tree\n")
+    header = f"{'category':<22}{'before p50':>12}{'after p50':>12}{'change':>9}"
+    print(header)
+    print("-" * len(header))
+
+    total_old = total_new = 0.0
+    for category in old:
+        a, b = percentile(old[category], 50), percentile(new[category], 50)
+        total_old += sum(old[category])
+        total_new += sum(new[category])
+        print(f"{category:<22}{a:>10.2f}ms{b:>10.2f}ms{(b - a) / a * 100:>8.0f}%")
+
+    print("-" * len(header))
+    print(f"{'total time':<22}{total_old:>10.0f}ms{total_new:>10.0f}ms{(total_new - total_old) / total_old * 100:>8.0f}%")
+
+
+if __name__ == "__main__":
+    main()
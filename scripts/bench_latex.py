@@ -0,0 +1,148 @@
+"""
+Benchmark LaTeX -> SymPy conversion on OCR output.
+
+Usage:
+    python scripts/bench_latex.py [--corpus data/latex_ocr] [--repeat 200]
+
+The corpus is JSON lines: {"id", "category", "latex", "expected"} where
+"latex" is pix2tex output and "expected" the SymPy expression it means
+(null for LaTeX the fast parser must refuse rather than misread). For each
+category it reports the hand-written parser's p50/p95 and accuracy, the
+same numbers for the ANTLR parse_latex path when the antlr4 runtime is
+installed, and finally the cost of a memoized LatexToSympyConverter call.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import sympy as sp
+
+from _math_engine.latex_parser import LatexParseError, parse_latex_fast
+from _math_engine.latex_to_sympy import LatexToSympyConverter
+
+
+def load_corpus(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_antlr():
+    """(parse_latex, import seconds), or (None, reason) without the antlr4 runtime."""
+    start = time.perf_counter()
+    try:
+        from sympy.parsing.latex import parse_latex
+        parse_latex("x")
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return parse_latex, time.perf_counter() - start
+
+
+def correct(parsed, expected) -> bool:
+    if expected is None:
+        # Outside the subset: refusing is the right answer
+        return parsed is None
+    if parsed is None:
+        return False
+    expected = sp.sympify(expected)
+    if parsed == expected:
+        return True
+    # Same meaning, different shape (ANTLR keeps x/2 + x/3 unevaluated, for instance)
+    if isinstance(parsed, sp.Eq) and isinstance(expected, sp.Eq):
+        return sp.simplify(parsed.lhs - parsed.rhs - expected.lhs + expected.rhs) == 0
+    try:
+        return sp.simplify(parsed - expected) == 0
+    except TypeError:
+        return False
+
+
+def run(parse, corpus: list[dict], repeat: int, refusals: tuple) -> dict:
+    by_category = {}
+    for item in corpus:
+        stats = by_category.setdefault(item["category"], {"us": [], "correct": 0, "total": 0, "wrong": []})
+        cleaned = LatexToSympyConverter.clean_latex(item["latex"])
+
+        parsed = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                parsed = parse(cleaned)
+            except refusals:
+                parsed = None
+            stats["us"].append((time.perf_counter() - start) * 1e6)
+
+        stats["total"] += 1
+        if correct(parsed, item["expected"]):
+            stats["correct"] += 1
+        else:
+            stats["wrong"].append(item["id"])
+    return by_category
+
+
+def report(title: str, by_category: dict):
+    print(f"\n{title}")
+    header = f"{'category':<22}{'n':>4}{'p50':>11}{'p95':>11}{'acc':>7}"
+    print(header)
+    print("-" * len(header))
+    for category, s in by_category.items():
+        print(
+            f"{category:<22}{s['total']:>4}"
+            f"{percentile(s['us'], 50):>9.1f}us{percentile(s['us'], 95):>9.1f}us"
+            f"{s['correct'] / s['total']:>7.2f}"
+        )
+        if s["wrong"]:
+            print(f"{'':<26}wrong: {', '.join(s['wrong'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "data", "latex_ocr"))
+    parser.add_argument("--repeat", type=int, default=200, help="timed parses per item")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        sys.exit(f"No items in {args.corpus}")
+
+    print(f"{len(corpus)} OCR outputs x {args.repeat} runs")
+    report("Fast path (latex_parser)", run(parse_latex_fast, corpus, args.repeat, (LatexParseError,)))
+
+    parse_latex, loaded = load_antlr()
+    if parse_latex is None:
+        print(f"\nANTLR path skipped: {loaded}")
+    else:
+        print(f"\nANTLR import + first parse: {loaded * 1000:.0f} ms")
+        report("ANTLR fallback (parse_latex)", run(parse_latex, corpus, args.repeat, (Exception,)))
+
+    # Memo: the second conversion of the same LaTeX is a dictionary lookup
+    LatexToSympyConverter.clear_memo()
+    converted = []
+    for item in corpus:
+        try:
+            LatexToSympyConverter.to_sympy(item["latex"])
+            converted.append(item["latex"])
+        except Exception:
+            # Failed conversions are not memoized
+            pass
+    hits = []
+    for _ in range(args.repeat):
+        for latex in converted:
+            start = time.perf_counter()
+            LatexToSympyConverter.to_sympy(latex)
+            hits.append((time.perf_counter() - start) * 1e6)
+    print(f"\nMemoized to_sympy: p50 {percentile(hits, 50):.1f}us, p95 {percentile(hits, 95):.1f}us")
+    print(f"Converter stats: {LatexToSympyConverter.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Compare Preprocessor tiers on OCR accuracy and latency.
+
+Usage:
+    python scripts/bench_preprocessing.py path/to/dataset [--tiers fast balanced best] [--no-ocr]
+
+The dataset folder holds images (png/jpg/jpeg) next to a ground-truth
+.tex file with the same name, e.g. quad_01.png + quad_01.tex.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from _vision.preprocessing import Preprocessor
+
+
+def load_dataset(folder: str) -> list[tuple]:
+    samples = []
+    for name in sorted(os.listdir(folder)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in (".png", ".jpg", ".jpeg"):
+            continue
+        truth_path = os.path.join(folder, stem + ".tex")
+        truth = None
+        if os.path.exists(truth_path):
+            with open(truth_path, encoding="utf-8") as f:
+                truth = f.read().strip()
+        samples.append((name, Image.open(os.path.join(folder, name)).convert("RGB"), truth))
+    return samples
+
+
+def normalize(latex: str) -> str:
+    return "".join(latex.split())
+
+
+def edit_distance(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_tier(tier: str, samples: list[tuple], model) -> dict:
+    pre_ms, ocr_ms, exact, distances = [], [], 0, []
+
+    for _, image, truth in samples:
+        start = time.perf_counter()
+        cleaned = Preprocessor.clean(image, tier=tier)
+        pre_ms.append((time.perf_counter() - start) * 1000)
+
+        if model is None:
+            continue
+
+        start = time.perf_counter()
+        latex = model(cleaned).strip()
+        ocr_ms.append((time.perf_counter() - start) * 1000)
+
+        if truth is not None:
+            a, b = normalize(latex), normalize(truth)
+            exact += a == b
+            distances.append(edit_distance(a, b) / max(len(b), 1))
+
+    report = {
+        "tier": tier,
+        "pre_p50": percentile(pre_ms, 50),
+        "pre_p95": percentile(pre_ms, 95),
+    }
+    if ocr_ms:
+        report["ocr_p50"] = percentile(ocr_ms, 50)
+        report["ocr_p95"] = percentile(ocr_ms, 95)
+    if distances:
+        report["exact"] = exact / len(distances)
+        report["cer"] = statistics.mean(distances)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset")
+    parser.add_argument("--tiers", nargs="+", default=list(Preprocessor.TIERS))
+    parser.add_argument("--no-ocr", action="store_true", help="only time preprocessing")
+    args = parser.parse_args()
+
+    samples = load_dataset(args.dataset)
+    if not samples:
+        sys.exit(f"No images found in {args.dataset}")
+
+    model = None
+    if not args.no_ocr:
+        from _vision.registry import get_model, warm_up
+        warm_up()
+        model = get_model()
+
+    print(f"{len(samples)} images\n")
+    header = f"{'tier':<10}{'pre p50':>10}{'pre p95':>10}{'ocr p50':>10}{'ocr p95':>10}{'exact':>8}{'CER':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for tier in args.tiers:
+        r = run_tier(tier, samples, model)
+        print(
+            f"{r['tier']:<10}"
+            f"{r['pre_p50']:>9.1f}ms{r['pre_p95']:>8.1f}ms"
+            + (f"{r['ocr_p50']:>8.1f}ms{r['ocr_p95']:>8.1f}ms" if "ocr_p50" in r else f"{'-':>10}{'-':>10}")
+            + (f"{r['exact']:>8.2f}{r['cer']:>8.3f}" if "exact" in r else f"{'-':>8}{'-':>8}")
+        )
+
+
+if __name__ == "__main__":
+    main()
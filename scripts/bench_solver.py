@@ -0,0 +1,303 @@
+"""
+Benchmark MathSolver on the curated corpus and catch regressions.
+
+Usage:
+    python scripts/bench_solver.py [--corpus data/examples] [--repeat 20]
+                                   [--baseline data/solver_baseline.json] [--save-baseline]
+                                   [--tolerance 0.4] [--case-tolerance 0.5] [--strict]
+
+The corpus is JSON lines: {"id", "category", "input", "expected"}, one
+category per MathSolver dispatch branch. Every problem is solved `repeat`
+times with the SymPy cache cleared before each run, so numbers reflect a
+problem the process has not seen before. Peak memory comes from a separate
+tracemalloc pass (tracing slows everything down).
+
+Raw milliseconds only hold on the machine that measured them, so every
+timing is also stored in calibration units: divided by the time of a fixed
+SymPy workload (calibrate()) measured right before that problem, which also
+cancels out load that comes and goes during the run. The committed baseline (data/solver_baseline.json) holds those
+units per category and, per problem, its p50 and answer. Against it the
+script exits non-zero when accuracy dropped, a problem's answer changed or
+a category's p50 is slower than baseline * (1 + tolerance). A category's
+p95 over that limit and a single problem's p50 over baseline *
+(1 + case_tolerance) are too noisy to compare across machines: they are
+printed as warnings, and only fail the run with --strict.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import sympy as sp
+from sympy.core.cache import clear_cache
+
+from _math_engine.solver import MathSolver
+
+# Differences below this are timer noise, whatever the tolerance says
+MIN_SLOWDOWN_MS = 0.5
+CALIBRATION_ROUNDS = 3
+
+
+def load_corpus(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def same_value(a, b) -> bool:
+    # Systems answer with {unknown: value} dicts
+    if isinstance(a, dict) or isinstance(b, dict):
+        return isinstance(a, dict) and isinstance(b, dict) and a.keys() == b.keys() and \
+            all(same_value(a[k], b[k]) for k in a)
+    if sp.simplify(a - b) == 0:
+        return True
+    # Numeric roots only agree up to their printed precision
+    try:
+        return abs(complex(sp.N(a - b))) < 1e-9
+    except TypeError:
+        return False
+
+
+def answers_match(got: str, expected: str) -> bool:
+    """Symbolic comparison: term order, root order and form do not matter."""
+    if got is None:
+        return False
+    if got.strip() == expected.strip():
+        return True
+
+    try:
+        a = sp.sympify(got.replace("+ C", ""))
+        b = sp.sympify(expected.replace("+ C", ""))
+        if isinstance(a, (list, tuple)) or isinstance(b, (list, tuple)):
+            a, b = list(a), list(b)
+            if len(a) != len(b):
+                return False
+            return all(any(same_value(x, y) for y in b) for x in a)
+        return same_value(a, b)
+    except Exception:
+        return False
+
+
+def calibrate(rounds: int = CALIBRATION_ROUNDS) -> float:
+    """Fastest ms of a fixed cold SymPy workload (expand, factor, solve): this machine's time unit right now."""
+    x, y = sp.symbols("x y")
+    ms = []
+    for _ in range(rounds):
+        clear_cache()
+        start = time.perf_counter()
+        sp.expand((x + y + 1) ** 10)
+        sp.factor(x ** 6 - 1)
+        sp.solve(x ** 2 + 3 * x - 7, x)
+        ms.append((time.perf_counter() - start) * 1000)
+    return min(ms)
+
+
+def run_corpus(solver: MathSolver, corpus: list[dict], repeat: int, keep_cache: bool) -> tuple:
+    """(stats per category, timings and answer per problem id)."""
+    by_category = {}
+    cases = {}
+
+    for item in corpus:
+        stats = by_category.setdefault(
+            item["category"], {"ms": [], "units": [], "correct": 0, "total": 0, "wrong": []}
+        )
+
+        unit = calibrate()
+        result = None
+        ms = []
+        for _ in range(repeat):
+            if not keep_cache:
+                clear_cache()
+                solver.clear_cache()
+            start = time.perf_counter()
+            result = solver.solve(item["input"])
+            ms.append((time.perf_counter() - start) * 1000)
+
+        units = [m / unit for m in ms]
+        stats["ms"] += ms
+        stats["units"] += units
+        stats["total"] += 1
+        if answers_match(result.get("final_answer"), item["expected"]):
+            stats["correct"] += 1
+        else:
+            stats["wrong"].append(item["id"])
+        cases[item["id"]] = {
+            "category": item["category"], "ms": ms, "units": units, "unit_ms": unit,
+            "answer": result.get("final_answer")
+        }
+
+    return by_category, cases
+
+
+def peak_memory(solver: MathSolver, corpus: list[dict]) -> dict:
+    """Peak traced KiB per category (max over its problems, one cold solve each)."""
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for item in corpus:
+            clear_cache()
+            solver.clear_cache()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            solver.solve(item["input"])
+            peak = (tracemalloc.get_traced_memory()[1] - base) / 1024
+            peaks[item["category"]] = max(peaks.get(item["category"], 0.0), peak)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def summarize(by_category: dict, cases: dict, peaks: dict) -> dict:
+    """Timings in ms (this machine) and in calibration units (`*_units`, what the baseline compares)."""
+    report = {
+        "calibration_ms": statistics.median(case["unit_ms"] for case in cases.values()),
+        "categories": {},
+        "cases": {}
+    }
+    for category, stats in by_category.items():
+        report["categories"][category] = {
+            "problems": stats["total"],
+            "p50_ms": percentile(stats["ms"], 50),
+            "p95_ms": percentile(stats["ms"], 95),
+            "p99_ms": percentile(stats["ms"], 99),
+            "mean_ms": statistics.mean(stats["ms"]),
+            "p50_units": percentile(stats["units"], 50),
+            "p95_units": percentile(stats["units"], 95),
+            "peak_kib": peaks.get(category, 0.0),
+            "accuracy": stats["correct"] / stats["total"],
+            "wrong": stats["wrong"],
+        }
+    for case_id, case in cases.items():
+        report["cases"][case_id] = {
+            "category": case["category"],
+            "p50_ms": percentile(case["ms"], 50),
+            "p50_units": percentile(case["units"], 50),
+            "answer": case["answer"],
+        }
+    return report
+
+
+def slower(now: float, before: float, tolerance: float, noise: float):
+    """The limit `now` broke, or None when it is within tolerance (and the noise floor)."""
+    limit = max(before * (1 + tolerance), before + noise)
+    return limit if now > limit else None
+
+
+def compare(report: dict, baseline: dict, tolerance: float, case_tolerance: float) -> tuple:
+    """(failures, warnings) of this run against the baseline."""
+    failures, warnings = [], []
+    noise = MIN_SLOWDOWN_MS / report["calibration_ms"]
+    for category, now in report["categories"].items():
+        before = baseline["categories"].get(category)
+        if before is None:
+            continue
+
+        for metric, found in (("p50_units", failures), ("p95_units", warnings)):
+            limit = slower(now[metric], before[metric], tolerance, noise)
+            if limit is not None:
+                found.append(
+                    f"{category}: {metric} {now[metric]:.2f} > {limit:.2f} (baseline {before[metric]:.2f})"
+                )
+
+        if now["accuracy"] < before["accuracy"]:
+            failures.append(
+                f"{category}: accuracy {now['accuracy']:.2f} < baseline {before['accuracy']:.2f} "
+                f"(wrong: {', '.join(now['wrong'])})"
+            )
+
+    for case_id, now in report["cases"].items():
+        before = baseline["cases"].get(case_id)
+        if before is None:
+            continue
+
+        limit = slower(now["p50_units"], before["p50_units"], case_tolerance, noise)
+        if limit is not None:
+            warnings.append(
+                f"{case_id}: p50_units {now['p50_units']:.2f} > {limit:.2f} (baseline {before['p50_units']:.2f})"
+            )
+        if before["answer"] is not None and not answers_match(now["answer"], before["answer"]):
+            failures.append(f"{case_id}: answer {now['answer']!r} != baseline {before['answer']!r}")
+    return failures, warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "data", "examples"))
+    parser.add_argument("--repeat", type=int, default=20, help="timed solves per problem")
+    parser.add_argument("--category", nargs="+", help="only run these categories")
+    parser.add_argument("--keep-sympy-cache", action="store_true", help="measure warm (cached) solves")
+    parser.add_argument("--baseline", default=os.path.join(ROOT, "data", "solver_baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.4, help="allowed slowdown ratio per category")
+    # A single problem's p50 is noisier than a category's
+    parser.add_argument("--case-tolerance", type=float, default=0.5, help="allowed slowdown ratio per problem")
+    parser.add_argument("--strict", action="store_true", help="fail on p95 and per-problem slowdowns too")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if args.category:
+        corpus = [item for item in corpus if item["category"] in args.category]
+    if not corpus:
+        sys.exit(f"No problems in {args.corpus}")
+
+    solver = MathSolver()
+    # One untimed pass so imports and lazy SymPy setup do not land in the first category
+    for item in corpus:
+        solver.solve(item["input"])
+
+    by_category, cases = run_corpus(solver, corpus, args.repeat, args.keep_sympy_cache)
+    report = summarize(by_category, cases, peak_memory(solver, corpus))
+
+    print(f"{len(corpus)} problems x {args.repeat} runs, calibration unit {report['calibration_ms']:.2f}ms\n")
+    header = f"{'category':<22}{'n':>4}{'p50':>10}{'p95':>10}{'p99':>10}{'peak':>11}{'acc':>7}"
+    print(header)
+    print("-" * len(header))
+    for category, r in report["categories"].items():
+        print(
+            f"{category:<22}{r['problems']:>4}"
+            f"{r['p50_ms']:>8.2f}ms{r['p95_ms']:>8.2f}ms{r['p99_ms']:>8.2f}ms"
+            f"{r['peak_kib']:>7.0f} KiB{r['accuracy']:>7.2f}"
+        )
+        if r["wrong"]:
+            print(f"{'':<26}wrong: {', '.join(r['wrong'])}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline} (run with --save-baseline to create one)")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        failures, warnings = compare(report, json.load(f), args.tolerance, args.case_tolerance)
+    if args.strict:
+        failures, warnings = failures + warnings, []
+
+    if warnings:
+        print("\n⚠️ Slower than baseline (noisy metrics, not failing the run):")
+        for warning in warnings:
+            print(f"  {warning}")
+    if failures:
+        print("\n❌ Regressions against baseline:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Break down cold-start cost: per-module import time and per-component init time.
+
+Usage:
+    python scripts/startup_report.py [--with-llm] [--with-ocr] [--budget 1.0]
+
+Every import is measured in a fresh interpreter, so a number is the full
+cost of that module including whatever it drags in. --budget makes the
+script exit non-zero when a text-only worker takes longer than that to be
+ready to solve.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "PIL.Image",
+    "flask",
+    "sympy",
+    "_math_engine.solver",
+    "_core.pipeline",
+    "_llm.explainer",
+    "langchain_google_genai",
+    "cv2",
+    "torch",
+    "pix2tex.cli",
+]
+
+TEXT_COMPONENTS = ["solver", "extractor", "normalizer", "explainer", "doubt", "statement_parser"]
+
+TEXT_WORKER = """
+import time
+t0 = time.perf_counter()
+from _core.pipeline import Pipeline
+pipeline = Pipeline()
+pipeline.warm_up("solver", "extractor", "normalizer")
+pipeline.solver.solve("2*x+1=0")
+print(time.perf_counter() - t0)
+"""
+
+COMPONENTS = """
+import json, sys, time
+from _core.pipeline import Pipeline
+pipeline = Pipeline()
+names = sys.argv[1:]
+llm = {{}}
+for name in names:
+    getattr(pipeline, name)
+    if {with_llm} and hasattr(getattr(pipeline, name), "llm"):
+        t = time.perf_counter()
+        getattr(pipeline, name).llm
+        llm[name + ".llm"] = time.perf_counter() - t
+print(json.dumps({{**pipeline.init_times, **llm}}))
+"""
+
+
+def run(code: str, *args) -> str:
+    proc = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        last = (proc.stderr.strip().splitlines() or ["failed"])[-1]
+        raise RuntimeError(last)
+    return proc.stdout.strip().splitlines()[-1]
+
+
+def import_time(module: str):
+    code = f"import time\nt = time.perf_counter()\nimport {module}\nprint(time.perf_counter() - t)"
+    try:
+        return float(run(code))
+    except RuntimeError as e:
+        return str(e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--with-llm", action="store_true", help="also build the LLM clients")
+    parser.add_argument("--with-ocr", action="store_true", help="also load the OCR model")
+    parser.add_argument("--budget", type=float, help="max seconds for a text worker to be ready")
+    args = parser.parse_args()
+
+    import json
+
+    print("📦 Import cost (fresh interpreter per module)")
+    for module in MODULES:
+        cost = import_time(module)
+        shown = f"{cost * 1000:8.1f} ms" if isinstance(cost, float) else f"   n/a ({cost})"
+        print(f"  {module:<26}{shown}")
+
+    print("\n🧩 Component init cost (first use, in one process)")
+    names = TEXT_COMPONENTS + (["ocr"] if args.with_ocr else [])
+    try:
+        times = json.loads(run(COMPONENTS.format(with_llm=args.with_llm), *names))
+        for name, cost in times.items():
+            print(f"  {name:<26}{cost * 1000:8.1f} ms")
+    except RuntimeError as e:
+        print(f"  n/a ({e})")
+
+    print("\n🚀 Text-only worker: import + Pipeline() + first solve")
+    ready = float(run(TEXT_WORKER))
+    print(f"  {'ready in':<26}{ready * 1000:8.1f} ms")
+
+    if args.budget is not None and ready > args.budget:
+        sys.exit(f"\n❌ Text worker cold start {ready:.2f}s exceeds budget {args.budget:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,10 +18,11 @@ if uploaded_file:
     st.subheader("📷 Uploaded Image")
     st.image(image, width=350)
 
+    # Cheap: the LatexOCR model is shared process-wide and built once
     ocr = OCRProcessor()
 
     with st.spinner("Running OCR..."):
-        latex_text = ocr.extract_text(image)
+        latex_text = ocr.image_to_latex(image)
 
     st.success("OCR Completed")
 
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Tests never touch Gemini or the checkout's cache files; config reads these at import
+os.environ.setdefault("LLM_BACKEND", "offline")
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="mathsolver-tests-"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
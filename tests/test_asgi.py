@@ -0,0 +1,74 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlencode
+
+import pytest
+
+asgi = pytest.importorskip("asgi")
+
+
+async def post(path: str, fields: dict) -> tuple:
+    """(headers, JSON body) of one POST through the ASGI application."""
+    body = urlencode(fields).encode()
+    sent = []
+    received = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return received.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "POST", "path": path, "query_string": b"", "root_path": "",
+        "headers": [(b"content-type", b"application/x-www-form-urlencoded")],
+    }
+    await asgi.application(scope, receive, send)
+    headers = dict(sent[0]["headers"])
+    return headers, json.loads(b"".join(m.get("body", b"") for m in sent[1:]))
+
+
+class SlowLLM:
+    """Async-only stand-in: each call waits `delay` seconds on the event loop."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        return "explained"
+
+
+def test_solve_math_is_served_on_the_event_loop():
+    headers, body = asyncio.run(post("/solve_math", {"math_input": "3*x - 6 = 0"}))
+
+    assert "error" not in body
+    assert body["final_answer"]
+    assert body["session_id"]
+    assert headers[b"x-request-id"]
+    assert b"total;dur=" in headers[b"server-timing"]
+
+
+def test_requests_wait_on_the_llm_concurrently(monkeypatch):
+    explainer = asgi.get_pipeline().explainer
+    monkeypatch.setattr(explainer, "_llm", SlowLLM(0.3))
+
+    async def burst():
+        return await asyncio.gather(*[
+            post("/solve_math", {"math_input": f"x + {n} = {2 * n + 101}"}) for n in range(20)
+        ])
+
+    start = time.perf_counter()
+    results = asyncio.run(burst())
+    elapsed = time.perf_counter() - start
+
+    assert all(body["explanation"] == "explained" for _, body in results)
+    # Twenty sequential LLM waits would take 6s
+    assert elapsed < 3
+
+
+def test_missing_input_is_an_error_body():
+    _, body = asyncio.run(post("/solve_math", {}))
+
+    assert body == {"error": "No input provided"}
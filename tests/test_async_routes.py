@@ -0,0 +1,39 @@
+import pytest
+
+app_module = pytest.importorskip("app")
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_solve_math_runs_the_async_pipeline(client, monkeypatch):
+    calls = []
+    solve = app_module.get_pipeline().asolve_and_explain
+
+    async def spy(*args, **kwargs):
+        calls.append(args)
+        return await solve(*args, **kwargs)
+
+    monkeypatch.setattr(app_module.get_pipeline(), "asolve_and_explain", spy)
+    body = client.post("/solve_math", data={"math_input": "x**2 - 4 = 0"}).get_json()
+
+    assert calls == [("x**2 - 4 = 0",)]
+    assert "error" not in body
+    assert "2" in body["final_answer"]
+    assert body["explanation"]
+    assert body["session_id"]
+
+
+def test_ask_doubt_answers_from_the_session(client):
+    solved = client.post("/solve_math", data={"math_input": "2*x + 3 = 7"}).get_json()
+    body = client.post("/ask_doubt", data={
+        "session_id": solved["session_id"],
+        "step_number": "1",
+        "question": "Why subtract 3?"
+    }).get_json()
+
+    assert "error" not in body
+    assert body["answer"]
+    assert body["session_id"] == solved["session_id"]
@@ -0,0 +1,63 @@
+import pytest
+
+from _app import config
+from _llm import backends
+from _llm.backends import BACKENDS, OfflineLLM, OfflineLLMError, create_llm
+from _llm.explainer import StepExplainer
+from _llm.scheduler import LLMScheduler, ScheduledLLM
+
+
+def test_default_backend_comes_from_config(monkeypatch):
+    monkeypatch.setattr(config, "LLM_BACKEND", "offline")
+    llm = create_llm("some-model", priority="interactive")
+
+    assert isinstance(llm, ScheduledLLM)
+    assert isinstance(llm.llm, OfflineLLM)
+    assert llm.priority == "interactive"
+    assert llm.model == "some-model"
+
+
+def test_unknown_backend_names_the_choices():
+    with pytest.raises(ValueError, match="gemini, offline"):
+        create_llm("some-model", backend="nope")
+
+
+def test_registered_backend_is_selectable(monkeypatch):
+    monkeypatch.setitem(BACKENDS, "canned", lambda model, temperature: OfflineLLM(responses={"": "canned"}))
+
+    assert create_llm("m", backend="canned").invoke("anything").content == "canned"
+
+
+def test_offline_backend_is_deterministic_with_a_seed():
+    def run():
+        llm = OfflineLLM(error_rate=0.5, seed=7)
+        outcomes = []
+        for _ in range(20):
+            try:
+                llm.invoke("1. simplify | x")
+                outcomes.append("ok")
+            except OfflineLLMError:
+                outcomes.append("error")
+        return outcomes
+
+    assert run() == run()
+    assert "ok" in run() and "error" in run()
+
+
+def test_offline_failures_are_retried_then_succeed():
+    flaky = OfflineLLM(error_rate=0.5, seed=4)
+    llm = ScheduledLLM(flaky, LLMScheduler(max_retries=10, retry_base=0, retry_max=0, seed=0))
+
+    assert "Offline explanation" in llm.invoke("1. simplify | x").content
+    assert flaky.stats()["errors"] > 0
+
+
+def test_explainer_falls_back_to_a_message_when_the_backend_keeps_failing(monkeypatch):
+    explainer = StepExplainer()
+    broken = OfflineLLM(error_rate=1.0)
+    explainer._llm = ScheduledLLM(broken, LLMScheduler(max_retries=2, retry_base=0, retry_max=0))
+
+    text = explainer.explain_steps([{"step_number": 1, "output": "x"}], "x = 1", "equation")
+
+    assert text.startswith("Explanation unavailable due to error")
+    assert broken.stats()["calls"] == 3
@@ -0,0 +1,39 @@
+import pytest
+
+from _math_engine.solver import MathSolver
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("integrate(1/x, (x, 0, 1))", "Diverges to oo"),
+    ("integrate(x, (x, -oo, 0))", "Diverges to -oo"),
+    ("integrate(1/x, (x, -1, 1))", "Diverges"),
+    ("integrate(sin(x), (x, 0, oo))", "Diverges"),
+])
+def test_divergent_integral_says_so_instead_of_nan(text, expected):
+    result = MathSolver().solve(text)
+
+    assert result["final_answer"] == expected
+    assert result["diverges"] is True
+    assert result["verification"]["method"] == "divergent"
+
+
+def test_convergent_improper_integral_keeps_its_value():
+    result = MathSolver().solve("integrate(1/sqrt(x), (x, 0, 1))")
+
+    assert result["final_answer"] == "2"
+    assert "diverges" not in result
+    assert result["verification"]["verdict"] == "verified"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("integrate(x**3*exp(x**2))", "substitution u = x**2, then constant multiple + integration by parts "
+                                  "(differentiate u, integrate exp(u) du)"),
+    ("integrate(x*cos(x**2)*sin(x**2)**2)", "substitution u = x**2, then constant multiple + substitution v = sin(u)"),
+])
+def test_nested_substitution_steps_name_their_variables(text, expected):
+    result = MathSolver().solve(text)
+    step = result["steps"][0]
+
+    assert expected in step
+    assert "_u" not in step
+    assert result["verification"]["verdict"] == "verified"
@@ -0,0 +1,69 @@
+import pytest
+import sympy as sp
+
+from _math_engine.differentiation import DifferentiationEngine
+from _math_engine.solver import MathSolver
+
+x, y = sp.symbols("x y")
+
+
+@pytest.mark.parametrize("expr", [
+    x**5 - 3 * x**2 + 7,
+    sp.sin(x) * sp.exp(x),
+    (x**2 + 1) / (x - 3),
+    sp.sin(x**2 + 1) ** 3,
+    2 ** (3 * x),
+    x ** x,
+    sp.log(sp.cos(x)) * sp.atan(x),
+    x * y**2,
+])
+def test_derivative_matches_sympy(expr):
+    derivative, _, _ = DifferentiationEngine().differentiate(expr, x)
+
+    assert sp.simplify(derivative - sp.diff(expr, x)) == 0
+
+
+def test_repeated_subexpressions_get_one_step():
+    derivative, steps, reused = DifferentiationEngine().differentiate(
+        sp.sin(x) ** 2 + sp.sin(x) * sp.cos(x) + sp.sin(x), x
+    )
+
+    assert [s["input"] for s in steps].count("sin(x)") == 1
+    assert reused == 2
+    assert sp.simplify(derivative - sp.diff(sp.sin(x) ** 2 + sp.sin(x) * sp.cos(x) + sp.sin(x), x)) == 0
+
+
+def test_steps_run_bottom_up_and_end_with_the_whole_expression():
+    _, steps, _ = DifferentiationEngine().differentiate(sp.sin(x**2), x)
+
+    assert [s["type"] for s in steps] == ["power_rule", "chain_rule"]
+    assert steps[-1]["input"] == "sin(x**2)"
+    assert steps[-1]["output"].startswith("u = x**2:")
+
+
+@pytest.mark.parametrize("expr, rule", [
+    (3 * x**2, "constant_multiple"),
+    (x / (x + 1), "quotient_rule"),
+    (sp.exp(x) * x, "product_rule"),
+    (5 ** x, "exponential_rule"),
+    (x ** sp.sin(x), "logarithmic_differentiation"),
+])
+def test_top_node_gets_the_matching_rule(expr, rule):
+    _, steps, _ = DifferentiationEngine().differentiate(expr, x)
+
+    assert steps[-1]["type"] == rule
+    assert steps[-1]["hint"] == DifferentiationEngine.HINTS[rule]
+
+
+def test_constant_still_shows_a_step():
+    derivative, steps, _ = DifferentiationEngine().differentiate(sp.Integer(7), x)
+
+    assert derivative == 0
+    assert steps[0]["type"] == "constant_rule"
+
+
+def test_solver_uses_the_tree_for_other_variables():
+    result = MathSolver().solve("diff(x*y**2, y)")
+
+    assert result["final_answer"] == "2*x*y"
+    assert result["verification"]["verdict"] == "verified"
@@ -0,0 +1,57 @@
+from _core.cache import DiskStore, LRUCache
+from _llm import explainer as explainer_module
+from _llm.explainer import StepExplainer
+
+STEPS = [{"step": 1, "text": "Rewrite in standard form: x**2 - 4 = 0"}]
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return f"explanation {self.calls}"
+
+
+def explainer_over(path) -> StepExplainer:
+    store = DiskStore(str(path), namespace="explanations")
+    explainer = StepExplainer(cache=LRUCache(maxsize=16, store=store))
+    explainer._llm = CountingLLM()
+    return explainer
+
+
+def test_repeat_explanation_is_served_from_cache(tmp_path):
+    explainer = explainer_over(tmp_path / "cache.sqlite3")
+
+    first = explainer.explain_steps(STEPS, "x = -2, 2", "equation")
+    second = explainer.explain_steps(STEPS, "x = -2, 2", "equation")
+
+    assert first == second == "explanation 1"
+    assert explainer.llm.calls == 1
+
+
+def test_cache_survives_a_restart(tmp_path):
+    explainer_over(tmp_path / "cache.sqlite3").explain_steps(STEPS, "x = -2, 2", "equation")
+
+    restarted = explainer_over(tmp_path / "cache.sqlite3")
+
+    assert restarted.explain_steps(STEPS, "x = -2, 2", "equation") == "explanation 1"
+    assert restarted.llm.calls == 0
+
+
+def test_prompt_version_change_invalidates_cached_explanations(tmp_path, monkeypatch):
+    explainer_over(tmp_path / "cache.sqlite3").explain_steps(STEPS, "x = -2, 2", "equation")
+    monkeypatch.setattr(explainer_module, "PROMPT_VERSION", "edited-prompt")
+
+    restarted = explainer_over(tmp_path / "cache.sqlite3")
+
+    assert restarted.explain_steps(STEPS, "x = -2, 2", "equation") == "explanation 1"
+    assert restarted.llm.calls == 1
+
+
+def test_different_answer_is_a_different_key(tmp_path):
+    explainer = explainer_over(tmp_path / "cache.sqlite3")
+
+    assert explainer.cache_key(STEPS, "x = 2", "equation") != explainer.cache_key(STEPS, "x = -2", "equation")
+    assert explainer.cache_key(STEPS, "x = 2", "equation") != explainer.cache_key(STEPS, "x = 2", "integration")
@@ -0,0 +1,81 @@
+import os
+import warnings
+
+import pytest
+import sympy as sp
+
+from _math_engine.latex_parser import LatexParseError, parse_latex_fast
+from _math_engine.latex_to_sympy import LatexToSympyConverter
+from scripts.bench_latex import correct, load_corpus
+
+CORPUS = load_corpus(os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "latex_ocr"))
+
+
+@pytest.fixture
+def converter():
+    LatexToSympyConverter.clear_memo()
+    saved = dict(LatexToSympyConverter.stats)
+    LatexToSympyConverter.stats.update(dict.fromkeys(saved, 0))
+    yield LatexToSympyConverter
+    LatexToSympyConverter.stats.update(saved)
+    LatexToSympyConverter.clear_memo()
+
+
+@pytest.mark.parametrize("item", CORPUS, ids=[item["id"] for item in CORPUS])
+def test_fast_parser_on_the_bench_corpus(item):
+    # The same check bench_latex.py scores: parse what pix2tex emits, refuse what it cannot
+    try:
+        parsed = parse_latex_fast(LatexToSympyConverter.clean_latex(item["latex"]))
+    except LatexParseError:
+        parsed = None
+
+    assert correct(parsed, item["expected"])
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "Unexpected end of input"),
+    ("2*x+", "Unexpected end of input"),
+    ("x^{2", "Expected }"),
+    ("x $ 2", "Unexpected character '$'"),
+    ("\\foo x", "Unsupported command \\foo"),
+    ("\\int x", "Integral without a differential"),
+    ("\\int_0 x dx", "Integral with only one bound"),
+    ("\\frac{dy}{dx}", "Leibniz derivative notation"),
+])
+def test_refusals_name_the_problem(text, message):
+    with pytest.raises(LatexParseError, match=message.replace("\\", "\\\\").replace("$", "\\$")):
+        parse_latex_fast(text)
+
+
+def test_parse_error_is_a_value_error():
+    # Callers that catch ValueError around parsing keep working
+    assert issubclass(LatexParseError, ValueError)
+
+
+def test_converter_takes_the_fast_path_and_memoizes(converter):
+    first = converter.to_sympy("x^{2}-5x+6=0")
+
+    assert first == sp.Eq(sp.Symbol("x") ** 2 - 5 * sp.Symbol("x") + 6, 0)
+    assert converter.to_sympy("x^{2}-5x+6=0") is first
+    assert converter.stats["fast"] == 1
+    assert converter.stats["hits"] == 1
+
+
+def test_converter_falls_back_to_sympify_outside_the_subset(converter):
+    with warnings.catch_warnings():
+        # Without the antlr4 runtime SymPy warns on import before raising
+        warnings.simplefilter("ignore")
+        result = converter.to_sympy("x**2+1")
+
+    assert result == sp.Symbol("x") ** 2 + 1
+    assert converter.stats["fast"] == 0
+    assert converter.stats["antlr"] + converter.stats["sympify"] == 1
+
+
+def test_failed_conversion_raises_and_is_not_memoized(converter):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with pytest.raises(Exception):
+            converter.to_sympy("x\\pm1")
+
+    assert "x\\pm1" not in converter._memo
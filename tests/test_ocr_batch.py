@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+from PIL import Image, ImageDraw
+
+from _vision.batcher import OCRBatcher
+from _vision.ocr import OCRProcessor
+
+SAMPLES = ["x+1", "2x=4", "x^2-4=0", "3y+2=11", "a+b", "x-7=0"]
+
+
+def render(text: str, scale: int) -> Image.Image:
+    img = Image.new("RGB", (12 + 8 * len(text), 24), "white")
+    ImageDraw.Draw(img).text((6, 6), text, fill="black")
+    return img.resize((img.width * scale, img.height * scale), Image.Resampling.NEAREST)
+
+
+def sample_images() -> list[Image.Image]:
+    # Same text at several sizes: some crops share a shape after resizing, some do not
+    return [render(text, scale) for scale in (2, 3) for text in SAMPLES]
+
+
+class FakeProcessor:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def image_to_latex(self, image):
+        return f"{image.width}x{image.height}"
+
+    def image_to_latex_batch(self, images):
+        self.batch_sizes.append(len(images))
+        return [self.image_to_latex(image) for image in images]
+
+
+def test_batcher_returns_each_callers_own_result():
+    processor = FakeProcessor()
+    batcher = OCRBatcher(processor, window=0.05, max_batch=16)
+    images = sample_images()
+    results = [None] * len(images)
+    start = threading.Barrier(len(images))
+
+    def upload(i):
+        start.wait()
+        results[i] = batcher.image_to_latex(images[i], timeout=5)
+
+    threads = [threading.Thread(target=upload, args=(i,)) for i in range(len(images))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [processor.image_to_latex(image) for image in images]
+    assert max(processor.batch_sizes) > 1
+
+
+def test_batched_ocr_matches_single_image_ocr():
+    pytest.importorskip("torch")
+    pytest.importorskip("pix2tex")
+
+    processor = OCRProcessor(use_preprocessing=True, hash_index=None)
+    images = sample_images()
+
+    single = [processor.image_to_latex(image) for image in images]
+    batched = processor.image_to_latex_batch(images)
+
+    assert batched == single
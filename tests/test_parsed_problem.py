@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from _math_engine.solver import MathSolver
+
+
+def test_memoized_parse_is_read_only():
+    solver = MathSolver()
+    problem = solver.parse("x**2 - 4 = 0")
+
+    assert solver.parse("x**2 - 4 = 0") is problem
+    with pytest.raises(AttributeError):
+        problem.answer = [2]
+    # Derived forms are still computed on first use
+    assert problem.degree == 2
+
+
+def test_concurrent_solves_of_one_problem_each_verify_their_own_answer():
+    solver = MathSolver()
+    inputs = ["x**2 - 4 = 0", "integrate(x**2)", "diff(sin(x))", "x + y = 3; x - y = 1"] * 25
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(solver.solve, inputs))
+
+    assert {r["final_answer"] for r in results} == {"[-2, 2]", "x**3/3 + C", "cos(x)", "{x: 2, y: 1}"}
+    assert all(r["verification"]["verdict"] == "verified" for r in results)
+
+
+@pytest.mark.parametrize("text, roots", [
+    ("x**2 + 3*x - 7 = 0", {"-3/2 + sqrt(37)/2", "-sqrt(37)/2 - 3/2"}),
+    ("2*x**2 - 5*x + 1 = 0", {"sqrt(17)/4 + 5/4", "5/4 - sqrt(17)/4"}),
+    ("x**2 + x + 1 = 0", {"-1/2 + sqrt(3)*I/2", "-1/2 - sqrt(3)*I/2"}),
+])
+def test_quadratic_formula_roots_come_out_simplified(text, roots):
+    result = MathSolver().solve(text)
+
+    assert result["steps"][-1] == "4. Apply quadratic formula and simplify"
+    assert set(result["final_answer"].strip("[]").split(", ")) == roots
+    assert result["verification"]["verdict"] == "verified"
@@ -0,0 +1,53 @@
+import io
+import random
+
+from PIL import Image, ImageDraw
+
+from _vision.phash import PerceptualHashIndex, fingerprint, hamming
+
+
+def render(text: str, scale: int = 3) -> Image.Image:
+    img = Image.new("RGB", (24 + 8 * len(text), 36), "white")
+    ImageDraw.Draw(img).text((12, 12), text, fill="black")
+    return img.resize((img.width * scale, img.height * scale), Image.Resampling.LANCZOS)
+
+
+def recompressed(img: Image.Image) -> Image.Image:
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=60)
+    return Image.open(io.BytesIO(buffer.getvalue()))
+
+
+def test_changed_digit_is_not_a_hit_even_within_the_threshold():
+    index = PerceptualHashIndex(threshold=8)
+    original, changed = fingerprint(render("3x^2+5x-7=0")), fingerprint(render("8x^2+5x-7=0"))
+    index.add(original[0], "3x^2+5x-7=0", original[1])
+
+    assert hamming(original[0], changed[0]) <= 8
+    assert index.lookup(*changed) is None
+    assert index.stats()["rejected"] == 1
+
+
+def test_recompressed_upload_reuses_the_stored_latex():
+    for threshold in (0, 8):
+        index = PerceptualHashIndex(threshold=threshold)
+        original = render("3x^2+5x-7=0")
+        key = fingerprint(original)
+        index.add(key[0], "3x^2+5x-7=0", key[1])
+
+        assert index.lookup(*fingerprint(recompressed(original))) == "3x^2+5x-7=0"
+
+
+def test_near_lookup_finds_hashes_through_the_chunk_buckets():
+    rng = random.Random(0)
+    index = PerceptualHashIndex(threshold=8)
+    thumb = bytes(64 * 16)
+    stored = [rng.getrandbits(256) for _ in range(2000)]
+    for i, image_hash in enumerate(stored):
+        index.add(image_hash, f"latex {i}", thumb)
+
+    target = stored[1234]
+    for bit in rng.sample(range(256), 8):
+        target ^= 1 << bit
+
+    assert index.lookup(target, thumb) == "latex 1234"
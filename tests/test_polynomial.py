@@ -0,0 +1,57 @@
+import sympy as sp
+
+from _math_engine.polynomial import PolynomialEngine
+from _math_engine.solver import MathSolver
+
+x = sp.Symbol("x")
+
+
+def roots_of(expr, **kwargs) -> tuple:
+    return PolynomialEngine(**kwargs).solve(sp.Poly(expr, x))
+
+
+def test_rational_roots_come_from_factoring():
+    roots, steps = roots_of((x - 1) * (x + 2) * (2 * x - 3))
+
+    assert roots == [-2, 1, sp.Rational(3, 2)]
+    assert steps[0].startswith("Factor over the rationals")
+
+
+def test_irreducible_cubic_uses_cardano():
+    roots, steps = roots_of(x**3 - 2)
+
+    assert roots[0] == sp.cbrt(2)
+    assert len(roots) == 3
+    assert "Rational root test" in steps[0]
+    assert "Cardano" in steps[1]
+
+
+def test_casus_irreducibilis_falls_back_to_real_numeric_roots():
+    roots, steps = roots_of(x**3 - 3 * x + 1)
+
+    assert all(r.is_real for r in roots)
+    assert "numerically" in steps[-1]
+    assert all(abs(r**3 - 3 * r + 1) < 1e-12 for r in roots)
+
+
+def test_quintic_roots_are_numeric_and_accurate():
+    roots, _ = roots_of(x**5 - x - 1)
+
+    assert len(roots) == 5
+    assert max(abs(complex((r**5 - r - 1).evalf())) for r in roots) < 1e-12
+    # Real roots first, then complex ones
+    assert roots[0].is_real and not roots[-1].is_real
+
+
+def test_more_digits_switch_to_mpmath():
+    roots, _ = roots_of(x**5 - x - 1, digits=30)
+
+    real = roots[0]
+    assert abs(real**5 - real - 1) < sp.Float("1e-25", 30)
+
+
+def test_solver_routes_cubics_to_the_engine():
+    result = MathSolver().solve("x**3 - 6*x**2 + 11*x - 6 = 0")
+
+    assert result["final_answer"] == "[1, 2, 3]"
+    assert result["verification"]["verdict"] == "verified"
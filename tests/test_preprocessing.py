@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+pytest.importorskip("cv2")
+
+from _vision.preprocessing import Preprocessor
+
+
+def page(width: int, height: int) -> Image.Image:
+    pixels = np.full((height, width), 255, dtype=np.uint8)
+    pixels[height // 3: height // 2, width // 4: 3 * width // 4] = 0
+    return Image.fromarray(pixels)
+
+
+@pytest.mark.parametrize("tier", list(Preprocessor.TIERS))
+def test_large_photos_shrink_to_the_tier_size(tier):
+    cleaned = Preprocessor.clean(page(4000, 3000), tier=tier)
+
+    assert max(cleaned.size) == Preprocessor.TIERS[tier]["max_side"]
+
+
+def test_fast_tiers_stay_near_the_model_input():
+    model_side = max(Preprocessor.MODEL_INPUT)
+    assert Preprocessor.TIERS["fast"]["max_side"] == model_side
+    assert Preprocessor.TIERS["balanced"]["max_side"] < 1.5 * model_side
+    assert Preprocessor.TIERS["best"]["max_side"] <= 2 * model_side
+
+
+def test_small_images_are_not_upscaled():
+    assert Preprocessor.clean(page(300, 80), tier="balanced").size == (300, 80)
+
+
+def test_unknown_tier_is_rejected():
+    with pytest.raises(ValueError):
+        Preprocessor.clean(page(100, 50), tier="turbo")
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from _llm.doubt_handler import DoubtHandler
+from _llm.explainer import StepExplainer
+from _llm.prompt_builder import UsageTracker, count_tokens, fit_steps, serialize_step
+from _llm.prompts import DOUBT_HANDLER_PROMPT
+
+
+def steps(n: int, output: str = "x**2 + 2*x + 1") -> list[dict]:
+    return [
+        {"step_number": i, "type": "simplify", "input": f"step {i} input", "output": output, "hint": ""}
+        for i in range(1, n + 1)
+    ]
+
+
+def test_serialize_step_omits_empty_fields():
+    step = {"step_number": 2, "type": "factor", "input": "", "output": "(x+1)**2", "hint": None}
+
+    assert serialize_step(step) == "2. factor | (x+1)**2"
+
+
+def test_fit_steps_stays_within_budget_and_marks_gaps():
+    text = fit_steps(steps(40), 60)
+
+    assert count_tokens(text) <= 60 + 1
+    assert text.startswith("1.")
+    assert text.endswith("…")
+
+
+def test_focus_step_and_neighbours_are_kept_first():
+    text = fit_steps(steps(40), 45, focus=20, window=1)
+    numbers = [line.split(".")[0] for line in text.splitlines() if line != "…"]
+
+    assert {"19", "20", "21"} <= set(numbers)
+    assert "1" not in numbers
+    assert text.startswith("…")
+
+
+def test_one_huge_step_cannot_take_the_whole_budget():
+    text = fit_steps(steps(3, output="x" * 4000), 100)
+
+    assert count_tokens(text.splitlines()[0]) <= 51
+
+
+def test_explainer_prompt_respects_its_budget():
+    explainer = StepExplainer(prompt_budget=200)
+    small = explainer._build_prompt(steps(2), "x = -1", "equation")
+    large = explainer._build_prompt(steps(500), "x = -1", "equation")
+
+    assert count_tokens(large) - count_tokens(small) <= 200
+
+
+def test_doubt_prompt_respects_its_budget():
+    handler = DoubtHandler(prompt_budget=400)
+    prompt = handler._build_prompt(
+        "Why?" * 300, steps(200), "x = -1", "<p>" + "old explanation " * 1000 + "</p>", step_number=100
+    )
+
+    assert count_tokens(prompt) <= 400 + count_tokens(DOUBT_HANDLER_PROMPT) // 10
+    assert "100." in prompt
+    assert "<p>" not in prompt
+
+
+def test_usage_prefers_provider_metadata_over_estimates():
+    tracker = UsageTracker()
+    tracker.record("a" * 40, "b" * 8)
+    tracker.record("prompt", SimpleNamespace(content="reply", usage_metadata={"input_tokens": 7, "output_tokens": 3}))
+
+    assert tracker.stats()["prompt_tokens"] == 10 + 7
+    assert tracker.stats()["completion_tokens"] == 2 + 3
+    assert tracker.stats()["last"]["estimated"] is False
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from _llm.scheduler import LLMScheduler, ScheduledLLM, is_rate_limited, is_retryable
+
+
+def wait_queued(scheduler, count):
+    deadline = time.monotonic() + 2
+    while sum(scheduler.stats()["queued"].values()) < count:
+        assert time.monotonic() < deadline, "callers never queued"
+        time.sleep(0.005)
+
+
+def test_waiting_calls_run_by_priority_then_arrival():
+    scheduler = LLMScheduler(max_concurrency=1)
+    scheduler.acquire("interactive")
+    order = []
+
+    def call(name, priority):
+        scheduler.acquire(priority)
+        order.append(name)
+        scheduler.release()
+
+    threads = []
+    for name, priority in [("batch", "batch"), ("explain-1", "explanation"),
+                           ("doubt", "interactive"), ("explain-2", "explanation")]:
+        threads.append(threading.Thread(target=call, args=(name, priority)))
+        threads[-1].start()
+        wait_queued(scheduler, len(threads))
+
+    scheduler.release()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert order == ["doubt", "explain-1", "explain-2", "batch"]
+    assert scheduler.stats()["active"] == 0
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError, match="Unknown LLM priority 'urgent'"):
+        LLMScheduler().acquire("urgent")
+
+
+def test_token_bucket_allows_a_burst_then_paces_calls():
+    # 600/min is one token every 0.1 s
+    scheduler = LLMScheduler(max_concurrency=0, rate_per_minute=600, burst=2)
+    start = time.perf_counter()
+    for _ in range(2):
+        scheduler.acquire()
+        scheduler.release()
+    burst = time.perf_counter() - start
+
+    scheduler.acquire()
+    scheduler.release()
+    paced = time.perf_counter() - start
+
+    assert burst < 0.05
+    assert paced >= 0.08
+
+
+def test_throttle_spends_the_bucket():
+    scheduler = LLMScheduler(max_concurrency=0, rate_per_minute=600, burst=5)
+    scheduler.throttle()
+
+    start = time.perf_counter()
+    scheduler.acquire()
+    scheduler.release()
+
+    assert time.perf_counter() - start >= 0.08
+    assert scheduler.stats()["throttled"] == 1
+
+
+def test_cancelled_async_waiter_does_not_leak_its_slot():
+    scheduler = LLMScheduler(max_concurrency=1)
+
+    async def main():
+        await scheduler.aacquire()
+        waiter = asyncio.ensure_future(scheduler.aacquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        scheduler.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(scheduler.aacquire(), timeout=1)
+        scheduler.release()
+
+    asyncio.run(main())
+    assert scheduler.stats()["active"] == 0
+
+
+class Flaky:
+    """Fails with `error` for the first `failures` calls."""
+
+    def __init__(self, error, failures):
+        self.error = error
+        self.failures = failures
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return f"ok: {prompt}"
+
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
+
+def scheduled(llm, **kwargs):
+    return ScheduledLLM(llm, LLMScheduler(retry_base=0, retry_max=0, seed=0, **kwargs))
+
+
+def test_transient_errors_are_retried():
+    flaky = Flaky(TimeoutError("read timed out"), failures=2)
+    llm = scheduled(flaky)
+
+    assert llm.invoke("hi") == "ok: hi"
+    assert flaky.calls == 3
+    assert llm.scheduler.stats()["retries"] == 2
+    assert llm.scheduler.stats()["active"] == 0
+
+
+def test_async_calls_are_retried_too():
+    flaky = Flaky(ConnectionError("reset"), failures=1)
+    llm = scheduled(flaky)
+
+    assert asyncio.run(llm.ainvoke("hi")) == "ok: hi"
+    assert flaky.calls == 2
+
+
+def test_final_errors_are_not_retried():
+    flaky = Flaky(ValueError("bad request"), failures=1)
+
+    with pytest.raises(ValueError):
+        scheduled(flaky).invoke("hi")
+    assert flaky.calls == 1
+
+
+def test_retries_stop_after_max_retries():
+    flaky = Flaky(TimeoutError(), failures=10)
+
+    with pytest.raises(TimeoutError):
+        scheduled(flaky, max_retries=2).invoke("hi")
+    assert flaky.calls == 3
+
+
+def test_rate_limit_errors_throttle_the_scheduler():
+    llm = scheduled(Flaky(RuntimeError("429 Resource exhausted"), failures=1))
+
+    assert llm.invoke("hi") == "ok: hi"
+    assert llm.scheduler.stats()["throttled"] == 1
+
+
+@pytest.mark.parametrize("error, retryable, limited", [
+    (TimeoutError(), True, False),
+    (RuntimeError("503 Service Unavailable"), True, False),
+    (RuntimeError("429 quota exceeded"), True, True),
+    (RuntimeError("400 invalid argument"), False, False),
+    (ValueError("bad prompt"), False, False),
+])
+def test_error_classification(error, retryable, limited):
+    assert is_retryable(error) is retryable
+    assert is_rate_limited(error) is limited
+
+
+def test_backoff_is_full_jitter_capped_exponential():
+    scheduler = LLMScheduler(retry_base=0.5, retry_max=3, seed=1)
+
+    for attempt, cap in [(0, 0.5), (1, 1.0), (2, 2.0), (5, 3.0)]:
+        delays = [scheduler.backoff(attempt) for _ in range(50)]
+        assert all(0 <= d <= cap for d in delays)
+        assert max(delays) > cap / 2
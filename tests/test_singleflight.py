@@ -0,0 +1,28 @@
+import asyncio
+
+from _core.singleflight import SingleFlight
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    flights = SingleFlight("test")
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        leader = asyncio.ensure_future(flights.ado("key", slow))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(flights.ado("key", slow)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[0] == results[2] == results[3] == "answer"
+    assert calls == [1]
+    assert flights.stats()["in_flight"] == 0
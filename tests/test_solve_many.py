@@ -0,0 +1,62 @@
+import pytest
+
+from _app import config
+from _core.pipeline import Pipeline
+from _math_engine.executor import SolverPool
+from _math_engine.solver import MathSolver
+
+
+class FakePool:
+    """Runs calls on an in-process MathSolver; `slow` inputs miss the deadline."""
+
+    size = 4
+
+    def __init__(self, slow=()):
+        self.solver = MathSolver()
+        self.slow = set(slow)
+        self.calls = []
+
+    def call(self, method, user_input, deadline=None):
+        self.calls.append((method, user_input))
+        if user_input in self.slow:
+            return SolverPool._timed_out(deadline or 10)
+        return getattr(self.solver, method)(user_input)
+
+
+@pytest.fixture
+def pipeline():
+    return Pipeline()
+
+
+def test_equal_problems_are_solved_once_and_returned_in_order(pipeline, monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(config, "BATCH_POOL_MIN_ITEMS", 1)
+    monkeypatch.setattr(pipeline, "_get_batch_pool", lambda: pool)
+
+    results = pipeline.solve_many(["x + 1 = 3", "1 + x = 3", "2*x = 8"])
+
+    assert [r["expression"] for r in results] == ["x + 1 = 3", "1 + x = 3", "2*x = 8"]
+    assert results[0]["final_answer"] == results[1]["final_answer"]
+    assert [c for c in pool.calls if c[0] == "solve"] == [("solve", "x + 1 = 3"), ("solve", "2*x = 8")]
+
+
+def test_canonical_keys_run_in_the_pool_under_its_deadline(pipeline, monkeypatch):
+    pool = FakePool(slow={"x**2 = 4"})
+    monkeypatch.setattr(config, "BATCH_POOL_MIN_ITEMS", 1)
+    monkeypatch.setattr(pipeline, "_get_batch_pool", lambda: pool)
+    monkeypatch.setattr(pipeline.solver, "canonical_key", lambda text: pytest.fail("parsed in the request process"))
+
+    results = pipeline.solve_many(["x**2 = 4", "x + 1 = 3"])
+
+    assert results[0]["timed_out"] is True
+    assert results[0]["expression"] == "x**2 = 4"
+    assert "error" not in results[1]
+
+
+def test_small_batch_keeps_each_items_own_error(pipeline):
+    results = pipeline.solve_many(["x + 1 = 3", "hello", "diff(x^2+)"])
+
+    assert "error" not in results[0]
+    assert results[1]["message"] == "Unknown command"
+    assert results[2]["message"] == "SymPy could not parse expression: diff(x^2+)"
+    assert results[2]["hint"] == "Ensure your parentheses match."
@@ -0,0 +1,45 @@
+from _nlp.near_duplicate import StatementIndex
+
+GARDEN = (
+    "A rectangular garden behind the old school building is 12 meters long and 5 meters wide. "
+    "The gardener wants to know the {} of the garden in meters."
+)
+
+
+def test_reworded_statement_reuses_expression():
+    index = StatementIndex()
+    index.add("A train travels 120 km in 2 hours, find its speed", "120/2")
+
+    assert index.lookup("Find the speed of a train that travels 120 km in 2 hours") == "120/2"
+
+
+def test_different_question_word_is_a_different_problem():
+    index = StatementIndex()
+    index.add(GARDEN.format("area"), "A=12*5")
+
+    assert index.lookup(GARDEN.format("area")) == "A=12*5"
+    assert index.lookup(GARDEN.format("perimeter")) is None
+
+
+def test_different_operator_is_a_different_problem():
+    index = StatementIndex(threshold=0.5)
+    index.add("Tom has 7 apples and his sister has 3 apples more than Tom, how many does she have", "7+3")
+
+    assert index.lookup("Tom has 7 apples and his sister has 3 apples less than Tom, how many does she have") is None
+
+
+def test_swapped_operands_are_a_different_problem():
+    index = StatementIndex()
+    index.add("calculate 5 minus 3", "5 - 3")
+    index.add("what is 10 divided by 2", "10/2")
+
+    assert index.lookup("calculate 5 minus 3") == "5 - 3"
+    assert index.lookup("calculate 3 minus 5") is None
+    assert index.lookup("what is 2 divided by 10") is None
+
+
+def test_swapped_numbers_in_a_reworded_statement_are_a_different_problem():
+    index = StatementIndex()
+    index.add("A train travels 120 km in 2 hours, find its speed", "120/2")
+
+    assert index.lookup("Find the speed of a train that travels 2 km in 120 hours") is None
@@ -0,0 +1,97 @@
+import pytest
+import sympy as sp
+
+from _math_engine.solver import MathSolver
+from _math_engine.systems import SystemEngine
+
+a, k, x, y, z, w = sp.symbols("a k x y z w")
+
+
+@pytest.fixture
+def solver():
+    return MathSolver()
+
+
+def test_linear_system_exact_elimination(solver):
+    result = solver.solve("2*x + 3*y - z = 5; x - y + 2*z = 5; 3*x + y + z = 9")
+
+    assert result["final_answer"] == "{x: 2, y: 1, z: 2}"
+    assert "Reduced row echelon form" in " ".join(result["steps"])
+    assert result["verification"]["verdict"] == "verified"
+
+
+def test_unknowns_come_in_natural_order(solver):
+    problem = solver.parse("x1 + x10 = 3; x2 - x1 = 1; x10 + x2 = 4")
+
+    assert [u.name for u in problem.var] == ["x1", "x2", "x10"]
+
+
+@pytest.mark.parametrize("text, unknowns", [
+    ("a*x + y = 1; x - y = 2", (x, y)),
+    ("a + x = 1; x - y = 2", (x, y)),
+    ("k*x**2 - y = 0; x + y = 2", (x, y)),
+    ("a*t1 + t2 = b; t1 = 2*t2", (sp.Symbol("t1"), sp.Symbol("t2"))),
+])
+def test_other_symbols_are_parameters(solver, text, unknowns):
+    assert solver.parse(text).var == unknowns
+
+
+def test_parametric_linear_system_is_solved_for_x_and_y(solver):
+    result = solver.solve("a*x + y = 1; x - y = 2")
+
+    assert result["final_answer"] == "{x: 3/(a + 1), y: (1 - 2*a)/(a + 1)}"
+    assert "1. Collect 2 equations in 2 unknowns (linear)" in result["steps"]
+    assert result["verification"]["verdict"] == "verified"
+
+
+def test_parameter_in_the_plain_text_rows_moves_to_the_right_hand_side(solver):
+    problem = solver.parse("a + x = 1; x - y = 2")
+
+    assert problem.expr is None  # parsed without SymPy
+    assert problem.rhs == [1 - a, 2]
+    assert solver.solve("a + x = 1; x - y = 2")["final_answer"] == "{x: 1 - a, y: -a - 1}"
+
+
+def test_more_unknowns_than_conventional_names(solver):
+    # w is not conventional but is needed: four equations, four unknowns
+    problem = solver.parse("x*y = 2; x + y = 3; x - z = 0; z + w = 1")
+
+    assert set(problem.var) == {w, x, y, z}
+
+
+def test_nonlinear_system(solver):
+    result = solver.solve("x**2 + y**2 = 5; x*y = 2")
+
+    assert "nonlinear" in result["steps"][0]
+    assert "Gröbner" in result["steps"][1]
+    assert result["final_answer"].count("{") == 4
+    assert result["verification"]["verdict"] == "verified"
+
+
+def test_parametric_nonlinear_system(solver):
+    result = solver.solve("k*x**2 - y = 0; x + y = 2")
+
+    assert result["final_answer"].count("sqrt(8*k + 1)") == 4
+    assert result["verification"]["verdict"] == "verified"
+
+
+def test_large_text_system_takes_the_numeric_path(solver):
+    n = 30
+    # Sparse chain: 2*x_i - x_{i+1} = 1, closed by x_n = n
+    text = "; ".join(f"2*x{i} - x{i + 1} = 1" for i in range(1, n)) + f"; x{n} = {n}"
+    result = solver.solve(text)
+
+    assert "A is 30×30" in result["steps"][1]
+    assert result["verification"]["verdict"] == "verified"
+
+
+def test_sparse_lu_for_big_mostly_zero_systems():
+    pytest.importorskip("scipy")
+    n = 50
+    unknowns = [sp.Symbol(f"x{j}") for j in range(1, n + 1)]
+    rows = [{i: 2.0, i + 1: -1.0} if i + 1 < n else {i: 1.0} for i in range(n)]
+    found, steps = SystemEngine(sparse_min_unknowns=10).solve_linear(unknowns, rows, [1.0] * n)
+
+    assert "sparse LU" in steps[1]
+    assert found[unknowns[-1]] == pytest.approx(1.0)
+    assert found[unknowns[0]] == pytest.approx(1.0)
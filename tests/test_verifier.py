@@ -0,0 +1,67 @@
+import threading
+
+import sympy as sp
+
+from _math_engine.solver import MathSolver
+from _math_engine.verifier import AnswerVerifier
+
+
+def test_failed_answer_is_resolved_with_plain_sympy(monkeypatch):
+    solver = MathSolver()
+    x = sp.Symbol("x")
+    # A rule engine bug: the derivative of x**3 comes out as 3*x
+    monkeypatch.setattr(solver.differentiation, "differentiate", lambda expr, var: (3 * x, ["wrong"], None))
+
+    result = solver.solve("differentiate(x^3)")
+
+    assert result["final_answer"] == "3*x**2"
+    assert result["verification"]["verdict"] == "verified"
+    assert result["verification"]["resolved"] is True
+    assert "warning" not in result
+
+
+def test_answer_that_stays_wrong_is_marked_unverified(monkeypatch):
+    solver = MathSolver()
+    x = sp.Symbol("x")
+    monkeypatch.setattr(solver.differentiation, "differentiate", lambda expr, var: (3 * x, ["wrong"], None))
+    monkeypatch.setattr(solver, "_solve_plain", lambda problem: (None, None))
+
+    result = solver.solve("differentiate(x^3)")
+
+    assert result["final_answer"] == "3*x"
+    assert result["verification"]["verdict"] == "failed"
+    assert result["unverified"] is True
+    assert result["warning"]
+
+
+def test_empty_root_list_is_skipped_not_verified():
+    x, a = sp.symbols("x a")
+    verifier = AnswerVerifier()
+
+    assert verifier._roots(x**2 + 1, x, []) == ("skipped", "none")
+    assert verifier._roots(x - a, x, []) == ("skipped", "none")
+
+
+def test_system_without_solutions_is_skipped_not_verified():
+    result = MathSolver().solve("x*y=1; x+y=3; x-z=0; z+w=1; w*x=2")
+
+    assert result["final_answer"] == "No solution"
+    assert result["verification"]["verdict"] == "skipped"
+
+
+def test_verifier_is_shared_safely_across_threads():
+    verifier = AnswerVerifier()
+    x = sp.Symbol("x")
+    verdicts = []
+
+    def check():
+        for _ in range(20):
+            verdicts.append(verifier._slope_matches(sp.sin(x) * sp.exp(x), sp.exp(x) * (sp.sin(x) + sp.cos(x)), x))
+
+    threads = [threading.Thread(target=check) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert set(verdicts) == {("verified", "numeric")}